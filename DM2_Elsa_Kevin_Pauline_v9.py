@@ -2,14 +2,79 @@
 ## auteurs : Elsa SCHALCK, Kevin PLESSIS, Pauline MATHIEU
 
 import random as rd
-import matplotlib.pyplot as plt
+import time
+import os
+import math
+import itertools
+import statistics
+import json
+import hashlib
+import collections
+import heapq
+import weakref
+import tracemalloc
+import platform
+import sys
+import argparse
+import importlib.util
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# codes des statuts et des appréciations, stockés dans les colonnes des informations
+STATUTS=['consultable','consultee','non_consultable']
+CONSULTABLE,CONSULTEE,NON_CONSULTABLE=0,1,2
+APPRECIATIONS=['a_apprecier','bien','mauvais']
+A_APPRECIER,BIEN,MAUVAIS=0,1,2
+
+# codes des évènements écrits dans les traces de simulation (voir ecrivain_trace)
+EVENEMENTS=['creation','propagation','appreciation','consultation','expiration','inactivation']
+CREATION,PROPAGATION,APPRECIATION,CONSULTATION,EXPIRATION,INACTIVATION=0,1,2,3,4,5
+SIGNATURE_TABLEAUX=b'DM2TABL1' # début des fichiers écrits par ecrit_tableaux (points de reprise des simulations)
+COLONNES_TRACE=[('temps',np.int32),('evenement',np.uint8),('id_information',np.int32),('id_entite',np.int32),('valeur',np.int32),('valeur_precedente',np.int32)]
+# nombre maximal de tirages ('paires') ou de connexions attendues ('degres', 'geometrique') des modes non spatiaux de reseau
+MAX_CONNEXIONS_DENSES=5*10**7
+# colonnes des évènements en attente du moteur 'evenements' (voir simulation._avance_evenements), une ligne par évènement
+COLONNES_EVENEMENTS={'receptions':('id_information','id_entite','emetteur'),'appreciations':('id_information','ligne','id_entite','fin','appreciation'),
+                     'fins':('id_information','ligne','id_entite','consultee','duree')}
+
+def pyplot(non_interactif=False):
+    '''
+    Fonction qui importe matplotlib.pyplot au premier tracé : importer le module ne charge ni matplotlib ni interface graphique. 
+    
+    Argument : 
+        - non_interactif : facultatif, False par défaut. Si True et que pyplot n'est pas encore chargé, 
+        on choisit le backend 'Agg' (aucune fenêtre, figures enregistrées dans des fichiers).
+        
+    --> (module), matplotlib.pyplot.
+    '''
+    import matplotlib
+    if non_interactif and 'matplotlib.pyplot' not in sys.modules:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def montre_figure(plt,figure,fichier=None):
+    '''
+    Fonction qui affiche une figure, ou l'enregistre dans fichier (format déduit de l'extension : .png, .svg, .pdf...) puis la ferme.
+    '''
+    if fichier is None:
+        plt.show()
+    else:
+        figure.savefig(fichier)
+        plt.close(figure)
+
 
 class entite(object):  
     """
     Classe définissant une entité.  
     """             
+    
+    __slots__=('id_entite','p_connexion','p_consultation','p_appreciation','p_transfert','groupe','_connexions','reseau','position')
 
-    def __init__(self,id_entite,coord=[],espace=[50,50]):
+    def __init__(self,id_entite,coord=[],espace=[50,50],alea=rd):
         """
         Constructeur qui initialise:
             - id_entite : (int), numéro d'identification de l'entité.  
@@ -18,18 +83,21 @@ class entite(object):
             - p_appreciation : (float), probabilité d’apprécier cette information.
             - p_transfert : (float), probabilité de transférer une information à son tour.
             - groupe : (string : {"bon_public","mauvais_public"}), groupes auxquels appartient l'entité, en fonction de sa probabilite p_appreciation.
-            - connexions : (list), liste des entites auxquelles elle est connectée.
+            - connexions : (list), liste des entites auxquelles elle est connectée. 
+            Lorsque l'entité appartient à un réseau, c'est une vue en lecture seule (connexions_entite) sur l'adjacence CSR du réseau.
+            - reseau : (reseau), réseau auquel appartient l'entité (None si l'entité est isolée).
             - position : (list : [x,y]), position de l'entité dans l'espace (2D). 
             
             Arguments: 
             - coord : (list : [x,y]), coordonnées de l'entité dans l'espace (2D) (liste vide par défaut si les coordonnées ne sont pas renseignées). 
             - espace= (list : [x,y]), x = borne supérieur en abscisse du réseau et y = borne supérieure en ordonnée du réseau. ([50,50] par défaut).
+            - alea : (random.Random ou module random), source des tirages aléatoires (module random par défaut).
         """
         self.id_entite=id_entite
-        self.p_connexion= rd.random()
-        self.p_consultation= rd.random()
-        self.p_appreciation= rd.random()
-        self.p_transfert= rd.random()
+        self.p_connexion= alea.random()
+        self.p_consultation= alea.random()
+        self.p_appreciation= alea.random()
+        self.p_transfert= alea.random()
         
         if self.p_appreciation > 0.5 : # si l'entité a plus de 50% de chance d'apprecier l'information, alors on la catégorise comme une entité 'bon_public"
             self.groupe="bon_public"
@@ -37,63 +105,551 @@ class entite(object):
             self.groupe="mauvais_public"
             
         self.connexions=[] 
+        self.reseau=None
         
         if coord==[]: # si les coordonnées de l'entité ne sont pas renseignées, on prend des coordonnées aléatoires dans l'espace. 
-            self.position=[rd.randint(0,espace[0]),rd.randint(0,espace[1])]
+            self.position=[alea.randint(0,espace[0]),alea.randint(0,espace[1])]
         else : 
             self.position=coord # sinon, on affecte les coordonnées renseignées en entrée à la position de l'entité. 
+            
+    @property
+    def connexions(self):
+        '''
+        Entités auxquelles l'entité est connectée : liste propre à l'entité si elle est isolée, 
+        vue sur l'adjacence du réseau sinon.
+        '''
+        if self.reseau is None:
+            return self._connexions
+        return connexions_entite(self.reseau,self.id_entite)
+    
+    @connexions.setter
+    def connexions(self,valeur):
+        '''
+        Remplace la liste des connexions d'une entité isolée. Les connexions d'une entité d'un réseau sont celles de son adjacence CSR : 
+        les réaffecter lève une ValueError (elles se changent en construisant le réseau, par exemple avec reseau.depuis_tableaux).
+        '''
+        if getattr(self,'reseau',None) is not None:
+            raise ValueError("les connexions de l'entité "+str(self.id_entite)+" sont celles de son réseau (adjacence CSR) : elles ne peuvent pas être réaffectées")
+        self._connexions=valeur
+        
+
+class connexions_entite(object):
+    """
+    Classe définissant une vue en lecture seule sur les connexions d'une entité, 
+    construite à la demande à partir de l'adjacence CSR (indptr, indices) du réseau. 
+    Se comporte comme la liste des entités connectées.
+    """
+    
+    def __init__(self,reseau,id_entite):
+        """
+        Constructeur qui initialise:
+            - reseau : (reseau), réseau qui contient l'adjacence.
+            - id_entite : (int), identifiant de l'entité dont on regarde les connexions.
+        """
+        self.reseau=reseau
+        self.id_entite=id_entite
+        
+    def ids(self):
+        '''
+        --> (numpy.ndarray), identifiants des entités connectées.
+        '''
+        return self.reseau.indices[self.reseau.indptr[self.id_entite]:self.reseau.indptr[self.id_entite+1]]
+        
+    def __len__(self):
+        return int(self.reseau.indptr[self.id_entite+1]-self.reseau.indptr[self.id_entite])
+    
+    def __iter__(self):
+        for id_voisin in self.ids():
+            yield self.reseau.entites[id_voisin]
+            
+    def __getitem__(self,index):
+        return self.reseau.entites[self.ids()[index]]
+    
+    def __contains__(self,autre_entite):
+        return autre_entite.reseau is self.reseau and bool(np.any(self.ids()==autre_entite.id_entite))
+    
+    def __repr__(self):
+        return repr(list(self))
+        
+
+def tirage_connexions(rng,nb_entites,degres):
+    '''
+    Fonction qui tire, pour chaque entité k, degres[k] entités distinctes (autres que k) parmi les nb_entites du réseau, 
+    et renvoie le résultat au format CSR.
+    
+    Les lignes peu denses (degré inférieur à la moitié des autres entités) sont tirées ensemble par rejet des doublons, 
+    les lignes denses en tirant les entités exclues, de sorte que le coût reste proportionnel au nombre de connexions.
+    
+    Arguments : 
+        - rng : (numpy.random.Generator), générateur aléatoire.
+        - nb_entites : (int), nombre d'entités du réseau.
+        - degres : (numpy.ndarray), nombre de connexions sortantes de chaque entité.
+    
+    --> (tuple : (indptr, indices)), indptr (int64, taille nb_entites+1) et indices (int32, triés pour chaque entité).
+    '''
+    n=nb_entites
+    degres=np.asarray(degres,dtype=np.int64)
+    autres=max(n-1,0)
+    cles=[] # une connexion k -> j est codée par la clé k*n+j
+    
+    #lignes peu denses : tirage avec remise puis on retire les doublons et on complète, jusqu'à avoir le bon nombre d'entités
+    peu_denses=np.flatnonzero(2*degres<=autres)
+    cles_peu_denses=np.zeros(0,dtype=np.int64)
+    manquants=degres[peu_denses]
+    while manquants.sum()>0:
+        sources=np.repeat(peu_denses,manquants)
+        cibles=rng.integers(0,autres,size=len(sources))
+        cibles+=cibles>=sources # on saute l'entité elle-même
+        cles_peu_denses=np.sort(np.concatenate([cles_peu_denses,sources*n+cibles]))
+        cles_peu_denses=cles_peu_denses[np.concatenate(([True],cles_peu_denses[1:]!=cles_peu_denses[:-1]))] # retrait des doublons
+        manquants=degres[peu_denses]-np.bincount(cles_peu_denses//n,minlength=n)[peu_denses]
+    cles.append(cles_peu_denses)
+    
+    #lignes denses : on tire les entités exclues
+    for k in np.flatnonzero(2*degres>autres):
+        autres_entites=np.delete(np.arange(n,dtype=np.int64),k)
+        exclues=rng.choice(autres,size=autres-degres[k],replace=False)
+        cles.append(k*n+np.delete(autres_entites,exclues))
+        
+    return csr_depuis_cles(n,np.concatenate(cles))
+
+
+def tirage_geometrique(rng,nb_entites,p_connexion):
+    '''
+    Fonction qui tire les connexions du réseau par sauts géométriques : pour chaque entité k, 
+    l'écart entre deux entités connectées successives (parmi les nb_entites-1 autres) suit une loi géométrique de paramètre p_connexion[k]. 
+    La loi des connexions est la même qu'avec un tirage par paire, mais on ne tire qu'un nombre par connexion : 
+    adapté aux réseaux peu denses.
+    
+    Arguments : 
+        - rng : (numpy.random.Generator), générateur aléatoire.
+        - nb_entites : (int), nombre d'entités du réseau.
+        - p_connexion : (numpy.ndarray), probabilité de connexion de chaque entité.
+    
+    --> (tuple : (indptr, indices)), connexions au format CSR.
+    '''
+    n=nb_entites
+    autres=max(n-1,0)
+    cles=[np.zeros(0,dtype=np.int64)]
+    lignes=np.flatnonzero(p_connexion>0) if autres>0 else np.zeros(0,dtype=np.int64)
+    derniere=np.full(len(lignes),-1,dtype=np.int64) # dernière position atteinte par chaque ligne
+    while len(lignes)>0:
+        p=p_connexion[lignes]
+        #nombre de sauts tirés pour chaque ligne : un peu plus que le nombre de connexions attendu sur le reste de la ligne
+        restant=autres-1-derniere
+        nb_sauts=np.minimum(restant,np.ceil(1.1*restant*p+10).astype(np.int64))
+        sauts=rng.geometric(np.repeat(p,nb_sauts))
+        cumul=np.cumsum(sauts)
+        debut_ligne=np.cumsum(nb_sauts)-nb_sauts
+        avant_ligne=np.concatenate(([0],cumul))[debut_ligne]
+        positions=np.repeat(derniere,nb_sauts)+cumul-np.repeat(avant_ligne,nb_sauts)
+        sources=np.repeat(lignes,nb_sauts)
+        gardees=positions<autres
+        cibles=positions[gardees]
+        cibles+=cibles>=sources[gardees] # on saute l'entité elle-même
+        cles.append(sources[gardees]*n+cibles)
+        #les lignes dont le dernier saut n'a pas dépassé la fin doivent être complétées
+        derniere=positions[debut_ligne+nb_sauts-1]
+        a_completer=derniere<autres-1
+        lignes,derniere=lignes[a_completer],derniere[a_completer]
+    return csr_depuis_cles(n,np.concatenate(cles))
+
+
+def tirage_spatial(rng,positions,p_connexion,portee,noyau='disque'):
+    '''
+    Fonction qui tire des connexions locales dans l'espace : une entité k ne peut être connectée qu'aux entités proches d'elle.
+    Les entités sont rangées dans une grille de cases de la taille de la portée et on ne compare que les entités de cases voisines, 
+    de sorte que le coût est proportionnel au nombre de paires d'entités proches.
+    
+    Arguments : 
+        - rng : (numpy.random.Generator), générateur aléatoire.
+        - positions : (numpy.ndarray, taille (nb_entites,2)), positions des entités.
+        - p_connexion : (numpy.ndarray), probabilité de connexion de chaque entité.
+        - portee : (float), portée des connexions.
+        - noyau : (string : {'disque','gaussien'}), 
+            'disque' : connexion avec la probabilité p_connexion[k] aux entités à une distance inférieure à portee.
+            'gaussien' : connexion avec la probabilité p_connexion[k]*exp(-d²/(2*portee²)), limitée aux entités à une distance inférieure à 3*portee.
+    
+    --> (tuple : (indptr, indices)), connexions au format CSR.
+    '''
+    if noyau not in ('disque','gaussien'):
+        raise ValueError("noyau inconnu : "+str(noyau)+" (valeurs possibles : 'disque', 'gaussien')")
+    n=len(positions)
+    positions=np.asarray(positions,dtype=np.float64).reshape(n,2)
+    rayon=portee if noyau=='disque' else 3*portee
+    cases=np.floor(positions/rayon).astype(np.int64)+1 # +1 pour que les cases voisines restent positives
+    hauteur=int(cases[:,1].max())+2 if n>0 else 1
+    cle_case=cases[:,0]*hauteur+cases[:,1]
+    ordre=np.argsort(cle_case,kind='stable')
+    cles_triees=cle_case[ordre]
+    cles=[np.zeros(0,dtype=np.int64)]
+    for dx in (-1,0,1):
+        for dy in (-1,0,1):
+            #entités de la case voisine (dx,dy) de chaque entité
+            voisine=cle_case+dx*hauteur+dy
+            debuts=np.searchsorted(cles_triees,voisine,side='left')
+            nb=np.searchsorted(cles_triees,voisine,side='right')-debuts
+            sources=np.repeat(np.arange(n,dtype=np.int64),nb)
+            decalages=np.arange(int(nb.sum()),dtype=np.int64)-np.repeat(np.cumsum(nb)-nb,nb)
+            cibles=ordre[np.repeat(debuts,nb)+decalages]
+            d2=((positions[sources]-positions[cibles])**2).sum(axis=1)
+            proches=(d2<=rayon**2)&(sources!=cibles)
+            sources,cibles,d2=sources[proches],cibles[proches],d2[proches]
+            p=p_connexion[sources]
+            if noyau=='gaussien':
+                p=p*np.exp(-d2/(2*portee**2))
+            connectees=rng.random(len(sources))<p
+            cles.append(sources[connectees]*n+cibles[connectees])
+    return csr_depuis_cles(n,np.concatenate(cles))
+
+
+def csr_depuis_cles(nb_entites,cles):
+    '''
+    Fonction qui convertit des connexions codées par des clés k*nb_entites+j (connexion de k vers j), sans doublon, au format CSR.
+    
+    --> (tuple : (indptr, indices)), indptr (int64, taille nb_entites+1) et indices (int32, triés pour chaque entité).
+    '''
+    n=nb_entites
+    cles=np.sort(np.asarray(cles,dtype=np.int64))
+    indptr=np.zeros(n+1,dtype=np.int64)
+    np.cumsum(np.bincount(cles//max(n,1),minlength=n),out=indptr[1:])
+    indices=(cles%max(n,1)).astype(np.int32)
+    return indptr,indices
+    
+
+def voisins_csr(indptr,indices,lignes):
+    '''
+    Fonction qui renvoie les connexions sortantes d'un ensemble d'entités, mises bout à bout.
+    
+    --> (tuple : (origines, cibles)), origines[a] est la position dans lignes de l'entité d'où part la connexion a, cibles[a] l'entité d'arrivée.
+    '''
+    debuts=indptr[lignes]
+    degres=indptr[lignes+1]-debuts
+    nb_aretes=int(degres.sum())
+    decalages=np.arange(nb_aretes,dtype=np.int64)-np.repeat(np.cumsum(degres)-degres,degres)
+    return np.repeat(np.arange(len(lignes),dtype=np.int64),degres),indices[np.repeat(debuts,degres)+decalages].astype(np.int64)
+
+
+def transpose_csr(indptr,indices):
+    '''
+    Fonction qui inverse le sens des connexions d'un graphe au format CSR (connexions entrantes de chaque entité).
+    
+    --> (tuple : (indptr, indices)), connexions inversées au format CSR.
+    '''
+    n=len(indptr)-1
+    origines=np.repeat(np.arange(n,dtype=np.int64),np.diff(indptr))
+    return csr_depuis_cles(n,np.asarray(indices,dtype=np.int64)*n+origines)
+
+
+def distances_bfs(indptr,indices,source):
+    '''
+    Fonction qui calcule par parcours en largeur le nombre de sauts (connexions suivies dans leur sens) de l'entité source à chaque entité. 
+    Chaque niveau du parcours est traité par opérations sur les tableaux.
+    
+    --> (numpy.ndarray, int32), distances en nombre de sauts, -1 pour les entités que l'on ne peut pas atteindre.
+    '''
+    n=len(indptr)-1
+    distances=np.full(n,-1,dtype=np.int32)
+    distances[source]=0
+    frontiere=np.array([source],dtype=np.int64)
+    niveau=0
+    while len(frontiere)>0:
+        niveau+=1
+        cibles=voisins_csr(indptr,indices,frontiere)[1]
+        cibles=cibles[distances[cibles]<0]
+        distances[cibles]=niveau
+        frontiere=np.flatnonzero(distances==niveau) if len(cibles)>0 else cibles
+    return distances
+
+
+def excentricites_lot(tache):
+    '''
+    Fonction qui réalise en même temps les parcours en largeur partant de plusieurs sources : l'ensemble des sources qui ont atteint 
+    une entité est codé par les bits d'un tableau d'entiers (64 sources par mot), de sorte qu'un niveau de parcours traite 
+    jusqu'à 64*nb_mots sources en une passe sur les connexions de la frontière. Exécutée dans les processus de reseau.excentricites.
+    
+    Argument : 
+        - tache : (tuple : (indptr, indices, sources)), connexions au format CSR et sources des parcours.
+        
+    --> (dict), pour chaque source : 'excentricite' (plus grand nombre de sauts vers une entité atteinte), 
+    'nb_atteintes' (nombre d'entités atteintes, la source comprise) et 'somme_distances' (somme des nombres de sauts vers les entités atteintes).
+    '''
+    indptr,indices,sources=tache
+    n=len(indptr)-1
+    sources=np.asarray(sources,dtype=np.int64)
+    excentricite=np.zeros(len(sources),dtype=np.int64)
+    nb_atteintes=np.ones(len(sources),dtype=np.int64)
+    somme_distances=np.zeros(len(sources),dtype=np.int64)
+    nb_mots=int(min(16,max(1,-(-len(sources)//64))))
+    for debut in range(0,len(sources),64*nb_mots):
+        lot=sources[debut:debut+64*nb_mots]
+        k=np.arange(len(lot))
+        visitees=np.zeros((n,nb_mots),dtype=np.uint64)
+        np.bitwise_or.at(visitees,(lot,k//64),np.left_shift(np.uint64(1),(k%64).astype(np.uint64)))
+        #frontière : entités atteintes au niveau précédent (lignes) et sources qui viennent de les atteindre (bits de nouveaux)
+        lignes=np.flatnonzero(visitees.any(axis=1))
+        nouveaux=visitees[lignes]
+        niveau=0
+        while len(lignes)>0:
+            niveau+=1
+            #les bits de chaque entité de la frontière passent à ses voisines, regroupés par voisine (tri des connexions de la frontière) : 
+            #un niveau ne coûte que le nombre de ces connexions, pas le nombre d'entités du réseau
+            origines,cibles=voisins_csr(indptr,indices,lignes)
+            if len(cibles)==0:
+                break
+            ordre=np.argsort(cibles,kind='stable')
+            cibles=cibles[ordre]
+            debuts=np.flatnonzero(np.concatenate(([True],cibles[1:]!=cibles[:-1])))
+            touchees=cibles[debuts]
+            recus=np.bitwise_or.reduceat(nouveaux[origines[ordre]],debuts,axis=0)
+            recus&=~visitees[touchees]
+            gardees=recus.any(axis=1)
+            lignes=touchees[gardees]
+            nouveaux=recus[gardees]
+            visitees[lignes]|=nouveaux
+            #nombre d'entités atteintes à ce niveau, pour chaque source
+            nb_nouveaux=np.unpackbits(nouveaux.view(np.uint8),axis=1,bitorder='little').sum(axis=0,dtype=np.int64)[:len(lot)]
+            atteint=nb_nouveaux>0
+            excentricite[debut:debut+len(lot)][atteint]=niveau
+            nb_atteintes[debut:debut+len(lot)]+=nb_nouveaux
+            somme_distances[debut:debut+len(lot)]+=niveau*nb_nouveaux
+    return {'excentricite':excentricite,'nb_atteintes':nb_atteintes,'somme_distances':somme_distances}
+
+
+def composantes_fortes(indptr,indices):
+    '''
+    Fonction qui calcule les composantes fortement connexes d'un graphe au format CSR (algorithme de Tarjan, sans récursion).
+    
+    --> (numpy.ndarray, int32), numéro de la composante de chaque entité.
+    '''
+    n=len(indptr)-1
+    indptr=np.asarray(indptr).tolist()
+    indices=np.asarray(indices).tolist()
+    index=[-1]*n
+    bas=[0]*n
+    sur_pile=[False]*n
+    pile=[]
+    composante=[-1]*n
+    compteur=0
+    nb_composantes=0
+    for racine in range(n):
+        if index[racine]!=-1:
+            continue
+        index[racine]=bas[racine]=compteur
+        compteur+=1
+        pile.append(racine)
+        sur_pile[racine]=True
+        appels=[[racine,indptr[racine]]]
+        while appels:
+            appel=appels[-1]
+            v,k=appel
+            if k<indptr[v+1]:
+                appel[1]=k+1
+                w=indices[k]
+                if index[w]==-1:
+                    index[w]=bas[w]=compteur
+                    compteur+=1
+                    pile.append(w)
+                    sur_pile[w]=True
+                    appels.append([w,indptr[w]])
+                elif sur_pile[w] and index[w]<bas[v]:
+                    bas[v]=index[w]
+            else:
+                appels.pop()
+                if appels and bas[v]<bas[appels[-1][0]]:
+                    bas[appels[-1][0]]=bas[v]
+                if bas[v]==index[v]:
+                    w=-1
+                    while w!=v:
+                        w=pile.pop()
+                        sur_pile[w]=False
+                        composante[w]=nb_composantes
+                    nb_composantes+=1
+    return np.array(composante,dtype=np.int32)
+
+
+class index_spatial(object):
+    """
+    Classe définissant un index spatial des entités : les entités sont rangées dans une grille de cases (comme dans tirage_spatial), 
+    de sorte qu'une requête ne compare que les entités des cases proches de la position demandée.
+    
+    Méthodes : 
+        - dans_rayon : entités à une distance inférieure à un rayon d'une position.
+        - plus_proches : k entités les plus proches d'une position.
+    """
+    
+    def __init__(self,positions,taille_case=None):
+        """
+        Constructeur qui initialise:
+            - positions : (numpy.ndarray, taille (nb_entites,2)), positions des entités.
+            - taille_case : (float), côté des cases de la grille.
+            
+        Arguments : 
+            - positions : obligatoire.
+            - taille_case : facultatif, None par défaut (côté choisi pour avoir environ 4 entités par case).
+        """
+        self.positions=np.asarray(positions,dtype=np.float64).reshape(-1,2)
+        n=len(self.positions)
+        if taille_case is None:
+            etendue=self.positions.max(axis=0)-self.positions.min(axis=0) if n>0 else np.ones(2)
+            taille_case=max(1.,math.sqrt(4*max(etendue[0],1)*max(etendue[1],1)/max(n,1)))
+        self.taille_case=taille_case
+        self._origine=self.positions.min(axis=0) if n>0 else np.zeros(2)
+        cases=np.floor((self.positions-self._origine)/taille_case).astype(np.int64)
+        self._hauteur=int(cases[:,1].max())+1 if n>0 else 1
+        self._largeur=int(cases[:,0].max())+1 if n>0 else 1
+        cle_case=cases[:,0]*self._hauteur+cases[:,1]
+        self._ordre=np.argsort(cle_case,kind='stable')
+        self._cles_triees=cle_case[self._ordre]
+        
+    def dans_rayon(self,position,rayon):
+        '''
+        Méthode qui renvoie les entités à une distance (euclidienne) inférieure ou égale à rayon de position.
+        
+        --> (numpy.ndarray), identifiants des entités, par distance croissante.
+        '''
+        centre=np.asarray(position,dtype=np.float64)
+        bas=np.maximum(np.floor((centre-rayon-self._origine)/self.taille_case).astype(np.int64),0)
+        haut=np.minimum(np.floor((centre+rayon-self._origine)/self.taille_case).astype(np.int64),[self._largeur-1,self._hauteur-1])
+        if (haut<bas).any():
+            return np.zeros(0,dtype=np.int64)
+        #une colonne de cases correspond à un intervalle de clés contigu
+        colonnes=np.arange(bas[0],haut[0]+1)
+        debuts=np.searchsorted(self._cles_triees,colonnes*self._hauteur+bas[1],side='left')
+        fins=np.searchsorted(self._cles_triees,colonnes*self._hauteur+haut[1],side='right')
+        candidates=self._ordre[np.concatenate([np.arange(d,f) for d,f in zip(debuts,fins)])] if len(colonnes)>0 else np.zeros(0,dtype=np.int64)
+        d2=((self.positions[candidates]-centre)**2).sum(axis=1)
+        proches=d2<=rayon**2
+        candidates,d2=candidates[proches],d2[proches]
+        return candidates[np.argsort(d2,kind='stable')]
+    
+    def plus_proches(self,position,k):
+        '''
+        Méthode qui renvoie les k entités les plus proches de position (toutes les entités s'il y en a moins de k). 
+        Le rayon de recherche est doublé jusqu'à contenir k entités.
         
+        --> (numpy.ndarray), identifiants des entités, par distance croissante.
+        '''
+        k=min(k,len(self.positions))
+        rayon=self.taille_case
+        while True:
+            proches=self.dans_rayon(position,rayon)
+            if len(proches)>=k:
+                return proches[:k]
+            rayon*=2
+            
 
 class reseau(object):
     """
     Classe définissant un réseau, lui-même composé d'entités. 
     
     Méthodes de la classe : 
-        - distance : calcule la distance entre deux entités du réseau.
-        - diametre : calcule le diamètre du réseau. 
+        - distance : calcule la distance dans l'espace entre deux entités du réseau.
+        - positions, distances_euclidiennes, index_spatial : positions des entités et requêtes spatiales.
+        - distances_sauts, distance_sauts : nombre de sauts entre entités (parcours en largeur).
+        - excentricites : parcours en largeur par lots de sources, éventuellement sur plusieurs processus.
+        - diametre : calcule le diamètre du réseau (en nombre de sauts). 
+        - diametre_geometrique : calcule le diamètre géométrique du réseau (dans l'espace).
+        - composantes_fortement_connexes : calcule les composantes fortement connexes du réseau.
+        - estime_distances : estime distances, accessibilité et diamètre à partir d'un échantillon de sources.
         - graphique : affiche une représentation graphique du réseau.
+        - vecteurs_probabilites : renvoie les probabilités des entités sous forme de tableaux numpy.
+        - adjacence : renvoie les connexions du réseau sous forme de tableaux d'entiers (format CSR).
+        - tableaux : renvoie positions, probabilités et connexions des entités sous forme de tableaux numpy.
+        - depuis_tableaux : reconstruit un réseau à partir de ces tableaux.
+        - empreinte : calcule une empreinte (hash) du réseau.
     """    
     
-    def __init__(self,id_reseau,nb_entites=10,espace=[50,50]):
+    def __init__(self,id_reseau,nb_entites=10,espace=[50,50],generateur='paires',graine=None,portee=5,noyau='disque'):
         """
         Constructeur qui initialise:
             - id_reseau : (int), numéro d'identification du réseau.  
             - nb_entites : (int), nombre d'entités composant le réseau.
             - espace : (list de type [x,y]), x = borne supérieur en abscisse du réseau et y = borne supérieure en ordonnée du réseau.
             - entites : (list), liste des entités qui composent le réseau. 
+            - indptr, indices : (numpy.ndarray), connexions entre les entités au format CSR : 
+            les entités connectées à l'entité k sont indices[indptr[k]:indptr[k+1]].
+            - generateur : (string), mode de génération des connexions.
+            - graine : (int ou None), graine utilisée pour générer le réseau.
             
         Arguments : 
             - id_reseau : obligatoire. 
             - nb_entites : facultatif, 10 par défaut. 
             - espace : facultatif, [50,50] par défaut.
+            - generateur : facultatif, 'paires' par défaut. Mode de génération des connexions : 
+                'paires' : un tirage par paire d'entités (coût en O(nb_entites²)), comme dans la première version du réseau : 
+                avec graine=None, rd.seed donne le même réseau qu'avant l'ajout des autres modes.
+                'degres' : on tire le nombre de connexions de chaque entité (loi binomiale) puis autant d'entités distinctes.
+                'geometrique' : sauts géométriques entre connexions successives, adapté aux réseaux peu denses.
+                'spatial' : connexions locales, limitées aux entités proches dans l'espace (voir portee et noyau).
+            Les trois premiers modes donnent la même loi des connexions : chaque entité est connectée à chacune des autres avec la probabilité p_connexion.
+            Les modes autres que 'paires' coûtent O(nombre de connexions). Mais p_connexion suivant la loi uniforme sur [0,1], 
+            chaque entité de ces trois modes a en moyenne (nb_entites-1)/2 connexions : leur nombre croît en O(nb_entites²) 
+            (environ 12 millions pour 5000 entités). Pour les grands réseaux (10^5 entités et plus), seul le mode 'spatial', 
+            dont le nombre de connexions par entité ne dépend que de portee, reste rapide et tient en mémoire : au-delà de 
+            MAX_CONNEXIONS_DENSES tirages de paires ou connexions attendues (environ 10^4 entités), les trois autres modes lèvent une ValueError.
+            - graine : facultatif, None par défaut (on utilise alors le module random, que fixe rd.seed ; 
+            les modes autres que 'paires' y tirent en plus la graine de leur générateur numpy). 
+            - portee : facultatif, 5 par défaut, portée des connexions du mode 'spatial'.
+            - noyau : facultatif, 'disque' par défaut, forme des connexions du mode 'spatial' ('disque' ou 'gaussien', voir tirage_spatial).
         """
+        if generateur not in ('paires','degres','geometrique','spatial'):
+            raise ValueError("generateur inconnu : "+str(generateur)+" (valeurs possibles : 'paires', 'degres', 'geometrique', 'spatial')")
         self.id=id_reseau
         self.nb_entites=nb_entites
         self.espace=espace
+        self.generateur=generateur
+        self.graine=graine
+        alea=rd if graine is None else rd.Random(graine)
         
         # création du nombre d'entités renseigné en entrée
+        if self.nb_entites>(espace[0]+1)*(espace[1]+1):
+            raise ValueError("l'espace "+str(espace)+" ne contient pas assez de positions pour "+str(self.nb_entites)+" entités")
         self.entites=[]
-        liste_positions_entites=[]
+        positions_prises=set()
         for k in range(0,self.nb_entites): 
-            position_entite=[rd.randint(0,espace[0]),rd.randint(0,espace[1])]
-            while position_entite in liste_positions_entites: #on verifie que la position occupée par l'entité n'est pas déjà prise
-                position_entite=[rd.randint(0,espace[0]),rd.randint(0,espace[1])]
-            liste_positions_entites+=[position_entite] 
-            new_entite=entite(k,position_entite)
+            position_entite=[alea.randint(0,espace[0]),alea.randint(0,espace[1])]
+            while tuple(position_entite) in positions_prises: #on verifie que la position occupée par l'entité n'est pas déjà prise
+                position_entite=[alea.randint(0,espace[0]),alea.randint(0,espace[1])]
+            positions_prises.add(tuple(position_entite))
+            new_entite=entite(k,position_entite,alea=alea)
+            new_entite.reseau=self
             self.entites.append(new_entite)
         
         # connexions entre les entités
-        for entite1 in self.entites: 
-            for entite2 in self.entites:
-                if entite1 != entite2:
-                    alea_connexion=rd.random()
-                    if alea_connexion<entite1.p_connexion:
-                        entite1.connexions+=[entite2]
+        p_connexion=np.array([entite.p_connexion for entite in self.entites],dtype=np.float64)
+        if generateur!='spatial':
+            taille=self.nb_entites*(self.nb_entites-1) if generateur=='paires' else (self.nb_entites-1)*p_connexion.sum()
+            if taille>MAX_CONNEXIONS_DENSES:
+                raise ValueError("le mode "+generateur+" demanderait environ "+str(int(taille))+" tirages ou connexions pour "+str(self.nb_entites)
+                                 +" entités (plus de MAX_CONNEXIONS_DENSES="+str(MAX_CONNEXIONS_DENSES)+") : utiliser generateur='spatial' pour les grands réseaux")
+        if generateur=='paires':
+            # un tirage par paire ordonnée d'entités, comme dans la première version du réseau
+            cles=[]
+            for entite1 in self.entites: 
+                for entite2 in self.entites:
+                    if entite1 != entite2:
+                        alea_connexion=alea.random()
+                        if alea_connexion<entite1.p_connexion:
+                            cles+=[entite1.id_entite*self.nb_entites+entite2.id_entite]
+            self.indptr,self.indices=csr_depuis_cles(self.nb_entites,np.array(cles,dtype=np.int64))
+        else:
+            rng=np.random.default_rng(alea.getrandbits(64)) # générateur numpy dérivé de alea, pour que la graine (ou rd.seed) fixe aussi les connexions
+            if generateur=='degres':
+                # chaque entité est connectée à chacune des autres avec la probabilité p_connexion, 
+                # son nombre de connexions suit donc une loi binomiale B(nb_entites-1, p_connexion) : on tire ce nombre puis autant d'entités distinctes
+                degres=rng.binomial(max(self.nb_entites-1,0),p_connexion)
+                self.indptr,self.indices=tirage_connexions(rng,self.nb_entites,degres)
+            elif generateur=='geometrique':
+                self.indptr,self.indices=tirage_geometrique(rng,self.nb_entites,p_connexion)
+            else:
+                positions=np.array([entite.position for entite in self.entites],dtype=np.float64).reshape(self.nb_entites,2)
+                self.indptr,self.indices=tirage_spatial(rng,positions,p_connexion,portee,noyau)
             
             
     def distance(self,index_entite1,index_entite2):
         """
-        Méthode  renvoie la distance dans le reseau entre les entites avec pour index "index_entite1" et "index_entite2".
+        Méthode  renvoie la distance dans l'espace (euclidienne) entre les entites avec pour index "index_entite1" et "index_entite2".
         
         index_entite1 : (int), index de l'entité 1.
         index_entite2 : (int), index de l'entité 2.
@@ -101,406 +657,3646 @@ class reseau(object):
         --> (float), distance entre les deux entités considérées. 
         """
         
-        self.distance=((self.entites[index_entite1-1].position[0]-self.entites[index_entite2-1].position[0])**2+(self.entites[index_entite1].position[1]-self.entites[index_entite2].position[1])**2)**(1/2)
-        return self.distance 
-
+        position1=self.entites[index_entite1].position
+        position2=self.entites[index_entite2].position
+        return ((position1[0]-position2[0])**2+(position1[1]-position2[1])**2)**(1/2)
+    
+    def positions(self):
+        ''' 
+        Méthode qui renvoie les positions des entités.
+        
+        --> (numpy.ndarray, float64, taille (nb_entites,2))
+        '''
+        return np.array([entite.position for entite in self.entites],dtype=np.float64).reshape(self.nb_entites,2)
+    
+    def distances_euclidiennes(self,ids=None):
+        ''' 
+        Méthode qui calcule la matrice des distances dans l'espace entre les entités ids (toutes les entités par défaut). 
+        La matrice a len(ids)² coefficients : pour des requêtes locales sur un grand réseau, utiliser index_spatial.
+        
+        --> (numpy.ndarray, float64, taille (len(ids),len(ids)))
+        '''
+        positions=self.positions()
+        if ids is not None:
+            positions=positions[np.asarray(ids,dtype=np.int64)]
+        return np.sqrt(((positions[:,None,:]-positions[None,:,:])**2).sum(axis=2))
+    
+    def index_spatial(self,taille_case=None):
+        ''' 
+        Méthode qui construit un index spatial des entités, pour les requêtes de voisinage dans l'espace 
+        (entités dans un rayon, plus proches entités d'une position).
+        
+        --> (index_spatial)
+        '''
+        return index_spatial(self.positions(),taille_case)
+    
+    def distances_sauts(self,id_entite):
+        ''' 
+        Méthode qui calcule par parcours en largeur le nombre de sauts (connexions suivies dans leur sens) de l'entité id_entite à chaque entité.
+        
+        --> (numpy.ndarray, int32), distances, -1 pour les entités que l'on ne peut pas atteindre.
+        '''
+        return distances_bfs(self.indptr,self.indices,id_entite)
     
-    def diametre(self):
+    def distance_sauts(self,index_entite1,index_entite2):
         ''' 
-        Méthode qui calcule le diamètre du réseau. 
+        Méthode qui renvoie le nombre minimal de sauts pour aller de l'entité index_entite1 à l'entité index_entite2 (-1 si c'est impossible).
         
-        --> (float), diamètre du réseau. 
+        --> (int)
         '''
+        return int(self.distances_sauts(index_entite1)[index_entite2])
+    
+    def excentricites(self,sources=None,nb_processus=1,inverse=False):
+        ''' 
+        Méthode qui réalise les parcours en largeur partant de chaque source, par lots de sources traités ensemble (voir excentricites_lot), 
+        éventuellement répartis sur plusieurs processus.
         
-        #calcul du centre de gravité du réseau
-        centre=[0,0]
-        nb_entite=len(self.entites)
-        for entite in self.entites:
-            centre[0]+=entite.position[0]/nb_entite
-            centre[1]+=entite.position[1]/nb_entite
-        #recherche du point le plus éloigné du centre de gravité et calcul du rayon
-        rayon=0
-        for entite in self.entites:
-            distance_max=((entite.position[0]-centre[0])**2+(entite.position[1]-centre[1])**2)**(1/2)
-            if distance_max>rayon:
-                rayon=distance_max
-        #calcul du diamètre
-        self.diametre=2*rayon
-        return self.diametre
+        Arguments : 
+            - sources : facultatif, None par défaut (toutes les entités), entités d'où partent les parcours.
+            - nb_processus : facultatif, 1 par défaut, nombre de processus (None : autant que de coeurs).
+            - inverse : facultatif, False par défaut. Si True, les connexions sont suivies à contresens 
+            (distances des entités vers les sources).
             
-
-    def graphique(self):
+        --> (dict), tableaux indexés comme sources : 'excentricite', 'nb_atteintes', 'somme_distances' (voir excentricites_lot).
+        '''
+        if sources is None:
+            sources=np.arange(self.nb_entites,dtype=np.int64)
+        sources=np.asarray(sources,dtype=np.int64)
+        indptr,indices=transpose_csr(self.indptr,self.indices) if inverse else (self.indptr,self.indices)
+        #les sources d'un même lot partagent d'autant plus leurs frontières qu'elles sont proches : 
+        #on les range le long d'une courbe de Morton (ordre z) de l'espace
+        positions=self.positions().astype(np.int64)[sources]
+        code=np.zeros(len(sources),dtype=np.int64)
+        for bit in range(31):
+            code|=(((positions[:,0]>>bit)&1)<<(2*bit))|(((positions[:,1]>>bit)&1)<<(2*bit+1))
+        ordre=np.argsort(code,kind='stable')
+        if nb_processus==1 or len(sources)<=1024:
+            resultats=[excentricites_lot((indptr,indices,sources[ordre]))]
+        else:
+            nb_workers=nb_processus or os.cpu_count() or 1
+            taille_tache=-(-len(sources)//(64*nb_workers))*64
+            taches=[(indptr,indices,sources[ordre[debut:debut+taille_tache]]) for debut in range(0,len(sources),taille_tache)]
+            with ProcessPoolExecutor(max_workers=nb_workers) as executeur:
+                resultats=list(executeur.map(excentricites_lot,taches))
+        #retour à l'ordre des sources
+        rang=np.empty(len(sources),dtype=np.int64)
+        rang[ordre]=np.arange(len(sources))
+        return {cle:np.concatenate([resultat[cle] for resultat in resultats])[rang] for cle in resultats[0]}
+    
+    def diametre(self,strict=False,nb_processus=1):
+        ''' 
+        Méthode qui calcule le diamètre du réseau : le plus grand nombre de sauts nécessaire pour aller d'une entité à une autre, 
+        les connexions étant suivies dans leur sens. Le calcul est exact (un parcours en largeur par entité, par lots).
+        
+        Arguments : 
+            - strict : facultatif, False par défaut. Si le réseau n'est pas fortement connexe, certaines entités ne peuvent pas en atteindre d'autres : 
+            le diamètre vaut alors float('inf') si strict est True, et le plus grand nombre de sauts entre entités qui peuvent s'atteindre sinon.
+            - nb_processus : facultatif, 1 par défaut, nombre de processus (voir excentricites).
+        
+        --> (int ou float), diamètre du réseau. 
+        '''
+        if self.nb_entites==0:
+            return 0
+        resultats=self.excentricites(nb_processus=nb_processus)
+        if strict and (resultats['nb_atteintes']<self.nb_entites).any():
+            return float('inf')
+        return int(resultats['excentricite'].max())
+    
+    def diametre_geometrique(self):
+        ''' 
+        Méthode qui calcule le diamètre géométrique du réseau : deux fois la distance du centre de gravité des entités à l'entité la plus éloignée.
+        
+        --> (float)
+        '''
+        positions=self.positions()
+        if len(positions)==0:
+            return 0.
+        return 2*float(np.sqrt(((positions-positions.mean(axis=0))**2).sum(axis=1)).max())
+    
+    def composantes_fortement_connexes(self):
+        ''' 
+        Méthode qui calcule les composantes fortement connexes du réseau (ensembles d'entités qui peuvent toutes s'atteindre les unes les autres). 
+        La composante de l'entité la mieux connectée est obtenue par deux parcours en largeur (entités atteintes et entités qui l'atteignent), 
+        les autres par l'algorithme de Tarjan sur les entités restantes.
+        
+        --> (numpy.ndarray, int32), numéro de la composante de chaque entité, 0 pour celle de l'entité la mieux connectée.
+        '''
+        n=self.nb_entites
+        composante=np.full(n,-1,dtype=np.int32)
+        if n==0:
+            return composante
+        indptr_inverse,indices_inverse=transpose_csr(self.indptr,self.indices)
+        pivot=int(np.argmax(np.diff(self.indptr)*np.diff(indptr_inverse)))
+        geante=(distances_bfs(self.indptr,self.indices,pivot)>=0)&(distances_bfs(indptr_inverse,indices_inverse,pivot)>=0)
+        composante[geante]=0
+        #une composante qui ne contient pas le pivot est disjointe de la sienne : on la cherche dans le réseau privé de celle-ci
+        restantes=np.flatnonzero(~geante)
+        if len(restantes)>0:
+            numero=np.full(n,-1,dtype=np.int64)
+            numero[restantes]=np.arange(len(restantes))
+            origines,cibles=voisins_csr(self.indptr,self.indices,restantes)
+            gardees=numero[cibles]>=0
+            indptr,indices=csr_depuis_cles(len(restantes),origines[gardees]*len(restantes)+numero[cibles[gardees]])
+            composante[restantes]=composantes_fortes(indptr,indices)+1
+        return composante
+    
+    def estime_distances(self,nb_sources=64,niveau=0.95,graine=0,nb_processus=1):
+        ''' 
+        Méthode qui estime les distances en nombre de sauts à partir de parcours en largeur partant de nb_sources entités tirées au hasard, 
+        pour les réseaux trop grands pour un calcul exact. Les intervalles de confiance utilisent l'approximation normale.
+        
+        Arguments : 
+            - nb_sources : facultatif, 64 par défaut, nombre d'entités sources.
+            - niveau : facultatif, 0.95 par défaut, niveau des intervalles de confiance.
+            - graine : facultatif, 0 par défaut, graine du tirage des sources.
+            - nb_processus : facultatif, 1 par défaut (voir excentricites).
+            
+        --> (dict) : 
+            - 'distance_moyenne', 'ic_distance' : nombre moyen de sauts entre deux entités qui peuvent s'atteindre.
+            - 'part_atteignable', 'ic_part' : part des couples d'entités (a,b) tels que a peut atteindre b.
+            - 'diametre_min', 'diametre_max' : bornes du diamètre. La borne inférieure est la plus grande excentricité des sources ; 
+            la borne supérieure, min(excentricité + excentricité à contresens) sur les sources, ne vaut que si le réseau est fortement connexe 
+            (float('inf') si une source n'atteint pas toutes les entités ou n'est pas atteinte par toutes).
+        '''
+        n=self.nb_entites
+        sources=np.random.default_rng(graine).choice(n,min(nb_sources,n),replace=False)
+        directes=self.excentricites(sources,nb_processus)
+        inverses=self.excentricites(sources,nb_processus,inverse=True)
+        z=statistics.NormalDist().inv_cdf(0.5+niveau/2)
+        k=len(sources)
+        
+        #distance moyenne : estimateur par quotient (somme des distances / nombre de couples), variance par la méthode delta
+        sommes=directes['somme_distances'].astype(np.float64)
+        couples=directes['nb_atteintes'].astype(np.float64)-1
+        distance_moyenne=float(sommes.sum()/couples.sum()) if couples.sum()>0 else float('nan')
+        ecart=float(np.std(sommes-distance_moyenne*couples,ddof=1))/couples.mean() if k>1 and couples.sum()>0 else 0.
+        parts=couples/max(n-1,1)
+        part_atteignable=float(parts.mean())
+        ecart_part=float(parts.std(ddof=1)) if k>1 else 0.
+        
+        connexe=(directes['nb_atteintes']==n).all() and (inverses['nb_atteintes']==n).all()
+        return {'distance_moyenne':distance_moyenne,'ic_distance':[distance_moyenne-z*ecart/math.sqrt(k),distance_moyenne+z*ecart/math.sqrt(k)],
+                'part_atteignable':part_atteignable,'ic_part':[max(0.,part_atteignable-z*ecart_part/math.sqrt(k)),min(1.,part_atteignable+z*ecart_part/math.sqrt(k))],
+                'diametre_min':int(directes['excentricite'].max()),
+                'diametre_max':int((directes['excentricite']+inverses['excentricite']).min()) if connexe else float('inf')}
+        
+    def graphique(self,fichier=None,rendu='auto',max_aretes=100000,resolution=512):
         ''' 
-        Méthode qui affiche une représentation graphique du réseau. 
+        Méthode qui affiche une représentation graphique du réseau. Les connexions sont lues dans l'adjacence CSR 
+        et tracées d'un seul tenant (LineCollection), ce qui permet de représenter des réseaux de plusieurs milliers d'entités.
         
         Ajout d'un attribut au réseau : 
             - figure : représentation graphique du réseau. 
+            
+        Arguments : 
+            - fichier : facultatif, None par défaut (affichage dans une fenêtre). Fichier où enregistrer la figure (.png, .svg...), sans fenêtre.
+            - rendu : facultatif, 'auto' par défaut. Représentation des connexions : 
+                'aretes' : toutes les connexions.
+                'echantillon' : max_aretes connexions tirées au hasard (tirage reproductible).
+                'densite' : image de la densité des connexions (résolution pixels de côté), dont le coût ne dépend plus du tracé de chaque connexion.
+                'auto' : 'aretes' jusqu'à max_aretes connexions, 'densite' au-delà.
+            - max_aretes : facultatif, 100000 par défaut.
+            - resolution : facultatif, 512 par défaut, côté (en pixels) de l'image du rendu 'densite'.
         
         '''
+        if rendu not in ('auto','aretes','echantillon','densite'):
+            raise ValueError("rendu inconnu : "+str(rendu)+" (valeurs possibles : 'auto', 'aretes', 'echantillon', 'densite')")
+        from matplotlib.collections import LineCollection
+        plt=pyplot(non_interactif=fichier is not None)
         self.figure=plt.figure(figsize=(10, 6))
-        # cree un nuage de points contenant chaque entite du reseau.
-        x1=[]
-        y1=[]
-        x2=[]
-        y2=[]
-        for entite in self.entites:
-            if entite.groupe=="bon_public":
-                x1.append(entite.position[0])
-                y1.append(entite.position[1])
-            else:
-                x2.append(entite.position[0])
-                y2.append(entite.position[1])
-        plt.scatter(x1,y1, marker='o', label='Entité bon publique', c='#50C878', s=180)
-        plt.scatter(x2,y2, marker='o', label='Entité mauvais publique', c='#F51B00', s=180)
-        #crée des lignes entre les points pour les connexions entre les entités du réseau. 
-        for i in range(0,self.nb_entites):
-            for j in range(0,len(self.entites[i].connexions)):
-                x=[self.entites[i].position[0], self.entites[j].position[0]]
-                y=[self.entites[i].position[1], self.entites[j].position[1]]
-                plt.plot(x,y, color='0.3', linewidth=0.4)
-        plt.title("Représentation du réseau "+str(self.id))
         axes=plt.gca()
+        
+        #connexions : une ligne de l'entité k vers chacune des entités indices[indptr[k]:indptr[k+1]]
+        positions=np.array([entite.position for entite in self.entites],dtype=np.float64).reshape(self.nb_entites,2)
+        indptr,indices=self.adjacence()
+        nb_aretes=len(indices)
+        if rendu=='auto':
+            rendu='aretes' if nb_aretes<=max_aretes else 'densite'
+        origines=np.repeat(np.arange(self.nb_entites),np.diff(indptr))
+        if rendu=='echantillon' and nb_aretes>max_aretes:
+            choix=np.sort(np.random.default_rng(0).choice(nb_aretes,max_aretes,replace=False))
+            origines,extremites=origines[choix],indices[choix]
+        else:
+            extremites=indices
+        if rendu=='densite':
+            #chaque connexion est représentée par des points régulièrement espacés (au plus un par pixel traversé, 
+            #et environ 2e7 points en tout), comptés dans une grille de pixels
+            densite=np.zeros(resolution*resolution,dtype=np.int64)
+            echelle=np.array([resolution/max(1,self.espace[0]),resolution/max(1,self.espace[1])])
+            nb_points=int(min(resolution,max(8,2e7//max(1,len(origines)))))
+            pas=np.linspace(0,1,nb_points)
+            taille_lot=max(1,(1<<22)//nb_points)
+            for debut in range(0,nb_aretes,taille_lot):
+                a=positions[origines[debut:debut+taille_lot]]
+                b=positions[extremites[debut:debut+taille_lot]]
+                pixels=np.minimum(((a[:,None,:]+(b-a)[:,None,:]*pas[None,:,None])*echelle).astype(np.int64),resolution-1)
+                densite+=np.bincount((pixels[:,:,1]*resolution+pixels[:,:,0]).ravel(),minlength=resolution*resolution)
+            axes.imshow(np.log1p(densite.reshape(resolution,resolution)),origin='lower',extent=(0,self.espace[0],0,self.espace[1]),cmap='Greys',aspect='auto')
+        else:
+            segments=np.stack((positions[origines],positions[extremites]),axis=1)
+            axes.add_collection(LineCollection(segments,colors='0.3',linewidths=0.4,rasterized=len(segments)>10000))
+            
+        # cree un nuage de points contenant chaque entite du reseau.
+        bon_public=np.array([entite.groupe=="bon_public" for entite in self.entites],dtype=bool)
+        taille_points=180 if self.nb_entites<=100 else max(1.,18000/self.nb_entites)
+        axes.scatter(positions[bon_public,0],positions[bon_public,1], marker='o', label='Entité bon publique', c='#50C878', s=taille_points, zorder=2, rasterized=self.nb_entites>10000)
+        axes.scatter(positions[~bon_public,0],positions[~bon_public,1], marker='o', label='Entité mauvais publique', c='#F51B00', s=taille_points, zorder=2, rasterized=self.nb_entites>10000)
+        axes.set_title("Représentation du réseau "+str(self.id))
         axes.set_xlabel('x')
         axes.set_ylabel('y')
+        axes.autoscale_view()
         self.figure.legend()
-        plt.show()
+        montre_figure(plt,self.figure,fichier)
+    
+    def vecteurs_probabilites(self):
+        ''' 
+        Méthode qui renvoie les probabilités des entités du réseau sous forme de tableaux numpy, 
+        indexés par l'identifiant des entités.
+        
+        --> (tuple : (p_connexion, p_consultation, p_appreciation)), tableaux numpy (float64) de taille nb_entites.
+        '''
+        p_connexion=np.array([entite.p_connexion for entite in self.entites],dtype=np.float64)
+        p_consultation=np.array([entite.p_consultation for entite in self.entites],dtype=np.float64)
+        p_appreciation=np.array([entite.p_appreciation for entite in self.entites],dtype=np.float64)
+        return p_connexion,p_consultation,p_appreciation
+
+
+    def adjacence(self):
+        ''' 
+        Méthode qui renvoie les connexions du réseau au format CSR : 
+        les voisins de l'entité k sont indices[indptr[k]:indptr[k+1]].
+        
+        --> (tuple : (indptr, indices)), tableaux numpy d'entiers.
+        '''
+        return self.indptr,self.indices
+    
+    def tableaux(self):
+        ''' 
+        Méthode qui renvoie l'ensemble du réseau sous forme de tableaux numpy, indexés par l'identifiant des entités.
+        
+        --> (dict), 'positions' (int64, taille (nb_entites,2)), 'p_connexion', 'p_consultation', 'p_appreciation', 'p_transfert' (float64), 
+        'indptr' et 'indices' (connexions au format CSR).
+        '''
+        p_connexion,p_consultation,p_appreciation=self.vecteurs_probabilites()
+        return {'positions':np.array([entite.position for entite in self.entites],dtype=np.int64).reshape(self.nb_entites,2),
+                'p_connexion':p_connexion,'p_consultation':p_consultation,'p_appreciation':p_appreciation,
+                'p_transfert':np.array([entite.p_transfert for entite in self.entites],dtype=np.float64),
+                'indptr':self.indptr,'indices':self.indices}
+    
+    def empreinte(self):
+        ''' 
+        Méthode qui calcule une empreinte du réseau (SHA-1 de ses tableaux : positions, probabilités et connexions) : 
+        deux réseaux de même empreinte donnent les mêmes simulations.
+        
+        --> (string), empreinte hexadécimale.
+        '''
+        condensat=hashlib.sha1()
+        for nom,tableau in sorted(self.tableaux().items()):
+            tableau=np.ascontiguousarray(tableau)
+            condensat.update((nom+tableau.dtype.str+str(tableau.shape)).encode('utf-8'))
+            condensat.update(tableau.tobytes())
+        return condensat.hexdigest()
+    
+    @classmethod
+    def depuis_tableaux(cls,id_reseau,espace,tableaux):
+        ''' 
+        Méthode qui reconstruit un réseau à partir des tableaux renvoyés par la méthode tableaux, sans aucun tirage aléatoire. 
+        Les tableaux de connexions sont utilisés tels quels (ils peuvent être projetés en mémoire).
+        
+        --> (reseau)
+        '''
+        r=cls.__new__(cls)
+        r.id=id_reseau
+        r.espace=espace
+        r.nb_entites=len(tableaux['p_connexion'])
+        r.generateur=None
+        r.graine=None
+        r.entites=[]
+        for k,(position,p_connexion,p_consultation,p_appreciation,p_transfert) in enumerate(zip(np.asarray(tableaux['positions']).tolist(),
+                np.asarray(tableaux['p_connexion']).tolist(),np.asarray(tableaux['p_consultation']).tolist(),
+                np.asarray(tableaux['p_appreciation']).tolist(),np.asarray(tableaux['p_transfert']).tolist())):
+            nvlle_entite=entite.__new__(entite)
+            nvlle_entite.id_entite=k
+            nvlle_entite.p_connexion=p_connexion
+            nvlle_entite.p_consultation=p_consultation
+            nvlle_entite.p_appreciation=p_appreciation
+            nvlle_entite.p_transfert=p_transfert
+            nvlle_entite.groupe="bon_public" if p_appreciation > 0.5 else "mauvais_public"
+            nvlle_entite.connexions=[]
+            nvlle_entite.reseau=r
+            nvlle_entite.position=position
+            r.entites.append(nvlle_entite)
+        r.indptr=tableaux['indptr']
+        r.indices=tableaux['indices']
+        return r
+        
+
+def ecrit_tableaux(chemin,tableaux,entete):
+    '''
+    Fonction qui écrit des tableaux numpy et un en-tête JSON dans un fichier binaire : 
+    signature, longueur de l'en-tête, en-tête (description de chaque tableau : type, forme, position dans le fichier), 
+    puis les données brutes de chaque tableau, alignées sur 64 octets. 
+    Le fichier est écrit sous un nom temporaire puis renommé, de sorte qu'un fichier existant n'est jamais laissé à moitié écrit.
+    
+    Arguments : 
+        - chemin : (string), fichier à écrire.
+        - tableaux : (dict), tableaux numpy à écrire.
+        - entete : (dict), données JSON à joindre.
+    '''
+    tableaux={nom:np.ascontiguousarray(tableau) for nom,tableau in tableaux.items()}
+    description={}
+    position=0
+    for nom,tableau in tableaux.items():
+        description[nom]={'type':tableau.dtype.str,'forme':list(tableau.shape),'position':position}
+        position+=-(-tableau.nbytes//64)*64
+    texte=json.dumps({'entete':entete,'tableaux':description}).encode('utf-8')
+    debut_donnees=-(-(len(SIGNATURE_TABLEAUX)+8+len(texte))//64)*64
+    with open(chemin+'.tmp','wb') as fichier:
+        fichier.write(SIGNATURE_TABLEAUX)
+        fichier.write(np.uint64(len(texte)).tobytes())
+        fichier.write(texte)
+        for nom,tableau in tableaux.items():
+            fichier.seek(debut_donnees+description[nom]['position'])
+            fichier.write(tableau.tobytes())
+        fichier.truncate(debut_donnees+position)
+    os.replace(chemin+'.tmp',chemin)
+    
+
+def lit_tableaux(chemin):
+    '''
+    Fonction qui lit un fichier écrit par ecrit_tableaux. Les tableaux sont projetés en mémoire (lecture seule) et non chargés.
+    
+    --> (tuple : (tableaux, entete)), dictionnaire des tableaux et en-tête JSON.
+    '''
+    with open(chemin,'rb') as fichier:
+        if fichier.read(len(SIGNATURE_TABLEAUX))!=SIGNATURE_TABLEAUX:
+            raise ValueError(str(chemin)+" n'est pas un fichier de tableaux")
+        longueur=int(np.frombuffer(fichier.read(8),dtype=np.uint64)[0])
+        contenu=json.loads(fichier.read(longueur).decode('utf-8'))
+    debut_donnees=-(-(len(SIGNATURE_TABLEAUX)+8+longueur)//64)*64
+    tableaux={}
+    for nom,description in contenu['tableaux'].items():
+        forme=tuple(description['forme'])
+        if int(np.prod(forme))==0:
+            tableaux[nom]=np.zeros(forme,dtype=description['type'])
+        else:
+            tableaux[nom]=np.memmap(chemin,dtype=description['type'],mode='r',offset=debut_donnees+description['position'],shape=forme)
+    return tableaux,contenu['entete']
         
 
 class information(object):
     """
     Classe définissant une information. 
+    
+    Méthodes : 
+        - ajoute_lignes : ajoute des entités qui ont reçu l'information.
+        - a_recu : indique si une entité a déjà reçu l'information.
+        - ajoute_destinataire : inscrit une entité dans l'index des entités qui ont reçu l'information.
     """    
     
-    def __init__(self,id_information):
+    __slots__=('id_information','temps_dans_reseau','statut_global','nb_entites','id_reseau','nb_lignes',
+               '_ids_entites','_statuts','_tps_consultabilite','_appreciations','frontiere','nb_consultables','destinataires')
+    
+    def __init__(self,id_information,taille_reseau=0,id_reseau=None,capacite=4):
         """
         Constructeur qui initialise:
             - id_information : (int), numéro d'identification de l'information.  
             - temps_dans_reseau : (int), temps de la simulation (en nombre de pas) que l'information a passé dans le réseau, c’est-à-dire le nombre de pas de temps où elle était consultable par au moins une entité du réseau.
             - statut_global : (string, 'active' ou 'inactive'), statut de l'activité de l'information : ‘active’ si l’information est encore consultable par au moins une entité, ‘inactive’ sinon.
             - nb_entites : (int), nombre d’entites qui ont consulté l’information. 
+            - id_reseau : (int), identifiant du réseau dans lequel vit l'information.
+            
+            Les entités qui ont reçu l'information sont stockées en colonnes (une ligne par entité, nb_lignes lignes) :
+                - ids_entites : (numpy.ndarray int32), identifiants des entités qui ont reçu l'information.
+                - statuts : (numpy.ndarray uint8), codes des statuts (CONSULTABLE, CONSULTEE, NON_CONSULTABLE) de l'info dans chaque entité.
+                - tps_consultabilite : (numpy.ndarray int32), temps en pas de temps passé par l'information dans chaque entité en étant consultable.
+                - appreciations : (numpy.ndarray uint8), codes des appréciations (A_APPRECIER, BIEN, MAUVAIS) de l'information par chaque entité.
+            Les colonnes sont agrandies par doublement de leur capacité, ces attributs sont des vues sur leurs nb_lignes premières cases.
             
             - liste_entites : (list = [[id_reseau, id_entite, statut, tps_consultabilite, appreciation], [id_reseau, id_entite_2, …]])
-            liste des entités qui ont reçu l'information avec les détails de l'information pour cette entité. 
+            liste des entités qui ont reçu l'information, reconstruite à la demande à partir des colonnes (copie : la modifier ne modifie pas l'information, 
+            mais on peut la réaffecter, par exemple info.liste_entites+=[...], ce qui reconstruit les colonnes, la frontière et l'index destinataires). 
             Pour chaque entité, on a, sous forme de liste, les détails suivants : 
                 - id_reseau : (int), identifiant du réseau dans lequel vit l'information.
                 - id_entite : (int), identifiant de l'entité qui a reçu l'information. 
                 - statut : (string, 'consultable' ou 'consultee' ou 'non_consultable'), statut de l'info dans l'entité considérée : ‘active’ si l’information est encore consultable, 'inactive' sinon. 
                 - tps_consultabilite : (int), temps en pas de temps passé par l'information dans l'entité en étant consultable.
                 - appreciation : (string, 'a_apprecier', 'bien' ou 'mauvais'), appréciation de l'information par l'entité. 
+                
+            - frontiere : (numpy.ndarray int64), indices des lignes pour lesquelles l'information est encore 'consultable'. 
+            Seules ces lignes sont parcourues par avance.
+            - nb_consultables : (int), nombre d'entités pour lesquelles l'information est encore 'consultable' (taille de frontiere).
+            
+            - destinataires : (bytearray), index des entités qui ont reçu l'information : destinataires[id_entite] vaut 1 si l'entité 
+            a reçu l'information, 0 sinon. Il est mis à jour au fil de la propagation, ce qui évite de parcourir les lignes, 
+            et agrandi si une entité dépasse sa taille. Il est libéré (None) quand l'information devient inactive : elle ne se propage plus.
                         
-        Argument : 
+        Arguments : 
             - id_information : obligatoire. 
+            - taille_reseau : facultatif, 0 par défaut, nombre d'entités du réseau dans lequel vit l'information (taille initiale de l'index destinataires).
+            - id_reseau : facultatif, None par défaut.
+            - capacite : facultatif, 4 par défaut, nombre de lignes réservées à la création.
         """
 
         self.id_information=id_information
         self.temps_dans_reseau=0
         self.statut_global='active'
         self.nb_entites=0
-        self.liste_entites=[]
+        self.id_reseau=id_reseau
+        
+        self.nb_lignes=0
+        self._ids_entites=np.zeros(capacite,dtype=np.int32)
+        self._statuts=np.zeros(capacite,dtype=np.uint8)
+        self._tps_consultabilite=np.zeros(capacite,dtype=np.int32)
+        self._appreciations=np.zeros(capacite,dtype=np.uint8)
+        
+        self.frontiere=np.zeros(0,dtype=np.int64)
+        self.nb_consultables=0
+        self.destinataires=bytearray(taille_reseau)
+        
+    @property
+    def ids_entites(self):
+        return self._ids_entites[:self.nb_lignes]
+    
+    @property
+    def statuts(self):
+        return self._statuts[:self.nb_lignes]
+    
+    @property
+    def tps_consultabilite(self):
+        return self._tps_consultabilite[:self.nb_lignes]
+    
+    @property
+    def appreciations(self):
+        return self._appreciations[:self.nb_lignes]
+        
+    @property
+    def liste_entites(self):
+        '''
+        Liste des entités qui ont reçu l'information, au format [[id_reseau, id_entite, statut, tps_consultabilite, appreciation], ...], 
+        reconstruite à partir des colonnes.
+        '''
+        return [[self.id_reseau,id_entite,STATUTS[statut],tps,APPRECIATIONS[appreciation]] for id_entite,statut,tps,appreciation in zip(self.ids_entites.tolist(),self.statuts.tolist(),self.tps_consultabilite.tolist(),self.appreciations.tolist())]
+    
+    @liste_entites.setter
+    def liste_entites(self,liste_entites):
+        '''
+        Remplace les lignes de l'information par celles de liste_entites (même format que la lecture) : les colonnes, 
+        la frontière et l'index destinataires sont reconstruits.
+        '''
+        self.nb_lignes=0
+        self.frontiere=np.zeros(0,dtype=np.int64)
+        if self.destinataires is not None:
+            self.destinataires=bytearray(len(self.destinataires))
+        self.ajoute_lignes([info_entite[1] for info_entite in liste_entites])
+        self.statuts[:]=[STATUTS.index(info_entite[2]) for info_entite in liste_entites]
+        self.tps_consultabilite[:]=[info_entite[3] for info_entite in liste_entites]
+        self.appreciations[:]=[APPRECIATIONS.index(info_entite[4]) for info_entite in liste_entites]
+        self.frontiere=np.flatnonzero(self.statuts==CONSULTABLE).astype(np.int64)
+        self.nb_consultables=len(self.frontiere)
+    
+    def ajoute_lignes(self,ids_entites):
+        '''
+        Méthode qui ajoute une ligne (statut 'consultable', temps de consultabilité nul, appréciation 'a_apprecier') 
+        pour chacune des entités ids_entites, les inscrit dans l'index destinataires et les ajoute à la frontière. 
+        Les colonnes sont agrandies par doublement si besoin.
+        
+        --> (numpy.ndarray int64), indices des lignes ajoutées.
+        '''
+        ids_entites=np.asarray(ids_entites,dtype=np.int32).reshape(-1)
+        debut=self.nb_lignes
+        fin=debut+len(ids_entites)
+        if fin>len(self._ids_entites):
+            capacite=max(fin,2*len(self._ids_entites))
+            for nom in ('_ids_entites','_statuts','_tps_consultabilite','_appreciations'):
+                ancienne=getattr(self,nom)
+                colonne=np.zeros(capacite,dtype=ancienne.dtype)
+                colonne[:debut]=ancienne[:debut]
+                setattr(self,nom,colonne)
+        self._ids_entites[debut:fin]=ids_entites
+        self._statuts[debut:fin]=CONSULTABLE
+        self._tps_consultabilite[debut:fin]=0
+        self._appreciations[debut:fin]=A_APPRECIER
+        self.nb_lignes=fin
+        if len(ids_entites)>0 and self.destinataires is not None:
+            self._agrandit_index(int(ids_entites.max())+1)
+            np.frombuffer(self.destinataires,dtype=np.uint8)[ids_entites]=1
+        nouvelles_lignes=np.arange(debut,fin,dtype=np.int64)
+        self.frontiere=np.concatenate([self.frontiere,nouvelles_lignes])
+        self.nb_consultables=len(self.frontiere)
+        return nouvelles_lignes
+        
+    def _agrandit_index(self,taille):
+        '''
+        Méthode qui agrandit l'index destinataires (par doublement) pour qu'il contienne au moins taille entités.
+        '''
+        if self.destinataires is not None and taille>len(self.destinataires):
+            self.destinataires+=bytearray(max(taille,2*len(self.destinataires))-len(self.destinataires))
+        
+    def a_recu(self,id_entite):
+        '''
+        Méthode qui indique, en temps constant, si l'entité id_entite a déjà reçu l'information 
+        (en parcourant les lignes si l'index a été libéré).
+        
+        --> (bool)
+        '''
+        if self.destinataires is None:
+            return bool(np.any(self.ids_entites==id_entite))
+        return id_entite<len(self.destinataires) and self.destinataires[id_entite]==1
+    
+    def ajoute_destinataire(self,id_entite):
+        '''
+        Méthode qui inscrit l'entité id_entite dans l'index des entités qui ont reçu l'information.
+        '''
+        if self.destinataires is None:
+            self.destinataires=bytearray(id_entite+1)
+            np.frombuffer(self.destinataires,dtype=np.uint8)[self.ids_entites]=1
+        self._agrandit_index(id_entite+1)
+        self.destinataires[id_entite]=1
         
 
-class simulation(object):
+class collecteur_metriques(object):
     """
-    Classe définissant une simulation. 
+    Classe définissant un collecteur de métriques, mis à jour au fil des changements d'état réalisés par simulation.avance, 
+    sans jamais reparcourir les informations. 
     
-    Méthodes: 
-        - avance : avance la simulation d'un pas de temps et réalise tous les changements nécessaires concernant la simulation et les informations qu'elle contient. 
-        - simul_temps_max : methode qui simule la simulation tant qu'il y a encore des informations actives dans le réseau et tant que la simulation n'a pas duré plus longtemps qu'un temps maximum.
-    """    
+    Méthodes appelées par les moteurs de avance (les identifiants d'informations et d'entités et les codes d'appréciation peuvent être des entiers ou des tableaux numpy) : 
+        - nouvelle_information : une information est créée.
+        - nouveaux_destinataires : des entités reçoivent une information (emetteurs : entités qui la leur ont transmise, None à la création).
+        - appreciations : des entités changent leur appréciation d'une information.
+        - consultations : des entités consultent une information.
+        - expirations : une information devient 'non_consultable' pour des entités.
+        - inactivation : une information devient inactive.
+        - fin_pas : fin d'un pas de temps, relève des séries temporelles.
+        
+    Méthodes de lecture : 
+        - series : séries temporelles des compteurs, relevées à la fin de chaque pas de temps.
+        - totaux_entites : totaux par entité (informations reçues, consultées, appréciées 'bien' et 'mauvais').
+        - totaux_informations : nombre d'appréciations 'bien' et 'mauvais' de chaque information.
+        
+    Pour une autre mesure, on peut dériver cette classe et surcharger les méthodes appelées par avance.
+    """
     
-    def __init__(self,id_simulation,reseau,temps_consultation=3):
+    def __init__(self,nb_entites,capacite=64):
         """
         Constructeur qui initialise:
-            - id_simulation : (int), numéro d'identification de l'information.  
-            - temps : (int), temps (en nombre de pas) de la simulation.
-            - temps_consultation : (int), temps exprimé en pas de temps qu’a chaque entité du réseau pour consulter une information dans le cadre de cette simulation.
-            - liste_info : (list), liste des informations circulant ou ayant circulé dans le réseau. 
-            - reseau : (reseau), reseau dans lequel a lieu la simulation. 
+            - nb_actives, nb_inactives : (int), nombres d'informations actives et inactives.
+            - nb_bien, nb_mauvais : (int), nombres d'appréciations 'bien' et 'mauvais' en cours, toutes informations confondues.
+            - nb_consultations, nb_expirations : (int), nombres de consultations et d'expirations depuis le début.
+            - recues, consultees, bien, mauvais : (numpy.ndarray, taille nb_entites), totaux par entité.
+            - bien_info, mauvais_info : (numpy.ndarray), appréciations de chaque information, indexées par id_information.
+            - nb_releves : (int), nombre de relevés des séries temporelles (le relevé 0 est l'état initial).
             
         Arguments : 
-            - id_simulation : obligatoire. 
-            - reseau : obligatoire.
-            - temps_consultation : facultatif, 3 pas de temps par défaut. 
+            - nb_entites : obligatoire, nombre d'entités du réseau.
+            - capacite : facultatif, 64 par défaut, taille initiale des séries temporelles et des tableaux par information 
+            (ils sont agrandis par doublement si besoin, voir reserve).
         """
+        self.nb_actives=0
+        self.nb_inactives=0
+        self.nb_bien=0
+        self.nb_mauvais=0
+        self.nb_consultations=0
+        self.nb_expirations=0
         
-        self.id_simulation=id_simulation
-        self.temps=0 # on part de t=0
-        self.temps_consultation=temps_consultation
-        self.liste_info=[]
-        self.reseau=reseau
+        self.recues=np.zeros(nb_entites,dtype=np.int64)
+        self.consultees=np.zeros(nb_entites,dtype=np.int64)
+        self.bien=np.zeros(nb_entites,dtype=np.int64)
+        self.mauvais=np.zeros(nb_entites,dtype=np.int64)
         
-    def avance(self):
-        ''' 
-        Méthode qui fait avancer la simulation d'un pas de temps 
-        et qui réalise tous les changements nécessaires concernant la simulation et les informations qu'elle contient.  
+        self.nb_infos=0
+        self.bien_info=np.zeros(capacite,dtype=np.int64)
+        self.mauvais_info=np.zeros(capacite,dtype=np.int64)
+        
+        self.nb_releves=0
+        self._series=np.zeros((capacite,5),dtype=np.int64) # colonnes : temps, actives, inactives, bien, mauvais
+        self.fin_pas(0)
         
+    def reserve(self,nb_releves=0,nb_infos=0):
+        '''
+        Méthode qui agrandit, si besoin, les séries temporelles et les tableaux par information pour contenir 
+        nb_releves relevés et nb_infos informations sans réallocation.
+        '''
+        if nb_releves>len(self._series):
+            series=np.zeros((max(nb_releves,2*len(self._series)),5),dtype=np.int64)
+            series[:self.nb_releves]=self._series[:self.nb_releves]
+            self._series=series
+        if nb_infos>len(self.bien_info):
+            taille=max(nb_infos,2*len(self.bien_info))
+            self.bien_info=np.concatenate([self.bien_info,np.zeros(taille-len(self.bien_info),dtype=np.int64)])
+            self.mauvais_info=np.concatenate([self.mauvais_info,np.zeros(taille-len(self.mauvais_info),dtype=np.int64)])
+    
+    def initialise(self,simulation):
+        '''
+        Méthode qui met les compteurs à l'état courant d'une simulation déjà commencée (un seul parcours des informations), 
+        avant que le collecteur ne soit tenu à jour par avance.
         '''
+        en_cours=simulation._appreciations_en_cours()
+        for info in simulation.liste_info:
+            self.nouvelle_information(info.id_information)
+            if info.statut_global=='inactive':
+                self.inactivation(info.id_information)
+            self.nouveaux_destinataires(info.id_information,info.ids_entites)
+            appreciations=info.appreciations
+            if info.id_information in en_cours:
+                lignes,valeurs=en_cours[info.id_information]
+                appreciations=appreciations.copy()
+                appreciations[lignes]=valeurs
+            self.appreciations(info.id_information,info.ids_entites,np.full(info.nb_lignes,A_APPRECIER),appreciations)
+            self.consultations(info.id_information,info.ids_entites[info.statuts==CONSULTEE])
+        self.nb_releves=0
+        self.fin_pas(simulation.temps)
+    
+    def nouvelle_information(self,id_information):
+        self.reserve(nb_infos=id_information+1)
+        self.nb_infos=max(self.nb_infos,id_information+1)
+        self.nb_actives+=1
         
-        reseau=self.reseau
-        #creation d'une nouvelle information
-        nvlle_info=information(self.temps) #l'id de l'information est le moment auquel elle a été créée
-        self.liste_info+=[nvlle_info] 
-        nvlle_info.liste_entites+=[[reseau.id,rd.randint(0,reseau.nb_entites-1),'consultable',0,'a_apprecier']]
-        self.temps+=1
-        #liste_entites=[id_reseau, id_entite aléatoire, statut de l'info dans l'entité, temps passé dans l'entité en étant consultable, appréciation]
-        
-        #on parcourt la liste des informations pour les propager
-        for info in self.liste_info:
-            if info.statut_global=='active':#on regarde si l'information est encore dans le réseau
-                info.temps_dans_reseau+=1 #on incremente le temps passe dans le reseau de 1
-                liste_entites_propagees=[] #Correspond a la liste des entites que l'on va rajouter à liste_entite apres propagation
-                liste_entite_dans_information=[] #Correspond à la liste des entités contenues dans liste_entite, est utilisé pour le renvoi de l'information
-                
-                for info_entite in info.liste_entites:
-                    id_entite=info_entite[1]
-                    liste_entite_dans_information+=[reseau.entites[id_entite]]
-
-                
-                for info_entite in info.liste_entites:
-                    
-                    if info_entite[2]=='consultable': #si l'info est consultable, on peut effectuer plusieurs actions dessus
-                        info_entite[3]+=1
-                        id_entite=info_entite[1]
-                        entite=reseau.entites[id_entite]
-                        
-                        #appreciation de l'information par l'entite
-                        alea_appreciation=rd.random()
-                        if alea_appreciation < entite.p_appreciation:
-                            info_entite[4]='bien' # On pourrait mettre des valeurs binaires 0 et 1 si besoin pour la représentation?
-                        else:
-                            info_entite[4]='mauvais'
-                            
-                        #renvoi de l'information:
-                        for entite_connecte in entite.connexions: #on parcourt les entités connectés à l'entité que l'on regarde
-                            if entite_connecte not in liste_entite_dans_information: #on vérifie que l'entité connecté ne possède pas déjà l'information 
-                                alea_connexion=rd.random()
-                                if alea_connexion < entite.p_connexion:
-                                    liste_entites_propagees+=[[reseau.id,entite_connecte.id_entite,'consultable',0,'a_apprecier']]
-                                    liste_entite_dans_information+=[entite_connecte]
-                        
-                        #consultation de l'information
-                        alea_consultation=rd.random()
-                        if alea_consultation<entite.p_consultation:
-                            info_entite[2]='consultee'
-                            info.nb_entites+=1
-                            
-                        #si l'info n'a pas été consultée depuis trop longtemps par une entité, elle devient non_consultable
-                        #on verifie que le statut n'est pas 'consultee' car il est possible qu'une info soit consultee à l'étape juste avant
-                        if info_entite[3]>= self.temps_consultation and info_entite[2]!='consultee':
-                            info_entite[2]='non_consultable'
-                            
-                #on actualiste liste_entites avec les nouvelles entites pour lesquelles l'information a été propagée                
-                info.liste_entites+=liste_entites_propagees 
-                    
-                #derniere etape: on verifie que l'information est active pour toutes ses entités, sinon on donne le statut 'inactive' à l'information
-                nb_info = len(info.liste_entites)
-                cpt_info_indispo=0
-                    
-                #nb entités où l'info n'est pas propageable
-                for info_entite in info.liste_entites: 
-                    if info_entite[2]!='consultable':
-                        cpt_info_indispo+=1
-                    
-                #si on a autant d'entités non-propageables que d'entités, cela signifie que l'info est inactive
-                if cpt_info_indispo==nb_info:
-                    info.statut_global='inactive'
-                        
-    def simul_temps_max(self,temps_max=20, visualisation=False):
-        """
-        Methode qui procède a des itérations de la méthode avance() tant que le pas de temps est inférieur 
-        à temps max et qu'il y a encore des informations actives dans le réseau. 
+    def nouveaux_destinataires(self,id_information,ids_entites,emetteurs=None):
+        np.add.at(self.recues,ids_entites,1)
         
-        Argument : 
-            - temps_max : (int), temps maximum en pas de temps de la simulation.
-            - visualisation : (booleen), activation ou non de la visualisaiton de la simulation dans une interface graphique. 
-            Par défaut, on ne visualise pas la simulation. 
-        """
-            
+    def appreciations(self,id_information,ids_entites,anciennes,nouvelles):
+        anciennes=np.asarray(anciennes)
+        nouvelles=np.asarray(nouvelles)
+        variation_bien=(nouvelles==BIEN).astype(np.int64)-(anciennes==BIEN)
+        variation_mauvais=(nouvelles==MAUVAIS).astype(np.int64)-(anciennes==MAUVAIS)
+        np.add.at(self.bien,ids_entites,variation_bien)
+        np.add.at(self.mauvais,ids_entites,variation_mauvais)
+        self.nb_bien+=int(variation_bien.sum())
+        self.nb_mauvais+=int(variation_mauvais.sum())
+        np.add.at(self.bien_info,np.broadcast_to(id_information,variation_bien.shape),variation_bien)
+        np.add.at(self.mauvais_info,np.broadcast_to(id_information,variation_mauvais.shape),variation_mauvais)
+        
+    def consultations(self,id_information,ids_entites):
+        np.add.at(self.consultees,ids_entites,1)
+        self.nb_consultations+=np.size(ids_entites)
+        
+    def expirations(self,id_information,ids_entites):
+        self.nb_expirations+=np.size(ids_entites)
+        
+    def inactivation(self,id_information):
+        self.nb_actives-=1
+        self.nb_inactives+=1
+        
+    def fin_pas(self,temps):
+        self.reserve(nb_releves=self.nb_releves+1)
+        self._series[self.nb_releves]=[temps,self.nb_actives,self.nb_inactives,self.nb_bien,self.nb_mauvais]
+        self.nb_releves+=1
+        
+    def series(self):
+        '''
+        --> (dict), séries temporelles (numpy.ndarray) relevées à la fin de chaque pas de temps : 
+        'temps', 'actives', 'inactives', 'bien', 'mauvais'.
+        '''
+        series=self._series[:self.nb_releves]
+        return {'temps':series[:,0],'actives':series[:,1],'inactives':series[:,2],'bien':series[:,3],'mauvais':series[:,4]}
+    
+    def totaux_entites(self):
+        '''
+        --> (dict), totaux par entité (numpy.ndarray indexés par id_entite) : 'recues', 'consultees', 'bien', 'mauvais'.
+        '''
+        return {'recues':self.recues,'consultees':self.consultees,'bien':self.bien,'mauvais':self.mauvais}
+    
+    def totaux_informations(self):
+        '''
+        --> (dict), appréciations en cours de chaque information (numpy.ndarray indexés par id_information) : 'bien', 'mauvais'.
+        '''
+        return {'bien':self.bien_info[:self.nb_infos],'mauvais':self.mauvais_info[:self.nb_infos]}
+        
+
+class ecrivain_trace(collecteur_metriques):
+    """
+    Classe définissant un écrivain de trace : collecteur de métriques qui écrit en plus chaque évènement de la simulation 
+    (création, propagation, appréciation, consultation, expiration, inactivation) dans des fichiers en colonnes sur le disque, 
+    par morceaux. Une simulation longue peut ainsi être analysée après coup (voir lecteur_trace) sans garder son historique en mémoire 
+    (voir l'argument garde_inactives de simulation).
+    
+    Chaque évènement est une ligne des colonnes COLONNES_TRACE : 
+        - temps : temps de la simulation à la fin du pas où a eu lieu l'évènement.
+        - evenement : code de l'évènement (CREATION, PROPAGATION, ...).
+        - id_information, id_entite : information et entité concernées (id_entite vaut -1 pour une inactivation).
+        - valeur : entité émettrice pour une propagation (-1 à la création), nouvelle appréciation pour une appréciation, -1 sinon.
+        - valeur_precedente : appréciation précédente pour une appréciation, -1 sinon.
+        
+    Méthodes : 
+        - vide : écrit sur le disque les évènements en attente.
+        - ferme : vide les évènements en attente et met à jour la description de la trace.
+    """
+    
+    def __init__(self,dossier,nb_entites,intervalle=10,taille_tampon=1<<20,format='npy'):
+        """
+        Constructeur qui initialise:
+            - dossier : (string), dossier de la trace (créé si besoin) : un fichier trace.json décrit la trace, 
+            chaque morceau est écrit dans un fichier .npy par colonne (morceau_000000.temps.npy, ...) ou dans un fichier .parquet.
+            - intervalle : (int), nombre de pas de temps entre deux écritures sur le disque.
+            - taille_tampon : (int), nombre d'évènements gardés en mémoire au plus avant écriture.
+            - format : (string : {'npy','parquet'}), format des morceaux ('parquet' nécessite pyarrow).
+            - nb_morceaux : (int), nombre de morceaux écrits.
+            
+        Arguments : 
+            - dossier : obligatoire.
+            - nb_entites : obligatoire, nombre d'entités du réseau.
+            - intervalle : facultatif, 10 pas de temps par défaut.
+            - taille_tampon : facultatif, 2^20 évènements par défaut.
+            - format : facultatif, 'npy' par défaut.
+        """
+        if format not in ('npy','parquet'):
+            raise ValueError("format inconnu : "+str(format)+" (valeurs possibles : 'npy', 'parquet')")
+        if format=='parquet' and importlib.util.find_spec('pyarrow') is None: # dépendance facultative, nécessaire uniquement pour ce format
+            raise ValueError("le format 'parquet' nécessite le module pyarrow (pip install pyarrow), ou utiliser format='npy'")
+        self.dossier=dossier
+        self.intervalle=intervalle
+        self.taille_tampon=taille_tampon
+        self.format=format
+        self.nb_morceaux=0
+        self.nb_evenements=0
+        self.temps_courant=0
+        self._tampon={nom:np.zeros(taille_tampon,dtype=type_colonne) for nom,type_colonne in COLONNES_TRACE}
+        os.makedirs(dossier,exist_ok=True)
+        collecteur_metriques.__init__(self,nb_entites)
+        
+    def initialise(self,simulation):
+        '''
+        Méthode qui écrit l'état courant de la simulation (sous forme d'évènements datés du temps courant) 
+        et met les compteurs à cet état.
+        '''
+        self.temps_courant=simulation.temps
+        self.id_simulation=simulation.id_simulation
+        self.id_reseau=simulation.reseau.id
+        collecteur_metriques.initialise(self,simulation)
+        
+    def _ecrit(self,evenement,id_information,ids_entites,valeurs=-1,valeurs_precedentes=-1):
+        '''
+        Méthode qui ajoute des évènements au tampon et le vide sur le disque s'il est plein.
+        '''
+        ids_entites=np.asarray(ids_entites).reshape(-1)
+        nb=len(ids_entites)
+        if nb==0:
+            return
+        if self.nb_evenements+nb>self.taille_tampon:
+            self.vide()
+            if nb>self.taille_tampon:
+                self.taille_tampon=nb
+                self._tampon={nom:np.zeros(nb,dtype=type_colonne) for nom,type_colonne in COLONNES_TRACE}
+        debut,fin=self.nb_evenements,self.nb_evenements+nb
+        self._tampon['temps'][debut:fin]=self.temps_courant
+        self._tampon['evenement'][debut:fin]=evenement
+        self._tampon['id_information'][debut:fin]=id_information
+        self._tampon['id_entite'][debut:fin]=ids_entites
+        self._tampon['valeur'][debut:fin]=-1 if valeurs is None else valeurs
+        self._tampon['valeur_precedente'][debut:fin]=valeurs_precedentes
+        self.nb_evenements=fin
+        
+    def nouvelle_information(self,id_information):
+        collecteur_metriques.nouvelle_information(self,id_information)
+        self._ecrit(CREATION,id_information,-1)
+        
+    def nouveaux_destinataires(self,id_information,ids_entites,emetteurs=None):
+        collecteur_metriques.nouveaux_destinataires(self,id_information,ids_entites,emetteurs)
+        self._ecrit(PROPAGATION,id_information,ids_entites,emetteurs)
+        
+    def appreciations(self,id_information,ids_entites,anciennes,nouvelles):
+        collecteur_metriques.appreciations(self,id_information,ids_entites,anciennes,nouvelles)
+        self._ecrit(APPRECIATION,id_information,ids_entites,nouvelles,anciennes)
+        
+    def consultations(self,id_information,ids_entites):
+        collecteur_metriques.consultations(self,id_information,ids_entites)
+        self._ecrit(CONSULTATION,id_information,ids_entites)
+        
+    def expirations(self,id_information,ids_entites):
+        collecteur_metriques.expirations(self,id_information,ids_entites)
+        self._ecrit(EXPIRATION,id_information,ids_entites)
+        
+    def inactivation(self,id_information):
+        collecteur_metriques.inactivation(self,id_information)
+        self._ecrit(INACTIVATION,id_information,-1)
+        
+    def fin_pas(self,temps):
+        collecteur_metriques.fin_pas(self,temps)
+        self.temps_courant=temps+1
+        if temps>0 and temps%self.intervalle==0:
+            self.vide()
+            
+    def vide(self):
+        '''
+        Méthode qui écrit les évènements en attente dans un nouveau morceau.
+        '''
+        if self.nb_evenements==0:
+            return
+        nom_morceau=os.path.join(self.dossier,'morceau_%06d'%self.nb_morceaux)
+        colonnes={nom:self._tampon[nom][:self.nb_evenements] for nom,_ in COLONNES_TRACE}
+        if self.format=='npy':
+            for nom in colonnes:
+                np.save(nom_morceau+'.'+nom+'.npy',colonnes[nom])
+        else:
+            import pyarrow
+            import pyarrow.parquet
+            pyarrow.parquet.write_table(pyarrow.table(colonnes),nom_morceau+'.parquet')
+        self.nb_morceaux+=1
+        self.nb_evenements=0
+        self._ecrit_description()
+        
+    def _ecrit_description(self):
+        description={'nb_entites':len(self.recues),'nb_morceaux':self.nb_morceaux,'format':self.format,
+                     'colonnes':[nom for nom,_ in COLONNES_TRACE],'evenements':EVENEMENTS,
+                     'id_simulation':getattr(self,'id_simulation',None),'id_reseau':getattr(self,'id_reseau',None)}
+        with open(os.path.join(self.dossier,'trace.json'),'w') as fichier:
+            json.dump(description,fichier)
+            
+    def ferme(self):
+        '''
+        Méthode qui écrit les évènements en attente et la description de la trace. À appeler en fin de simulation.
+        '''
+        self.vide()
+        self._ecrit_description()
+        
+
+class lecteur_trace(object):
+    """
+    Classe définissant un lecteur de trace écrite par un ecrivain_trace. Les morceaux au format .npy sont projetés en mémoire (memory-map) 
+    et non chargés : la trace peut être plus grande que la mémoire.
+    
+    Méthodes : 
+        - morceaux : parcourt les morceaux de la trace.
+        - rejoue : reconstruit les métriques de la simulation (collecteur_metriques) à partir des évènements.
+        - graphique : affiche les quatre graphes de simul_temps_max, sans relancer la simulation.
+    """
+    
+    def __init__(self,dossier):
+        """
+        Constructeur qui initialise:
+            - dossier : (string), dossier de la trace.
+            - description : (dict), contenu de trace.json.
+        """
+        self.dossier=dossier
+        with open(os.path.join(dossier,'trace.json')) as fichier:
+            self.description=json.load(fichier)
+            
+    def morceaux(self):
+        '''
+        Méthode qui parcourt les morceaux de la trace, dans l'ordre.
+        
+        --> (générateur de dict), colonnes de chaque morceau (numpy.ndarray, projetés en mémoire au format npy).
+        '''
+        for k in range(self.description['nb_morceaux']):
+            nom_morceau=os.path.join(self.dossier,'morceau_%06d'%k)
+            if self.description['format']=='npy':
+                yield {nom:np.load(nom_morceau+'.'+nom+'.npy',mmap_mode='r') for nom in self.description['colonnes']}
+            else:
+                import pyarrow.parquet
+                table=pyarrow.parquet.read_table(nom_morceau+'.parquet',memory_map=True)
+                yield {nom:table.column(nom).to_numpy() for nom in self.description['colonnes']}
+                
+    def rejoue(self):
+        '''
+        Méthode qui rejoue les évènements de la trace, pas de temps par pas de temps, dans un collecteur de métriques.
+        
+        --> (collecteur_metriques), métriques de la simulation tracée.
+        '''
+        collecteur=collecteur_metriques(self.description['nb_entites'])
+        temps_courant=None
+        for colonnes in self.morceaux():
+            temps=np.asarray(colonnes['temps'])
+            #découpage du morceau en pas de temps
+            coupures=np.concatenate(([0],np.flatnonzero(temps[1:]!=temps[:-1])+1,[len(temps)]))
+            for debut,fin in zip(coupures[:-1],coupures[1:]):
+                if temps_courant is not None and temps[debut]!=temps_courant:
+                    collecteur.fin_pas(temps_courant)
+                temps_courant=int(temps[debut])
+                evenement=np.asarray(colonnes['evenement'][debut:fin])
+                id_information=np.asarray(colonnes['id_information'][debut:fin])
+                id_entite=np.asarray(colonnes['id_entite'][debut:fin])
+                for id_info in id_information[evenement==CREATION].tolist():
+                    collecteur.nouvelle_information(id_info)
+                propagation=evenement==PROPAGATION
+                collecteur.nouveaux_destinataires(id_information[propagation],id_entite[propagation])
+                appreciation=evenement==APPRECIATION
+                collecteur.appreciations(id_information[appreciation],id_entite[appreciation],
+                                         np.asarray(colonnes['valeur_precedente'][debut:fin])[appreciation],np.asarray(colonnes['valeur'][debut:fin])[appreciation])
+                consultation=evenement==CONSULTATION
+                collecteur.consultations(id_information[consultation],id_entite[consultation])
+                expiration=evenement==EXPIRATION
+                collecteur.expirations(id_information[expiration],id_entite[expiration])
+                for id_info in id_information[evenement==INACTIVATION].tolist():
+                    collecteur.inactivation(id_info)
+        if temps_courant is not None:
+            collecteur.fin_pas(temps_courant)
+        return collecteur
+    
+    def graphique(self,temps_max=None,fichier=None):
+        '''
+        Méthode qui affiche les quatre graphes de simul_temps_max à partir de la trace (ou les enregistre dans fichier, voir figure_simulation).
+        '''
+        collecteur=self.rejoue()
+        series=collecteur.series()
+        figure_simulation(collecteur,self.description['id_simulation'],int(series['temps'][-1]),temps_max,self.description['id_reseau'],fichier)
+        
+
+COMPTEURS_PROFILEUR=('infos','lignes','voisins','candidats','nouveaux_destinataires','tirages')
+
+class profileur(object):
+    """
+    Classe définissant un profileur de simulation : une fois branché (voir simulation.attache_profileur), avance lui transmet 
+    la durée de chacune de ses phases et des compteurs, pas de temps par pas de temps. 
+    Sans profileur, avance ne fait qu'un test par phase.
+    
+    Phases du moteur 'numpy' : 'creation', 'tirages' (appréciation et consultation), 'voisins', 'appartenance' (index destinataires), 
+    'propagation' (tirages des arêtes et dédoublonnage), 'mise_a_jour', 'inactivation', 'collecteur'. 
+    Le moteur 'python' traite les lignes une à une, chacune en trois phases cumulées sur le pas : 'voisins', 'appartenance' 
+    (index destinataires), 'tirages' (appréciation, envois aux voisins candidats et consultation) ; 
+    ses autres phases sont 'creation', 'ecriture' (réécriture des colonnes), 'inactivation', 'collecteur'. 
+    Phases du moteur 'evenements' : 'creation' (avec les tirages de la nouvelle ligne), 'fins', 'appreciations', 
+    'receptions' (avec les tirages des nouvelles lignes), 'inactivation', 'collecteur'.
+    
+    Compteurs (COMPTEURS_PROFILEUR) : informations actives traitées, lignes 'consultable' parcourues, voisins testés, 
+    voisins candidats (n'ayant pas encore reçu l'information), nouveaux destinataires et nombres aléatoires tirés.
+    
+    Méthodes : 
+        - ajoute_ecouteur : ajoute une fonction appelée à la fin de chaque pas de temps avec le relevé du pas.
+        - debut_pas, phase, compte, fin_pas : appelées par avance.
+        - resume : durées et compteurs cumulés par phase.
+        - affiche_resume : affiche le résumé sous forme de tableau.
+        - exporte_chrome : écrit les relevés au format Chrome trace (chrome://tracing, Perfetto).
+    """
+    
+    def __init__(self,ecouteurs=None):
+        """
+        Constructeur qui initialise:
+            - releves : (list), un relevé par pas de temps : {'temps','debut','duree','phases':{nom:duree},'compteurs':{nom:valeur}} 
+            (durées et instants en secondes, instants mesurés par time.perf_counter).
+            - ecouteurs : (list), fonctions appelées avec chaque relevé.
+            
+        Argument : 
+            - ecouteurs : facultatif, None par défaut (aucun écouteur).
+        """
+        self.releves=[]
+        self.ecouteurs=list(ecouteurs) if ecouteurs is not None else []
+        self._phases={}
+        self._compteurs={}
+        self._debut=0.
+        self._dernier=0.
+        
+    def ajoute_ecouteur(self,ecouteur):
+        '''
+        Méthode qui ajoute une fonction appelée à la fin de chaque pas de temps avec le relevé du pas (dict, voir releves).
+        '''
+        self.ecouteurs+=[ecouteur]
+        
+    def debut_pas(self):
+        '''
+        Méthode appelée au début d'un pas de temps.
+        '''
+        self._phases={}
+        self._compteurs=dict.fromkeys(COMPTEURS_PROFILEUR,0)
+        self._debut=self._dernier=time.perf_counter()
+        
+    def phase(self,nom):
+        '''
+        Méthode appelée à la fin d'une phase : le temps écoulé depuis la fin de la phase précédente lui est attribué 
+        (cumulé si la phase revient plusieurs fois dans le pas).
+        '''
+        instant=time.perf_counter()
+        self._phases[nom]=self._phases.get(nom,0.)+instant-self._dernier
+        self._dernier=instant
+        
+    def compte(self,**compteurs):
+        '''
+        Méthode qui ajoute des valeurs aux compteurs du pas de temps.
+        '''
+        for nom,valeur in compteurs.items():
+            self._compteurs[nom]+=int(valeur)
+            
+    def fin_pas(self,temps):
+        '''
+        Méthode appelée à la fin d'un pas de temps : enregistre le relevé du pas et le transmet aux écouteurs.
+        '''
+        releve={'temps':temps,'debut':self._debut,'duree':time.perf_counter()-self._debut,'phases':self._phases,'compteurs':self._compteurs}
+        self.releves+=[releve]
+        for ecouteur in self.ecouteurs:
+            ecouteur(releve)
+            
+    def resume(self):
+        '''
+        Méthode qui cumule les relevés de tous les pas de temps.
+        
+        --> (dict), {'nb_pas','duree','phases':{nom:{'total','moyenne','max','part'}},'compteurs':{nom:total}}, 
+        part étant la part de la durée totale des pas passée dans la phase.
+        '''
+        duree=sum(releve['duree'] for releve in self.releves)
+        phases={}
+        for releve in self.releves:
+            for nom,duree_phase in releve['phases'].items():
+                phases.setdefault(nom,[]).append(duree_phase)
+        return {'nb_pas':len(self.releves),'duree':duree,
+                'phases':{nom:{'total':sum(durees),'moyenne':sum(durees)/len(self.releves),'max':max(durees),'part':sum(durees)/duree if duree>0 else 0.}
+                          for nom,durees in phases.items()},
+                'compteurs':{nom:sum(releve['compteurs'][nom] for releve in self.releves) for nom in COMPTEURS_PROFILEUR}}
+        
+    def affiche_resume(self):
+        '''
+        Méthode qui affiche le résumé (voir resume) sous forme de tableau.
+        '''
+        resume=self.resume()
+        print('%d pas, %.4f s'%(resume['nb_pas'],resume['duree']))
+        print('%-15s %12s %12s %12s %8s'%('phase','total (s)','moyenne (s)','max (s)','part'))
+        for nom,valeurs in sorted(resume['phases'].items(),key=lambda item:-item[1]['total']):
+            print('%-15s %12.6f %12.6f %12.6f %7.1f%%'%(nom,valeurs['total'],valeurs['moyenne'],valeurs['max'],100*valeurs['part']))
+        for nom,total in resume['compteurs'].items():
+            print('%-22s %d'%(nom,total))
+            
+    def exporte_chrome(self,chemin):
+        '''
+        Méthode qui écrit les relevés au format Chrome trace (JSON) : un évènement par pas de temps, 
+        un évènement par phase (les durées cumulées des phases d'un pas sont placées bout à bout à partir du début du pas) 
+        et une série par compteur.
+        
+        Argument : 
+            - chemin : (string), fichier JSON à écrire.
+        '''
+        evenements=[]
+        origine=self.releves[0]['debut'] if len(self.releves)>0 else 0.
+        for releve in self.releves:
+            debut=(releve['debut']-origine)*1e6
+            evenements+=[{'name':'pas','ph':'X','ts':debut,'dur':releve['duree']*1e6,'pid':1,'tid':1,'args':{'temps':releve['temps']}}]
+            for nom,duree in releve['phases'].items():
+                evenements+=[{'name':nom,'ph':'X','ts':debut,'dur':duree*1e6,'pid':1,'tid':1}]
+                debut+=duree*1e6
+            evenements+=[{'name':'compteurs','ph':'C','ts':(releve['debut']-origine)*1e6,'pid':1,'args':releve['compteurs']}]
+        with open(chemin,'w') as fichier:
+            json.dump({'traceEvents':evenements,'displayTimeUnit':'ms'},fichier)
+        
+
+def tirages_geometriques(rng,p,borne):
+    '''
+    Fonction qui tire, pour chaque probabilité de p, le rang du premier succès d'une suite d'essais indépendants 
+    de probabilité p (loi géométrique, à partir de 1), par inversion de la fonction de répartition. 
+    Le résultat est borné à borne+1, valeur qui signifie qu'aucun des borne premiers essais n'a réussi 
+    (p=0 donne toujours borne+1, p=1 toujours 1).
+    
+    Arguments : 
+        - rng : (numpy.random.Generator), générateur aléatoire.
+        - p : (numpy.ndarray), probabilités de succès de chaque essai.
+        - borne : (int ou numpy.ndarray), nombre maximal d'essais.
+        
+    --> (numpy.ndarray int64)
+    '''
+    p=np.asarray(p,dtype=np.float64)
+    borne=np.asarray(borne,dtype=np.int64)
+    alea=1.-rng.random(len(p)) # dans ]0,1] : le logarithme est fini
+    with np.errstate(divide='ignore',invalid='ignore'):
+        rangs=np.floor(np.log(alea)/np.log1p(-np.minimum(p,1.)))+1
+    rangs=np.where(p>0,np.minimum(rangs,borne+1),borne+1)
+    return rangs.astype(np.int64)
+
+
+def segments_tries(cles):
+    '''
+    Fonction qui découpe un tableau trié en segments de valeurs égales.
+    
+    --> (tuple : (valeurs, debuts, fins)), cles[debuts[k]:fins[k]] contient les occurrences de valeurs[k].
+    '''
+    if len(cles)==0:
+        return cles[:0],np.zeros(0,dtype=np.int64),np.zeros(0,dtype=np.int64)
+    debuts=np.concatenate([[0],np.flatnonzero(cles[1:]!=cles[:-1])+1])
+    fins=np.concatenate([debuts[1:],[len(cles)]])
+    return cles[debuts],debuts,fins
+
+
+class simulation(object):
+    """
+    Classe définissant une simulation. 
+    
+    Méthodes: 
+        - avance : avance la simulation d'un pas de temps et réalise tous les changements nécessaires concernant la simulation et les informations qu'elle contient. 
+        - simul_temps_max : methode qui simule la simulation tant qu'il y a encore des informations actives dans le réseau et tant que la simulation n'a pas duré plus longtemps qu'un temps maximum.
+        - attache_collecteur : branche un collecteur de métriques tenu à jour par avance.
+        - attache_profileur : branche un profileur qui mesure les phases de avance.
+        - injecte : programme la création d'une information reçue par une entité choisie, à un temps choisi.
+        - checkpoint : écrit un point de reprise de la simulation.
+        - resume : reprend une simulation à partir d'un point de reprise.
+    """    
+    
+    def __init__(self,id_simulation,reseau,temps_consultation=3,moteur='python',graine=None,collecteur=None,garde_inactives=True,profileur=None,
+                 creation_aleatoire=True):
+        """
+        Constructeur qui initialise:
+            - id_simulation : (int), numéro d'identification de l'information.  
+            - temps : (int), temps (en nombre de pas) de la simulation.
+            - temps_consultation : (int), temps exprimé en pas de temps qu’a chaque entité du réseau pour consulter une information dans le cadre de cette simulation.
+            - liste_info : (list), liste des informations circulant ou ayant circulé dans le réseau. 
+            - infos_actives : (list), file des informations encore actives, les seules parcourues par avance.
+            - archive : (list), informations devenues inactives, dans l'ordre où elles ont été retirées de infos_actives.
+            - reseau : (reseau), reseau dans lequel a lieu la simulation. 
+            - moteur : (string : {'python','numpy','evenements'}), moteur de propagation utilisé par avance.
+            - collecteur : (collecteur_metriques ou None), collecteur de métriques tenu à jour par avance.
+            - garde_inactives : (booleen), conservation ou non en mémoire des informations devenues inactives.
+            - profileur : (profileur ou None), profileur des phases de avance.
+            - creation_aleatoire : (booleen), création ou non par avance d'une information reçue par une entité aléatoire à chaque pas de temps.
+            - nb_informations : (int), nombre d'informations créées depuis le début (identifiant de la prochaine information).
+            - alea : (random.Random ou module random), source des tirages du moteur python.
+            
+        Arguments : 
+            - id_simulation : obligatoire. 
+            - reseau : obligatoire.
+            - temps_consultation : facultatif, 3 pas de temps par défaut. 
+            - moteur : facultatif, 'python' par défaut. Le moteur 'numpy' stocke les probabilités des entités et l'état des informations 
+            dans des tableaux et tire tous les nombres aléatoires d'un pas de temps par lots. 
+            Le moteur 'evenements' tire à la réception de chaque ligne ses instants de consultation ou d'expiration, 
+            de changement d'appréciation et de transmission à chaque voisin, et ne traite ensuite que ces évènements (voir _avance_evenements).
+            - graine : facultatif, graine du générateur aléatoire : générateur numpy des moteurs 'numpy' et 'evenements', 
+            random.Random propre à la simulation pour le moteur python. Avec graine=None, le moteur python tire ses nombres 
+            avec le module random, que fixe rd.seed.
+            - collecteur : facultatif, None par défaut (aucune mesure).
+            - garde_inactives : facultatif, True par défaut. Si False, les informations inactives sont retirées de liste_info 
+            et ne sont pas archivées : la mémoire ne dépend plus que des informations actives (l'historique peut être conservé 
+            sur disque avec un ecrivain_trace).
+            - profileur : facultatif, None par défaut (aucune mesure).
+            - creation_aleatoire : facultatif, True par défaut. Si False, seules les informations programmées avec injecte sont créées.
+        """
+        
+        self.id_simulation=id_simulation
+        self.temps=0 # on part de t=0
+        self.temps_consultation=temps_consultation
+        self.liste_info=[]
+        self.infos_actives=[]
+        self.archive=[]
+        self.garde_inactives=garde_inactives
+        self.reseau=reseau
+        self.creation_aleatoire=creation_aleatoire
+        self.nb_informations=0
+        self._injections=[] # tas des créations programmées par injecte : (temps, ordre de programmation, id_entite)
+        
+        if moteur not in ('python','numpy','evenements'):
+            raise ValueError("moteur inconnu : "+str(moteur)+" (valeurs possibles : 'python', 'numpy', 'evenements')")
+        self.moteur=moteur
+        if moteur=='python':
+            self.alea=rd if graine is None else rd.Random(graine)
+        else:
+            self.rng=np.random.default_rng(graine)
+            self.p_connexion,self.p_consultation,self.p_appreciation=reseau.vecteurs_probabilites()
+            self.indptr,self.indices=reseau.adjacence()
+        if moteur=='evenements':
+            self._echeancier={} # évènements en attente, par date : {date:{type:[tableaux]}} (voir COLONNES_EVENEMENTS)
+            self._dates=[] # tas des dates de l'échéancier
+            self._infos_evenements={} # informations actives, par id_information
+            
+        self.collecteur=None
+        if collecteur is not None:
+            self.attache_collecteur(collecteur)
+        self.profileur=profileur
+            
+    def checkpoint(self,chemin):
+        '''
+        Méthode qui écrit un point de reprise de la simulation dans un fichier binaire (voir ecrit_tableaux) : 
+        réseau (positions, probabilités, connexions), état de toutes les informations, temps, état du générateur aléatoire 
+        et, si c'est un collecteur_metriques, compteurs du collecteur. 
+        Une simulation reprise avec resume donne exactement les mêmes résultats que si elle n'avait pas été interrompue.
+        
+        Argument : 
+            - chemin : (string), fichier du point de reprise (remplacé s'il existe).
+        '''
+        tableaux={'reseau_'+nom:tableau for nom,tableau in self.reseau.tableaux().items()}
+        
+        #informations : colonnes de toutes les informations mises bout à bout
+        infos=self.liste_info
+        position_info={id(info):k for k,info in enumerate(infos)}
+        tableaux['info_id']=np.array([info.id_information for info in infos],dtype=np.int64)
+        tableaux['info_temps_dans_reseau']=np.array([info.temps_dans_reseau for info in infos],dtype=np.int64)
+        tableaux['info_active']=np.array([info.statut_global=='active' for info in infos],dtype=np.uint8)
+        tableaux['info_nb_entites']=np.array([info.nb_entites for info in infos],dtype=np.int64)
+        tableaux['info_nb_lignes']=np.array([info.nb_lignes for info in infos],dtype=np.int64)
+        tableaux['info_taille_frontiere']=np.array([len(info.frontiere) for info in infos],dtype=np.int64)
+        for nom in ('ids_entites','statuts','tps_consultabilite','appreciations','frontiere'):
+            colonnes=[getattr(info,nom) for info in infos]
+            tableaux['lignes_'+nom]=np.concatenate(colonnes) if len(colonnes)>0 else np.zeros(0)
+        tableaux['ordre_actives']=np.array([position_info[id(info)] for info in self.infos_actives],dtype=np.int64)
+        tableaux['ordre_archive']=np.array([position_info[id(info)] for info in self.archive],dtype=np.int64)
+        
+        #collecteur de métriques
+        collecteur=self.collecteur
+        compteurs_collecteur=None
+        if type(collecteur) is collecteur_metriques:
+            compteurs_collecteur={nom:getattr(collecteur,nom) for nom in ('nb_actives','nb_inactives','nb_bien','nb_mauvais','nb_consultations','nb_expirations','nb_infos','nb_releves')}
+            for nom in ('recues','consultees','bien','mauvais'):
+                tableaux['collecteur_'+nom]=getattr(collecteur,nom)
+            tableaux['collecteur_bien_info']=collecteur.bien_info[:collecteur.nb_infos]
+            tableaux['collecteur_mauvais_info']=collecteur.mauvais_info[:collecteur.nb_infos]
+            tableaux['collecteur_series']=collecteur._series[:collecteur.nb_releves]
+            
+        #évènements en attente du moteur 'evenements' : date puis colonnes de COLONNES_EVENEMENTS
+        if self.moteur=='evenements':
+            for type_evenement,colonnes in COLONNES_EVENEMENTS.items():
+                blocs=[np.column_stack([np.full(len(bloc),date,dtype=np.int64),bloc]) for date,evenements in self._echeancier.items() for bloc in evenements[type_evenement]]
+                tableaux['evenements_'+type_evenement]=np.concatenate(blocs) if len(blocs)>0 else np.zeros((0,len(colonnes)+1),dtype=np.int64)
+            
+        entete={'id_simulation':self.id_simulation,'temps':self.temps,'temps_consultation':self.temps_consultation,
+                'moteur':self.moteur,'garde_inactives':self.garde_inactives,'id_reseau':self.reseau.id,'espace':list(self.reseau.espace),
+                'creation_aleatoire':self.creation_aleatoire,'nb_informations':self.nb_informations,'injections':sorted(self._injections),
+                'compteurs_collecteur':compteurs_collecteur}
+        #état du générateur aléatoire : alea pour le moteur python, générateur numpy pour les autres moteurs
+        if self.moteur!='python':
+            entete['etat_aleatoire']=self.rng.bit_generator.state
+        else:
+            version,etat,gauss=self.alea.getstate()
+            entete['etat_aleatoire']=[version,list(etat),gauss]
+        ecrit_tableaux(chemin,tableaux,entete)
+        
+    @classmethod
+    def resume(cls,chemin):
+        '''
+        Méthode qui reprend une simulation à partir d'un point de reprise écrit par checkpoint. 
+        Les tableaux du réseau sont projetés en mémoire et non chargés. Avec le moteur python, la simulation reprise tire ses nombres 
+        avec son propre random.Random, remis dans l'état sauvegardé : l'état du module random n'est pas modifié. 
+        Un collecteur qui n'est pas un collecteur_metriques (un ecrivain_trace par exemple) n'est pas sauvegardé et doit être rebranché.
+        
+        Argument : 
+            - chemin : (string), fichier du point de reprise.
+            
+        --> (simulation), simulation reprise.
+        '''
+        tableaux,entete=lit_tableaux(chemin)
+        r=reseau.depuis_tableaux(entete['id_reseau'],entete['espace'],{nom[len('reseau_'):]:tableau for nom,tableau in tableaux.items() if nom.startswith('reseau_')})
+        simu=cls(entete['id_simulation'],r,temps_consultation=entete['temps_consultation'],moteur=entete['moteur'],garde_inactives=entete['garde_inactives'],
+                 creation_aleatoire=entete.get('creation_aleatoire',True))
+        simu.temps=entete['temps']
+        simu.nb_informations=entete.get('nb_informations',entete['temps'])
+        simu._injections=[tuple(injection) for injection in entete.get('injections',[])]
+        
+        #informations
+        fin_lignes=np.cumsum(tableaux['info_nb_lignes'])
+        fin_frontieres=np.cumsum(tableaux['info_taille_frontiere'])
+        for k in range(len(tableaux['info_id'])):
+            debut,fin=fin_lignes[k]-tableaux['info_nb_lignes'][k],fin_lignes[k]
+            info=information(int(tableaux['info_id'][k]),r.nb_entites,id_reseau=r.id,capacite=max(int(fin-debut),1))
+            info.ajoute_lignes(tableaux['lignes_ids_entites'][debut:fin])
+            info.statuts[:]=tableaux['lignes_statuts'][debut:fin]
+            info.tps_consultabilite[:]=tableaux['lignes_tps_consultabilite'][debut:fin]
+            info.appreciations[:]=tableaux['lignes_appreciations'][debut:fin]
+            info.frontiere=np.array(tableaux['lignes_frontiere'][fin_frontieres[k]-tableaux['info_taille_frontiere'][k]:fin_frontieres[k]],dtype=np.int64)
+            info.nb_consultables=len(info.frontiere)
+            info.temps_dans_reseau=int(tableaux['info_temps_dans_reseau'][k])
+            info.nb_entites=int(tableaux['info_nb_entites'][k])
+            info.statut_global='active' if tableaux['info_active'][k] else 'inactive'
+            if info.statut_global=='inactive':
+                info.destinataires=None
+            simu.liste_info+=[info]
+        simu.infos_actives=[simu.liste_info[k] for k in tableaux['ordre_actives'].tolist()]
+        simu.archive=[simu.liste_info[k] for k in tableaux['ordre_archive'].tolist()]
+        
+        #collecteur de métriques
+        if entete['compteurs_collecteur'] is not None:
+            collecteur=collecteur_metriques(r.nb_entites)
+            for nom,valeur in entete['compteurs_collecteur'].items():
+                setattr(collecteur,nom,valeur)
+            for nom in ('recues','consultees','bien','mauvais'):
+                setattr(collecteur,nom,np.array(tableaux['collecteur_'+nom]))
+            collecteur.reserve(nb_releves=collecteur.nb_releves,nb_infos=collecteur.nb_infos)
+            collecteur.bien_info[:collecteur.nb_infos]=tableaux['collecteur_bien_info']
+            collecteur.mauvais_info[:collecteur.nb_infos]=tableaux['collecteur_mauvais_info']
+            collecteur._series[:collecteur.nb_releves]=tableaux['collecteur_series']
+            simu.collecteur=collecteur
+            
+        #évènements en attente du moteur 'evenements'
+        if simu.moteur=='evenements':
+            simu._infos_evenements={info.id_information:info for info in simu.infos_actives}
+            for type_evenement in COLONNES_EVENEMENTS:
+                evenements=np.array(tableaux['evenements_'+type_evenement],dtype=np.int64)
+                simu._programme(type_evenement,evenements[:,0],evenements[:,1:])
+            
+        #état du générateur aléatoire
+        if simu.moteur!='python':
+            simu.rng.bit_generator.state=entete['etat_aleatoire']
+        else:
+            version,etat,gauss=entete['etat_aleatoire']
+            simu.alea=rd.Random()
+            simu.alea.setstate((version,tuple(etat),gauss))
+        return simu
+        
+    def attache_collecteur(self,collecteur):
+        '''
+        Méthode qui branche un collecteur de métriques sur la simulation : il est mis à l'état courant de la simulation, 
+        puis tenu à jour par avance à chaque changement d'état.
+        '''
+        collecteur.initialise(self)
+        self.collecteur=collecteur
+        
+    def _appreciations_en_cours(self):
+        '''
+        Méthode qui renvoie l'appréciation en cours des lignes dont l'appréciation peut encore changer avec le moteur 'evenements' : 
+        les colonnes ne reçoivent que l'appréciation définitive, l'appréciation en cours est portée par le prochain évènement de la ligne.
+        
+        --> (dict), {id_information : (lignes, appreciations)}, vide pour les autres moteurs.
+        '''
+        if self.moteur!='evenements':
+            return {}
+        evenements=[tableau for evenements_date in self._echeancier.values() for tableau in evenements_date['appreciations']]
+        if len(evenements)==0:
+            return {}
+        evenements=np.concatenate(evenements)
+        evenements=evenements[np.argsort(evenements[:,0],kind='stable')]
+        return {id_information:(evenements[debut:fin,1],evenements[debut:fin,4].astype(np.uint8)) 
+                for id_information,debut,fin in zip(*[t.tolist() for t in segments_tries(evenements[:,0])])}
+        
+    def attache_profileur(self,profileur):
+        '''
+        Méthode qui branche un profileur sur la simulation (None pour le débrancher) : 
+        avance lui transmet la durée de ses phases et ses compteurs à chaque pas de temps.
+        '''
+        self.profileur=profileur
+        
+    def avance(self):
+        ''' 
+        Méthode qui fait avancer la simulation d'un pas de temps 
+        et qui réalise tous les changements nécessaires concernant la simulation et les informations qu'elle contient.  
+        
+        '''
+        profileur=self.profileur
+        if profileur is not None:
+            profileur.debut_pas()
+        if self.moteur=='numpy':
+            self._avance_numpy()
+        elif self.moteur=='evenements':
+            self._avance_evenements()
+        else:
+            self._avance_python()
+        if self.collecteur is not None:
+            self.collecteur.fin_pas(self.temps)
+        if profileur is not None:
+            profileur.phase('collecteur')
+            profileur.fin_pas(self.temps)
+            
+    def injecte(self,id_entite,temps=None):
+        ''' 
+        Méthode qui programme la création d'une information reçue par l'entité id_entite : elle est créée par avance 
+        quand la simulation est au temps temps (et traitée dès ce pas de temps), avant l'information aléatoire du pas. 
+        Une création programmée dans le passé a lieu au prochain pas de temps.
+        
+        Arguments : 
+            - id_entite : (int), entité qui reçoit l'information.
+            - temps : facultatif, None par défaut (prochain pas de temps).
+        '''
+        if not 0<=id_entite<self.reseau.nb_entites:
+            raise ValueError("entité inconnue : "+str(id_entite)+" (le réseau a "+str(self.reseau.nb_entites)+" entités)")
+        heapq.heappush(self._injections,(self.temps if temps is None else int(temps),self.nb_informations+len(self._injections),int(id_entite)))
+        
+    def _creations(self,tirage):
+        ''' 
+        Méthode qui crée les informations du pas de temps : celles programmées par injecte, puis, si creation_aleatoire, 
+        une information reçue par l'entité tirage(), et avance le temps de la simulation d'un pas.
+        
+        --> (list), informations créées.
+        '''
+        nvlles_infos=[]
+        while len(self._injections)>0 and self._injections[0][0]<=self.temps:
+            nvlles_infos+=[self._nouvelle_information(heapq.heappop(self._injections)[2])]
+        if self.creation_aleatoire:
+            nvlles_infos+=[self._nouvelle_information(tirage())]
+        self.temps+=1
+        return nvlles_infos
+        
+    def _nouvelle_information(self,id_entite):
+        ''' 
+        Méthode qui crée une nouvelle information, reçue par l'entité id_entite, et l'ajoute à la file des informations actives. 
+        L'id de l'information est son numéro de création, c'est-à-dire le moment auquel elle a été créée 
+        tant que seule la création aléatoire a lieu (une information par pas de temps).
+        
+        --> (information), information créée.
+        '''
+        nvlle_info=information(self.nb_informations,self.reseau.nb_entites,id_reseau=self.reseau.id)
+        self.nb_informations+=1
+        nvlle_info.ajoute_lignes([id_entite])
+        self.liste_info+=[nvlle_info]
+        self.infos_actives+=[nvlle_info]
+        if self.collecteur is not None:
+            self.collecteur.nouvelle_information(nvlle_info.id_information)
+            self.collecteur.nouveaux_destinataires(nvlle_info.id_information,id_entite,None)
+        return nvlle_info
+        
+    def _retire_infos_inactives(self):
+        ''' 
+        Méthode qui donne le statut 'inactive' aux informations qui ne sont plus consultables par aucune entité 
+        et les fait passer de la file des informations actives à l'archive. Leur index destinataires, qui ne sert plus, est libéré.
+        '''
+        infos_encore_actives=[]
+        for info in self.infos_actives:
+            if info.nb_consultables==0:
+                info.statut_global='inactive'
+                info.destinataires=None
+                if self.garde_inactives:
+                    self.archive+=[info]
+                if self.collecteur is not None:
+                    self.collecteur.inactivation(info.id_information)
+            else:
+                infos_encore_actives+=[info]
+        if not self.garde_inactives and len(infos_encore_actives)<len(self.infos_actives):
+            self.liste_info=[info for info in self.liste_info if info.statut_global=='active']
+        self.infos_actives=infos_encore_actives
+            
+    def _avance_python(self):
+        ''' 
+        Moteur python de avance : parcourt une à une les entités de chaque information active. 
+        '''
+        
+        reseau=self.reseau
+        collecteur=self.collecteur
+        profileur=self.profileur
+        #creation d'une nouvelle information, reçue par une entité aléatoire (et des informations programmées par injecte)
+        alea=self.alea
+        self._creations(lambda: alea.randint(0,reseau.nb_entites-1))
+        if profileur is not None:
+            profileur.phase('creation')
+            profileur.compte(infos=len(self.infos_actives),tirages=1)
+        
+        #on parcourt la file des informations actives pour les propager
+        for info in self.infos_actives:
+            info.temps_dans_reseau+=1 #on incremente le temps passe dans le reseau de 1
+            entites_propagees=[] #Correspond a la liste des entites que l'on va rajouter à l'information apres propagation
+            emetteurs=[] #entités qui leur ont transmis l'information
+            
+            #seules les lignes de la frontière sont 'consultable', on peut effectuer plusieurs actions dessus.
+            #on lit leurs colonnes une fois pour toutes, on les traite en python et on les réécrit à la fin
+            lignes=info.frontiere
+            ids_entites=info.ids_entites[lignes].tolist()
+            tps=(info.tps_consultabilite[lignes]+1).tolist()
+            appreciations=[A_APPRECIER]*len(lignes)
+            statuts=[CONSULTABLE]*len(lignes)
+            nb_candidats=0
+            
+            for k in range(len(lignes)):
+                id_entite=ids_entites[k]
+                entite=reseau.entites[id_entite]
+                
+                #entités connectées à l'entité que l'on regarde
+                voisins=reseau.indices[reseau.indptr[id_entite]:reseau.indptr[id_entite+1]].tolist()
+                if profileur is not None:
+                    profileur.phase('voisins')
+                    
+                #on ne garde que celles qui ne possèdent pas déjà l'information 
+                #(les voisins d'une entité sont distincts : les envois de cette ligne ne changent pas ce test)
+                candidats=[id_connecte for id_connecte in voisins if not info.a_recu(id_connecte)]
+                nb_candidats+=len(candidats)
+                if profileur is not None:
+                    profileur.phase('appartenance')
+                
+                #appreciation de l'information par l'entite
+                alea_appreciation=alea.random()
+                if alea_appreciation < entite.p_appreciation:
+                    appreciations[k]=BIEN
+                else:
+                    appreciations[k]=MAUVAIS
+                    
+                #renvoi de l'information:
+                for id_connecte in candidats:
+                    alea_connexion=alea.random()
+                    if alea_connexion < entite.p_connexion:
+                        entites_propagees+=[id_connecte]
+                        emetteurs+=[id_entite]
+                        info.ajoute_destinataire(id_connecte)
+                
+                #consultation de l'information
+                alea_consultation=alea.random()
+                if alea_consultation<entite.p_consultation:
+                    statuts[k]=CONSULTEE
+                    
+                #si l'info n'a pas été consultée depuis trop longtemps par une entité, elle devient non_consultable
+                #on verifie que le statut n'est pas 'consultee' car il est possible qu'une info soit consultee à l'étape juste avant
+                elif tps[k]>= self.temps_consultation:
+                    statuts[k]=NON_CONSULTABLE
+                if profileur is not None:
+                    profileur.phase('tirages')
+                    
+            if profileur is not None:
+                sources=info.ids_entites[lignes]
+                profileur.compte(lignes=len(lignes),voisins=(reseau.indptr[sources+1]-reseau.indptr[sources]).sum(),candidats=nb_candidats,
+                                 nouveaux_destinataires=len(entites_propagees),tirages=2*len(lignes)+nb_candidats)
+            #réécriture des colonnes
+            statuts=np.array(statuts,dtype=np.uint8)
+            appreciations=np.array(appreciations,dtype=np.uint8)
+            if collecteur is not None:
+                collecteur.appreciations(info.id_information,info.ids_entites[lignes],info.appreciations[lignes],appreciations)
+                collecteur.consultations(info.id_information,info.ids_entites[lignes[statuts==CONSULTEE]])
+                collecteur.expirations(info.id_information,info.ids_entites[lignes[statuts==NON_CONSULTABLE]])
+                collecteur.nouveaux_destinataires(info.id_information,np.array(entites_propagees,dtype=np.int64),np.array(emetteurs,dtype=np.int64))
+            info.tps_consultabilite[lignes]=tps
+            info.appreciations[lignes]=appreciations
+            info.statuts[lignes]=statuts
+            info.nb_entites+=int(np.count_nonzero(statuts==CONSULTEE))
+                    
+            #nouvelle frontière : lignes restées 'consultable', puis nouvelles entites pour lesquelles l'information a été propagée
+            info.frontiere=lignes[statuts==CONSULTABLE]
+            info.ajoute_lignes(entites_propagees)
+            if profileur is not None:
+                profileur.phase('ecriture')
+                
+        #derniere etape: les informations qui ne sont plus consultables par aucune entité deviennent inactives et rejoignent l'archive
+        self._retire_infos_inactives()
+        if profileur is not None:
+            profileur.phase('inactivation')
+                        
+    def _avance_numpy(self):
+        ''' 
+        Moteur vectorisé de avance : les lignes 'consultable' de toutes les informations actives sont concaténées, 
+        tous les nombres aléatoires du pas de temps sont tirés par lots et l'appréciation, la consultation, 
+        l'expiration et la propagation aux voisins sont réalisées par opérations sur les tableaux.
+        '''
+        
+        reseau=self.reseau
+        rng=self.rng
+        n=reseau.nb_entites
+        collecteur=self.collecteur
+        profileur=self.profileur
+        
+        #creation d'une nouvelle information, reçue par une entité aléatoire (et des informations programmées par injecte)
+        self._creations(lambda: int(rng.integers(0,n)))
+        if profileur is not None:
+            profileur.phase('creation')
+        
+        actives=self.infos_actives
+        if len(actives)==0:
+            if profileur is not None:
+                profileur.phase('inactivation') #aucune information à retirer : la phase est relevée à chaque pas
+            return
+        for info in actives:
+            info.temps_dans_reseau+=1
+            
+        #concaténation des lignes 'consultable' (frontières) de toutes les informations actives
+        lignes=[info.frontiere for info in actives]
+        nb_lignes=np.array([len(l) for l in lignes],dtype=np.int64)
+        position_info=np.repeat(np.arange(len(actives),dtype=np.int64),nb_lignes) #position dans 'actives' de l'information de chaque ligne
+        sources=np.concatenate([info.ids_entites[l] for info,l in zip(actives,lignes)])
+        
+        #tirages aléatoires de l'appréciation et de la consultation, par lot
+        alea_appreciation=rng.random(len(sources))
+        alea_consultation=rng.random(len(sources))
+        appreciations=np.where(alea_appreciation<self.p_appreciation[sources],BIEN,MAUVAIS).astype(np.uint8)
+        consultees=alea_consultation<self.p_consultation[sources]
+        if profileur is not None:
+            profileur.phase('tirages')
+        
+        #voisins de toutes les entités sources (une arête candidate par voisin)
+        debuts=self.indptr[sources]
+        degres=self.indptr[sources+1]-debuts
+        nb_aretes=int(degres.sum())
+        decalages=np.arange(nb_aretes,dtype=np.int64)-np.repeat(np.cumsum(degres)-degres,degres)
+        cibles=self.indices[np.repeat(debuts,degres)+decalages].astype(np.int64)
+        emetteurs=np.repeat(sources,degres)
+        info_arete=np.repeat(position_info,degres)
+        if profileur is not None:
+            profileur.phase('voisins')
+        
+        #on écarte les voisins qui possèdent déjà l'information (lecture de l'index destinataires de chaque information), 
+        #puis on tire la propagation de chaque arête par lot
+        cles_cibles=info_arete*n+cibles
+        fin_aretes=np.cumsum(np.bincount(info_arete,minlength=len(actives)))
+        candidates=np.empty(nb_aretes,dtype=bool)
+        for k,info in enumerate(actives):
+            debut_aretes=fin_aretes[k-1] if k>0 else 0
+            candidates[debut_aretes:fin_aretes[k]]=np.frombuffer(info.destinataires,dtype=np.uint8)[cibles[debut_aretes:fin_aretes[k]]]==0
+        if profileur is not None:
+            profileur.phase('appartenance')
+        alea_connexion=rng.random(nb_aretes)
+        propagees=candidates & (alea_connexion<self.p_connexion[emetteurs])
+        #une entité ne reçoit qu'une fois une même information, même si plusieurs voisins la lui transmettent
+        cles_propagees,premieres=np.unique(cles_cibles[propagees],return_index=True)
+        info_propagee=cles_propagees//n
+        entites_propagees=(cles_propagees%n).astype(np.int32)
+        emetteurs_propagees=emetteurs[propagees][premieres]
+        if profileur is not None:
+            profileur.phase('propagation')
+            profileur.compte(infos=len(actives),lignes=len(sources),voisins=nb_aretes,candidats=np.count_nonzero(candidates),
+                             nouveaux_destinataires=len(entites_propagees),tirages=1+2*len(sources)+nb_aretes)
+        
+        #mise à jour des lignes 'consultable', information par information
+        fin=np.cumsum(nb_lignes)
+        debut=fin-nb_lignes
+        debut_propagees=np.searchsorted(info_propagee,np.arange(len(actives)),side='left')
+        fin_propagees=np.searchsorted(info_propagee,np.arange(len(actives)),side='right')
+        for k,info in enumerate(actives):
+            l=lignes[k]
+            info.tps_consultabilite[l]+=1
+            if collecteur is not None:
+                collecteur.appreciations(info.id_information,info.ids_entites[l],info.appreciations[l],appreciations[debut[k]:fin[k]])
+            info.appreciations[l]=appreciations[debut[k]:fin[k]]
+            consultee=consultees[debut[k]:fin[k]]
+            info.statuts[l[consultee]]=CONSULTEE
+            info.nb_entites+=int(consultee.sum())
+            #si l'info n'a pas été consultée depuis trop longtemps par une entité, elle devient non_consultable
+            expirees=l[~consultee & (info.tps_consultabilite[l]>=self.temps_consultation)]
+            info.statuts[expirees]=NON_CONSULTABLE
+            
+            #nouvelle frontière : lignes restées 'consultable', puis nouvelles entités pour lesquelles l'information a été propagée
+            nouvelles=entites_propagees[debut_propagees[k]:fin_propagees[k]]
+            if collecteur is not None:
+                collecteur.consultations(info.id_information,info.ids_entites[l[consultee]])
+                collecteur.expirations(info.id_information,info.ids_entites[expirees])
+                collecteur.nouveaux_destinataires(info.id_information,nouvelles,emetteurs_propagees[debut_propagees[k]:fin_propagees[k]])
+            info.frontiere=l[info.statuts[l]==CONSULTABLE]
+            info.ajoute_lignes(nouvelles)
+        if profileur is not None:
+            profileur.phase('mise_a_jour')
+            
+        #les informations qui ne sont plus consultables par aucune entité deviennent inactives et rejoignent l'archive
+        self._retire_infos_inactives()
+        if profileur is not None:
+            profileur.phase('inactivation')
+                        
+    def _programme(self,type_evenement,dates,evenements):
+        ''' 
+        Méthode qui range des évènements du moteur 'evenements' dans l'échéancier, par date 
+        (file de priorité : tas des dates, et pour chaque date les tableaux d'évènements de chaque type).
+        
+        Arguments : 
+            - type_evenement : (string), 'receptions', 'appreciations' ou 'fins'.
+            - dates : (numpy.ndarray), pas de temps de chaque évènement.
+            - evenements : (numpy.ndarray int64, une ligne par évènement), colonnes COLONNES_EVENEMENTS[type_evenement].
+        '''
+        if len(dates)==0:
+            return
+        ordre=np.argsort(dates,kind='stable')
+        dates_triees,debuts,fins=segments_tries(np.asarray(dates,dtype=np.int64)[ordre])
+        evenements=np.asarray(evenements,dtype=np.int64)[ordre]
+        for date,debut,fin in zip(dates_triees.tolist(),debuts.tolist(),fins.tolist()):
+            if date not in self._echeancier:
+                self._echeancier[date]={type_e:[] for type_e in COLONNES_EVENEMENTS}
+                heapq.heappush(self._dates,date)
+            self._echeancier[date][type_evenement]+=[evenements[debut:fin]]
+            
+    def _depile(self,date):
+        ''' 
+        Méthode qui retire de l'échéancier les évènements du pas de temps date. 
+        
+        --> (dict), pour chaque type d'évènement, tableau (une ligne par évènement) trié par id_information.
+        '''
+        while len(self._dates)>0 and self._dates[0]<=date:
+            heapq.heappop(self._dates)
+        blocs=self._echeancier.pop(date,None)
+        evenements={}
+        for type_evenement,colonnes in COLONNES_EVENEMENTS.items():
+            if blocs is None or len(blocs[type_evenement])==0:
+                evenements[type_evenement]=np.zeros((0,len(colonnes)),dtype=np.int64)
+            else:
+                tableau=np.concatenate(blocs[type_evenement])
+                evenements[type_evenement]=tableau[np.argsort(tableau[:,0],kind='stable')]
+        return evenements
+        
+    def _programme_lignes(self,ids_informations,lignes,ids_entites,debut):
+        ''' 
+        Méthode du moteur 'evenements' qui tire le devenir de nouvelles lignes, traitées à partir du pas de temps debut, 
+        et programme leurs évènements : 
+            - fin : la ligne est traitée pendant duree pas de temps, jusqu'à sa consultation (premier succès des tirages de p_consultation) 
+            ou jusqu'à son expiration au bout de temps_consultation pas.
+            - appreciation : première appréciation au pas debut (les suivantes sont programmées par _avance_evenements).
+            - receptions : pour chaque voisin qui n'a pas encore reçu l'information, premier succès des tirages de p_connexion, 
+            s'il a lieu avant la fin de la ligne.
+        Les lignes doivent être triées par id_information.
+        
+        --> (tuple : (voisins, candidats, tirages)), compteurs du profileur.
+        '''
+        rng=self.rng
+        duree_max=max(self.temps_consultation,1)
+        essais=tirages_geometriques(rng,self.p_consultation[ids_entites],duree_max)
+        duree=np.minimum(essais,duree_max)
+        fin=debut+duree-1
+        self._programme('fins',fin,np.column_stack([ids_informations,lignes,ids_entites,essais<=duree_max,duree]))
+        self._programme('appreciations',np.full(len(lignes),debut,dtype=np.int64),
+                        np.column_stack([ids_informations,lignes,ids_entites,fin,np.full(len(lignes),A_APPRECIER)]))
+        
+        #voisins qui n'ont pas encore reçu l'information (lecture de l'index destinataires de chaque information)
+        origines,cibles=voisins_csr(self.indptr,self.indices,ids_entites)
+        info_arete=ids_informations[origines]
+        candidates=np.empty(len(cibles),dtype=bool)
+        for id_information,debut_aretes,fin_aretes in zip(*[t.tolist() for t in segments_tries(info_arete)]):
+            candidates[debut_aretes:fin_aretes]=np.frombuffer(self._infos_evenements[id_information].destinataires,dtype=np.uint8)[cibles[debut_aretes:fin_aretes]]==0
+        origines=origines[candidates]
+        emetteurs=ids_entites[origines]
+        essais_connexion=tirages_geometriques(rng,self.p_connexion[emetteurs],duree[origines])
+        transmises=essais_connexion<=duree[origines]
+        self._programme('receptions',debut+essais_connexion[transmises]-1,
+                        np.column_stack([info_arete[candidates][transmises],cibles[candidates][transmises],emetteurs[transmises]]))
+        return len(cibles),len(origines),2*len(lignes)+len(origines)
+        
+    def _avance_evenements(self):
+        ''' 
+        Moteur à évènements de avance : chaque ligne ne coûte qu'un tirage à sa réception (voir _programme_lignes), 
+        puis avance ne traite que les évènements du pas de temps, pris dans l'échéancier : 
+        fins de lignes (consultations et expirations), changements d'appréciation et réceptions par de nouvelles entités. 
+        Les lignes en attente ne sont pas parcourues.
+        
+        Les lois sont celles des autres moteurs : l'appréciation étant retirée à chaque pas, le nombre de pas avant qu'elle 
+        change suit une loi géométrique, de même que le pas de la consultation et celui de la transmission à chaque voisin 
+        (une entité reçoit l'information au premier succès parmi ses voisins). Les séries relevées par le collecteur 
+        sont donc celles des autres moteurs, en loi. 
+        Dans les colonnes des informations, tps_consultabilite est écrit à la fin de chaque ligne et l'appréciation 
+        quand elle ne change plus (avant, elle reste 'a_apprecier' ; le collecteur, lui, suit chaque changement).
+        '''
+        
+        n=self.reseau.nb_entites
+        rng=self.rng
+        collecteur=self.collecteur
+        profileur=self.profileur
+        infos=self._infos_evenements
+        
+        #creation d'une nouvelle information, reçue par une entité aléatoire (et des informations programmées par injecte) : 
+        #leur ligne est traitée dès ce pas de temps
+        nvlles_infos=self._creations(lambda: int(rng.integers(0,n)))
+        temps=self.temps
+        for info in nvlles_infos:
+            infos[info.id_information]=info
+        for info in self.infos_actives:
+            info.temps_dans_reseau+=1
+        voisins,candidats,tirages=self._programme_lignes(np.array([info.id_information for info in nvlles_infos],dtype=np.int64),np.zeros(len(nvlles_infos),dtype=np.int64),
+                                                         np.array([info.ids_entites[0] for info in nvlles_infos],dtype=np.int64),temps)
+        evenements=self._depile(temps)
+        if profileur is not None:
+            profileur.phase('creation')
+            
+        #fins de lignes : consultations et expirations
+        fins=evenements['fins']
+        consultees=fins[:,3]==1
+        ids_fins,debuts,fins_segments=segments_tries(fins[:,0])
+        for id_information,debut,fin in zip(ids_fins.tolist(),debuts.tolist(),fins_segments.tolist()):
+            info=infos[id_information]
+            lignes=fins[debut:fin,1]
+            info.statuts[lignes]=np.where(consultees[debut:fin],CONSULTEE,NON_CONSULTABLE)
+            info.tps_consultabilite[lignes]=fins[debut:fin,4]
+            info.nb_entites+=int(consultees[debut:fin].sum())
+            info.frontiere=info.frontiere[info.statuts[info.frontiere]==CONSULTABLE]
+            info.nb_consultables=len(info.frontiere)
+        if collecteur is not None:
+            collecteur.consultations(fins[consultees,0],fins[consultees,2])
+            collecteur.expirations(fins[~consultees,0],fins[~consultees,2])
+        if profileur is not None:
+            profileur.phase('fins')
+            
+        #changements d'appréciation : première appréciation tirée selon p_appreciation, puis bascule de l'appréciation en cours 
+        #(portée par l'évènement)
+        appreciations=evenements['appreciations']
+        anciennes=appreciations[:,4].astype(np.uint8)
+        p_appreciation=self.p_appreciation[appreciations[:,2]]
+        premieres=anciennes==A_APPRECIER
+        nouvelles=np.where(anciennes==BIEN,MAUVAIS,BIEN).astype(np.uint8)
+        nouvelles[premieres]=np.where(rng.random(int(premieres.sum()))<p_appreciation[premieres],BIEN,MAUVAIS)
+        if collecteur is not None:
+            collecteur.appreciations(appreciations[:,0],appreciations[:,2],anciennes,nouvelles)
+        #prochain changement : premier tirage qui donne l'appréciation contraire, s'il a lieu avant la fin de la ligne ; 
+        #sinon l'appréciation est définitive et écrite dans les colonnes de l'information
+        restants=appreciations[:,3]-temps
+        essais=tirages_geometriques(rng,np.where(nouvelles==BIEN,1.-p_appreciation,p_appreciation),restants)
+        changements=essais<=restants
+        appreciations[:,4]=nouvelles
+        self._programme('appreciations',temps+essais[changements],appreciations[changements])
+        definitives=appreciations[~changements]
+        ids_definitives,debuts,fins_segments=segments_tries(definitives[:,0])
+        for id_information,debut,fin in zip(ids_definitives.tolist(),debuts.tolist(),fins_segments.tolist()):
+            infos[id_information].appreciations[definitives[debut:fin,1]]=definitives[debut:fin,4]
+        tirages+=int(premieres.sum())+len(appreciations)
+        if profileur is not None:
+            profileur.phase('appreciations')
+            
+        #réceptions : une entité ne reçoit qu'une fois une même information, même si plusieurs voisins la lui transmettent
+        receptions=evenements['receptions']
+        cles=receptions[:,0]*n+receptions[:,1]
+        ordre=np.argsort(cles,kind='stable')
+        receptions=receptions[ordre]
+        cles=cles[ordre]
+        premieres=np.ones(len(cles),dtype=bool)
+        premieres[1:]=cles[1:]!=cles[:-1]
+        receptions=receptions[premieres]
+        nouvelles_lignes=np.empty(len(receptions),dtype=np.int64)
+        retenues=np.empty(len(receptions),dtype=bool)
+        ids_receptions,debuts,fins_segments=segments_tries(receptions[:,0])
+        for id_information,debut,fin in zip(ids_receptions.tolist(),debuts.tolist(),fins_segments.tolist()):
+            info=infos[id_information]
+            retenues[debut:fin]=np.frombuffer(info.destinataires,dtype=np.uint8)[receptions[debut:fin,1]]==0
+            nouvelles=receptions[debut:fin][retenues[debut:fin]]
+            nouvelles_lignes[debut:fin][retenues[debut:fin]]=info.ajoute_lignes(nouvelles[:,1])
+        receptions=receptions[retenues]
+        nouvelles_lignes=nouvelles_lignes[retenues]
+        if collecteur is not None:
+            collecteur.nouveaux_destinataires(receptions[:,0],receptions[:,1],receptions[:,2])
+        if len(receptions)>0:
+            compteurs=self._programme_lignes(receptions[:,0],nouvelles_lignes,receptions[:,1],temps+1)
+            voisins,candidats,tirages=voisins+compteurs[0],candidats+compteurs[1],tirages+compteurs[2]
+        if profileur is not None:
+            profileur.phase('receptions')
+            profileur.compte(infos=len(self.infos_actives),lignes=len(nvlles_infos)+len(receptions),voisins=voisins,candidats=candidats,
+                             nouveaux_destinataires=len(receptions),tirages=int(self.creation_aleatoire)+tirages)
+            
+        #les informations qui ne sont plus consultables par aucune entité deviennent inactives et rejoignent l'archive 
+        #(seules celles dont une ligne vient de finir peuvent l'être)
+        if any(infos[id_information].nb_consultables==0 for id_information in ids_fins.tolist()):
+            self._retire_infos_inactives()
+            for id_information in ids_fins.tolist():
+                if infos[id_information].statut_global=='inactive':
+                    del infos[id_information]
+        if profileur is not None:
+            profileur.phase('inactivation')
+                        
+    def simul_temps_max(self,temps_max=20, visualisation=False, affichage=True, chemin_checkpoint=None, intervalle_checkpoint=10, fichier_figure=None):
+        """
+        Methode qui procède a des itérations de la méthode avance() tant que le pas de temps est inférieur 
+        à temps max et qu'il y a encore des informations actives dans le réseau. 
+        
+        Argument : 
+            - temps_max : (int), temps maximum en pas de temps de la simulation.
+            - visualisation : (booleen), activation ou non de la visualisaiton de la simulation dans une interface graphique. 
+            Par défaut, on ne visualise pas la simulation. 
+            Les graphes sont construits à partir du collecteur de métriques de la simulation (un collecteur_metriques est branché s'il n'y en a pas).
+            - affichage : (booleen), affichage ou non d'un message lorsque la simulation s'arrête faute d'information active. 
+            Par défaut, le message est affiché.
+            - chemin_checkpoint : (string ou None), fichier de point de reprise, réécrit tous les intervalle_checkpoint pas de temps 
+            (voir checkpoint). Par défaut, aucun point de reprise n'est écrit.
+            - intervalle_checkpoint : (int), nombre de pas de temps entre deux points de reprise (10 par défaut).
+            - fichier_figure : (string ou None), fichier où enregistrer la visualisation, sans fenêtre. 
+            Par défaut, la visualisation est affichée dans une fenêtre.
+        """
+            
         cpt_pas=0
         statut_infos='actives'
         
-        y_infos_actives_tps=[0]
-        y_infos_inactives_tps=[0]
-        y_infos_bien_tps=[0]
-        y_infos_mauvais_tps=[0]
+        if visualisation==True:
+            if self.collecteur is None:
+                self.attache_collecteur(collecteur_metriques(self.reseau.nb_entites))
+            self.collecteur.reserve(nb_releves=self.collecteur.nb_releves+temps_max,nb_infos=self.temps+temps_max)
+        
+        while cpt_pas<temps_max and statut_infos=='actives':
+            
+            cpt_pas+=1
+            self.avance()
+            if chemin_checkpoint is not None and cpt_pas%intervalle_checkpoint==0:
+                self.checkpoint(chemin_checkpoint)
+            if len(self.infos_actives)==0 and len(self._injections)==0: #toutes les informations ont rejoint l'archive et aucune création n'est programmée
+                statut_infos='inactives'
+                if affichage:
+                    print('La simulation s est arrete apres', cpt_pas, ' pas')
+        
+        if visualisation==True:
+            
+            figure_simulation(self.collecteur,self.id_simulation,self.temps,temps_max,self.reseau.id,fichier_figure)
+
+SEUIL_BARRES=500 # au-delà de ce nombre de barres par série, figure_simulation trace des courbes en escalier
+
+def barres(axes,x,largeur,series):
+    '''
+    Fonction qui trace côte à côte plusieurs séries de même longueur sous forme de barres (la série k est décalée de k*largeur). 
+    Au-delà de SEUIL_BARRES valeurs, chaque série est tracée en une seule courbe en escalier (un artiste par série au lieu d'un par barre).
+    
+    Arguments : 
+        - axes : (matplotlib.axes.Axes), graphe où tracer.
+        - x : (numpy.ndarray), abscisses de la première série.
+        - largeur : (float), largeur des barres.
+        - series : (list de tuples : (valeurs, couleur, legende)).
+    '''
+    for k,(valeurs,couleur,legende) in enumerate(series):
+        valeurs=np.asarray(valeurs)
+        if len(valeurs)<=SEUIL_BARRES:
+            axes.bar(x+k*largeur, valeurs, width=largeur, color=couleur, label=legende)
+        else:
+            axes.stairs(valeurs, np.append(x,x[-1]+1 if len(x)>0 else 0)+k*largeur, color=couleur, label=legende)
+
+
+def figure_simulation(collecteur,id_simulation,temps,temps_max,id_reseau,fichier=None):
+    '''
+    Fonction qui affiche les quatre graphes de visualisation d'une simulation à partir d'un collecteur de métriques : 
+        - graphe 1 : nombre d'informations actives/inactives au cours du temps.
+        - graphe 2 : nombre d'appréciations 'bien' et 'mauvais' au cours du temps.
+        - graphe 3 : traitement des informations par les entités.
+        - graphe 4 : bilan des appréciations par information.
+    
+    Arguments : 
+        - collecteur : (collecteur_metriques), métriques de la simulation.
+        - id_simulation, temps, temps_max, id_reseau : identifiant de la simulation, temps d'arrêt, temps maximal et identifiant du réseau hôte, 
+        rappelés sur la figure.
+        - fichier : facultatif, None par défaut (affichage dans une fenêtre). Fichier où enregistrer la figure, sans fenêtre.
+    '''
+    #séries temporelles (graphes 1 et 2) et totaux (graphes 3 et 4) tenus à jour par le collecteur
+    series=collecteur.series()
+    x_tps=series['temps']
+    y_infos_actives_tps=series['actives']
+    y_infos_inactives_tps=series['inactives']
+    y_infos_bien_tps=series['bien']
+    y_infos_mauvais_tps=series['mauvais']
+    
+    totaux_entites=collecteur.totaux_entites()
+    y_entite_infos_recu=totaux_entites['recues']
+    y_entite_infos_consultees=totaux_entites['consultees']
+    y_entite_infos_bien=totaux_entites['bien']
+    y_entite_infos_mauvais=totaux_entites['mauvais']
+    
+    totaux_informations=collecteur.totaux_informations()
+    y_info_bien=totaux_informations['bien']
+    y_info_mauvais=totaux_informations['mauvais']
+    
+    #information(s) ayant obtenu le plus de mentions 'bien' et 'mauvais'
+    score_info_max=int(y_info_bien.max()) if len(y_info_bien)>0 else 0
+    score_info_min=int(y_info_mauvais.max()) if len(y_info_mauvais)>0 else 0
+    info_max=np.flatnonzero(y_info_bien==score_info_max).tolist()
+    info_min=np.flatnonzero(y_info_mauvais==score_info_min).tolist()
+    
+    #création de la figure
+    plt=pyplot(non_interactif=fichier is not None)
+    fig, [ax1, ax2, ax3, ax4] = plt.subplots(4, 1, figsize=(10,30))
+    fig.suptitle('Visualisation de la simulation '+str(id_simulation), fontsize=16)
+    plt.figtext(0.1, 0.9, "Arret de la simulation au temps: "+str(temps)+"\nTemps maximal de la simulation: "+str(temps_max)+"\nIdentifiant du réseau hôte : "+str(id_reseau)+"\nInformation(s) ayant obtenu le plus de mentions 'bien': "+str(info_max)+" (score: "+str(score_info_max)+")\nInformation(s) ayant obtenu le plus de mentions 'mauvais': "+str(info_min)+" (score: "+str(score_info_min)+")", fontweight = 'bold')
+    
+    #graphe 1 : nombre d'informations actives/inactives en fonction du temps
+    barWidth1=0.4
+    x_tps=np.asarray(x_tps,dtype=np.float64)
+    barres(ax1, x_tps, barWidth1, [(y_infos_actives_tps,'blue','Informations actives'),(y_infos_inactives_tps,'orange','Informations inactives')])
+    ax1.legend()
+    ax1.set_xlabel('Temps')
+    ax1.set_ylabel("Nombre d'informations")
+    ax1.set_title("Nombre d'informations actives/inactives au cours du temps")
+    
+    #graphe 2 : nombre d'appréciations 'bien' et 'mauvais' en fonction du temps
+    barWidth2=0.4
+    barres(ax2, x_tps, barWidth2, [(y_infos_bien_tps,'green','Bien'),(y_infos_mauvais_tps,'red','Mauvais')])
+    ax2.legend()
+    ax2.set_xlabel('Temps')
+    ax2.set_ylabel("Nombre d'appréciations")
+    ax2.set_title("Nombre d'appréciation 'bien' et 'mauvais' au cours du temps")
+    
+    #graphe 3 : pour chaque entité : nb info passées, nb infos consultées, nb infos appréciées (bien ou mauvaises)
+    
+    barWidth3=0.2
+    barres(ax3, np.arange(len(y_entite_infos_recu),dtype=np.float64), barWidth3, 
+           [(y_entite_infos_recu,'blue','Informations reçues'),(y_entite_infos_consultees,'orange','Informations consultées'),
+            (y_entite_infos_bien,'green','Informations appréciées (bien)'),(y_entite_infos_mauvais,'red','Informations appréciées (mauvais)')])
+    ax3.legend()
+    ax3.set_xlabel('Entités (id)')
+    ax3.set_ylabel("Nombre d'informations")
+    ax3.set_title("Traitement des informations par les entités")
+    
+    #graphe 4 : nombre d'appréciations (bien ou mauvaises) pour chaque information à la fin de la simulation 
+    
+    barWidth4=0.4
+    barres(ax4, np.arange(len(y_info_bien),dtype=np.float64), barWidth4, [(y_info_bien,'green','Bien'),(y_info_mauvais,'red','Mauvais')])
+    ax4.legend()
+    ax4.set_xlabel("Informations")
+    ax4.set_ylabel("Nombre d'appréciations")
+    ax4.set_title("Bilan des appréciations par information")
+    
+    montre_figure(plt,fig,fichier)
+
+        
+class collecteur_deltas(collecteur_metriques):
+    """
+    Classe définissant un collecteur de métriques qui regroupe aussi, pas de temps par pas de temps, les changements d'état 
+    signalés par avance (deltas), pour les diffuser pendant la simulation (voir flux_simulation). 
+    
+    Attribut delta : (dict ou None), changements du dernier pas de temps, relevés par fin_pas : 
+        - 'temps' : (int), temps de la simulation à la fin du pas.
+        - 'informations' : (numpy.ndarray), informations créées.
+        - 'destinataires' : (numpy.ndarray, colonnes id_information, id_entite, emetteur), nouveaux destinataires (emetteur -1 à la création).
+        - 'appreciations' : (numpy.ndarray, colonnes id_information, id_entite, ancienne, nouvelle), changements d'appréciation.
+        - 'consultations', 'expirations' : (numpy.ndarray, colonnes id_information, id_entite).
+        - 'inactivations' : (numpy.ndarray), informations devenues inactives.
+        - 'metriques' : (dict), compteurs à la fin du pas : 'actives', 'inactives', 'bien', 'mauvais', 'consultations', 'expirations'.
+    """
+    
+    COLONNES={'informations':1,'destinataires':3,'appreciations':4,'consultations':2,'expirations':2,'inactivations':1}
+    
+    def __init__(self,nb_entites,capacite=64):
+        self._tampons={nom:[] for nom in self.COLONNES}
+        self.delta=None
+        collecteur_metriques.__init__(self,nb_entites,capacite)
+        
+    def _ajoute(self,nom,*colonnes):
+        colonnes=np.broadcast_arrays(*[np.asarray(colonne,dtype=np.int64).reshape(-1) for colonne in colonnes])
+        if len(colonnes[0])>0:
+            self._tampons[nom]+=[np.column_stack(colonnes)]
+            
+    def initialise(self,simulation):
+        collecteur_metriques.initialise(self,simulation)
+        self._tampons={nom:[] for nom in self.COLONNES}
+        self.delta=None
+        
+    def nouvelle_information(self,id_information):
+        collecteur_metriques.nouvelle_information(self,id_information)
+        self._ajoute('informations',id_information)
+        
+    def nouveaux_destinataires(self,id_information,ids_entites,emetteurs=None):
+        collecteur_metriques.nouveaux_destinataires(self,id_information,ids_entites,emetteurs)
+        self._ajoute('destinataires',id_information,ids_entites,-1 if emetteurs is None else emetteurs)
+        
+    def appreciations(self,id_information,ids_entites,anciennes,nouvelles):
+        collecteur_metriques.appreciations(self,id_information,ids_entites,anciennes,nouvelles)
+        self._ajoute('appreciations',id_information,ids_entites,anciennes,nouvelles)
+        
+    def consultations(self,id_information,ids_entites):
+        collecteur_metriques.consultations(self,id_information,ids_entites)
+        self._ajoute('consultations',id_information,ids_entites)
+        
+    def expirations(self,id_information,ids_entites):
+        collecteur_metriques.expirations(self,id_information,ids_entites)
+        self._ajoute('expirations',id_information,ids_entites)
+        
+    def inactivation(self,id_information):
+        collecteur_metriques.inactivation(self,id_information)
+        self._ajoute('inactivations',id_information)
+        
+    def fin_pas(self,temps):
+        collecteur_metriques.fin_pas(self,temps)
+        delta={'temps':temps}
+        for nom,nb_colonnes in self.COLONNES.items():
+            tampon=self._tampons[nom]
+            tableau=np.concatenate(tampon) if len(tampon)>0 else np.zeros((0,nb_colonnes),dtype=np.int64)
+            delta[nom]=tableau[:,0] if nb_colonnes==1 else tableau
+        delta['metriques']={'actives':self.nb_actives,'inactives':self.nb_inactives,'bien':self.nb_bien,'mauvais':self.nb_mauvais,
+                            'consultations':self.nb_consultations,'expirations':self.nb_expirations}
+        self._tampons={nom:[] for nom in self.COLONNES}
+        self.delta=delta
+        
+
+class abonnement(object):
+    """
+    Classe définissant un abonnement aux deltas d'un flux_simulation : itérateur asynchrone (async for) qui donne 
+    les deltas de chaque pas de temps (voir collecteur_deltas) et s'arrête avec le flux. 
+    
+    Méthode : 
+        - ferme : met fin à l'abonnement.
+    """
+    
+    def __init__(self,flux,taille=16,politique='attente'):
+        """
+        Constructeur qui initialise:
+            - file : (asyncio.Queue), deltas en attente de lecture (au plus taille).
+            - politique : (string : {'attente','ecrase'}), comportement quand la file est pleine : 
+            'attente' suspend la boucle du flux jusqu'à ce que l'abonné lise (contre-pression), 
+            'ecrase' retire le plus ancien delta pour ne jamais ralentir la simulation (suivi en direct).
+            - perdus : (int), nombre de deltas retirés sans avoir été lus (politique 'ecrase').
+            
+        Arguments : 
+            - flux : obligatoire, flux_simulation diffusant les deltas.
+            - taille : facultatif, 16 par défaut.
+            - politique : facultatif, 'attente' par défaut.
+        """
+        if politique not in ('attente','ecrase'):
+            raise ValueError("politique inconnue : "+str(politique)+" (valeurs possibles : 'attente', 'ecrase')")
+        self.flux=flux
+        self.file=asyncio.Queue(taille)
+        self.politique=politique
+        self.perdus=0
+        self.ouvert=True
+        
+    async def _publie(self,delta):
+        if not self.ouvert:
+            return
+        if self.politique=='attente':
+            await self.file.put(delta)
+        else:
+            if self.file.full():
+                self.file.get_nowait()
+                self.perdus+=1
+            self.file.put_nowait(delta)
+        
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self):
+        if not self.ouvert:
+            raise StopAsyncIteration
+        delta=await self.file.get()
+        if delta is None:
+            self.ouvert=False
+            raise StopAsyncIteration
+        return delta
+    
+    def ferme(self):
+        '''
+        Méthode qui met fin à l'abonnement (à appeler par l'abonné, par exemple après être sorti de sa boucle async for) : 
+        le flux ne lui envoie plus de delta et n'attend plus sa lecture.
+        '''
+        self.ouvert=False
+        if self in self.flux.abonnements:
+            self.flux.abonnements.remove(self)
+        while not self.file.empty():
+            self.file.get_nowait() # libère la boucle du flux si elle attendait de la place
+        
+
+class flux_simulation(object):
+    """
+    Classe définissant une interface asyncio autour d'une simulation : des producteurs soumettent des informations 
+    (entité qui la reçoit, temps de création) dans une file d'entrée bornée, une boucle fait avancer la simulation 
+    et diffuse à chaque pas de temps les changements d'état (deltas, voir collecteur_deltas) aux abonnés. 
+    Seule la boucle touche à la simulation : les producteurs et les abonnés ne la bloquent qu'au travers des files.
+    
+    Méthodes : 
+        - soumet : (coroutine) soumet une information, attend si la file d'entrée est pleine.
+        - soumet_sans_attente : soumet une information, lève asyncio.QueueFull si la file d'entrée est pleine.
+        - ferme_soumissions : annonce qu'aucune information ne sera plus soumise.
+        - abonne : ouvre un abonnement aux deltas.
+        - execute : (coroutine) boucle qui fait avancer la simulation.
+        - arrete : demande l'arrêt de la boucle à la fin du pas en cours.
+    """
+    
+    def __init__(self,simulation,taille_file=1024,dans_thread=True):
+        """
+        Constructeur qui initialise:
+            - simulation : (simulation), simulation pilotée. Un collecteur_deltas lui est branché si elle n'a pas de collecteur.
+            - collecteur : (collecteur_deltas), collecteur de la simulation (ses séries donnent les métriques en direct).
+            - soumissions : (asyncio.Queue), file d'entrée des informations soumises : (id_entite, temps).
+            - abonnements : (list), abonnements ouverts.
+            - soumissions_fermees : (booleen), plus aucune information ne sera soumise (voir ferme_soumissions).
+            - dans_thread : (booleen), exécution ou non de avance dans un thread, pour que la boucle asyncio 
+            reste disponible pendant les pas de temps longs. Sans thread, avance s'exécute dans la boucle asyncio : 
+            producteurs et abonnés n'y reprennent la main qu'entre deux pas de temps.
+            
+        Arguments : 
+            - simulation : obligatoire.
+            - taille_file : facultatif, 1024 par défaut, taille de la file d'entrée.
+            - dans_thread : facultatif, True par défaut.
+        """
+        if simulation.collecteur is None:
+            simulation.attache_collecteur(collecteur_deltas(simulation.reseau.nb_entites))
+        elif not isinstance(simulation.collecteur,collecteur_deltas):
+            raise ValueError("le collecteur de la simulation doit être un collecteur_deltas")
+        self.simulation=simulation
+        self.collecteur=simulation.collecteur
+        self.soumissions=asyncio.Queue(taille_file)
+        self.abonnements=[]
+        self.soumissions_fermees=False
+        self.dans_thread=dans_thread
+        self._arret=False
+        
+    def _verifie(self,id_entite):
+        if not 0<=id_entite<self.simulation.reseau.nb_entites:
+            raise ValueError("entité inconnue : "+str(id_entite)+" (le réseau a "+str(self.simulation.reseau.nb_entites)+" entités)")
+        
+    async def soumet(self,id_entite,temps=None):
+        '''
+        Méthode (coroutine) qui soumet une information reçue par l'entité id_entite, à créer au temps temps 
+        (None : au prochain pas de temps, voir simulation.injecte). Attend tant que la file d'entrée est pleine.
+        '''
+        self._verifie(id_entite)
+        if self.soumissions_fermees:
+            raise ValueError("les soumissions sont fermées")
+        await self.soumissions.put((id_entite,temps))
+        
+    def soumet_sans_attente(self,id_entite,temps=None):
+        '''
+        Méthode qui soumet une information comme soumet, sans attendre : lève asyncio.QueueFull si la file d'entrée est pleine.
+        '''
+        self._verifie(id_entite)
+        if self.soumissions_fermees:
+            raise ValueError("les soumissions sont fermées")
+        self.soumissions.put_nowait((id_entite,temps))
+        
+    def ferme_soumissions(self):
+        '''
+        Méthode qui annonce qu'aucune information ne sera plus soumise : la boucle execute s'arrête dès que la simulation 
+        n'a plus d'information active ni programmée (si elle ne crée pas d'information aléatoire).
+        '''
+        self.soumissions_fermees=True
+        self._reveille()
+        
+    def abonne(self,taille=16,politique='attente'):
+        '''
+        Méthode qui ouvre un abonnement aux deltas des pas de temps à venir (voir abonnement).
         
-        while cpt_pas<temps_max and statut_infos=='actives':
+        --> (abonnement)
+        '''
+        nvl_abonnement=abonnement(self,taille,politique)
+        self.abonnements+=[nvl_abonnement]
+        return nvl_abonnement
+    
+    def arrete(self):
+        '''
+        Méthode qui demande l'arrêt de la boucle execute à la fin du pas en cours. La demande est définitive : 
+        faite avant le lancement de execute, elle l'arrête avant son premier pas.
+        '''
+        self._arret=True
+        self._reveille()
+        
+    def _reveille(self):
+        if self.soumissions.empty():
+            self.soumissions.put_nowait(None) # réveille la boucle si elle attend une soumission
+        
+    def _recoit(self,soumission):
+        if soumission is not None:
+            self.simulation.injecte(soumission[0],soumission[1])
+        
+    async def execute(self,temps_max=None,cadence=None):
+        '''
+        Méthode (coroutine) qui fait avancer la simulation pas par pas : à chaque pas, les informations soumises sont 
+        programmées (simulation.injecte), la simulation avance d'un pas et le delta du pas est envoyé aux abonnés. 
+        La boucle rend la main entre deux pas. Quand la simulation n'a plus d'information active ni programmée 
+        et ne crée pas d'information aléatoire, la boucle attend la prochaine soumission (sans avancer le temps), 
+        ou s'arrête si les soumissions sont fermées. A l'arrêt, les abonnements se terminent.
+        
+        Arguments : 
+            - temps_max : facultatif, None par défaut (jusqu'à arrete), nombre maximal de pas de temps.
+            - cadence : facultatif, None par défaut (aussi vite que possible), durée minimale d'un pas de temps en secondes.
+            
+        --> (int), nombre de pas de temps réalisés.
+        '''
+        simu=self.simulation
+        boucle=asyncio.get_running_loop()
+        nb_pas=0
+        try:
+            while not self._arret and (temps_max is None or nb_pas<temps_max):
+                debut=boucle.time()
+                while not self.soumissions.empty():
+                    self._recoit(self.soumissions.get_nowait())
+                if not simu.creation_aleatoire and len(simu.infos_actives)==0 and len(simu._injections)==0:
+                    if self.soumissions_fermees:
+                        break
+                    self._recoit(await self.soumissions.get())
+                    continue
+                if self.dans_thread:
+                    await asyncio.to_thread(simu.avance)
+                else:
+                    simu.avance()
+                nb_pas+=1
+                for abonne in list(self.abonnements):
+                    await abonne._publie(self.collecteur.delta)
+                await asyncio.sleep(0 if cadence is None else max(0.,cadence-(boucle.time()-debut)))
+        finally:
+            for abonne in list(self.abonnements):
+                await abonne._publie(None)
+            self.abonnements=[]
+        return nb_pas
+        
+
+MELANGE_64=(0x9E3779B97F4A7C15,0xBF58476D1CE4E5B9,0x94D049BB133111EB)
+
+def alea_compteur(graine,temps,id_information,id_entite,id_cible,usage):
+    '''
+    Fonction qui renvoie des nombres pseudo-aléatoires uniformes sur [0,1[ calculés à partir de leurs coordonnées 
+    (graine, pas de temps, information, entité, entité cible ou -1, usage), par mélanges successifs (splitmix64). 
+    Un tirage ne dépend que de ses coordonnées et non de l'ordre des tirages : 
+    c'est ce qui rend une simulation_partitionnee indépendante du découpage en partitions.
+    
+    Arguments : entiers ou tableaux numpy d'entiers de même taille (la graine peut aussi être un tableau, voir simulation_balayage).
+    
+    --> (numpy.ndarray, float64)
+    '''
+    with np.errstate(over='ignore'):
+        forme=np.broadcast(graine,id_information,id_entite,id_cible).shape
+        x=np.broadcast_to(np.asarray(graine).astype(np.int64).astype(np.uint64),forme).copy()
+        for composante in (temps,id_information,id_entite,id_cible,usage):
+            x=x^(np.asarray(composante).astype(np.int64).astype(np.uint64))
+            x=x+np.uint64(MELANGE_64[0])
+            x=(x^(x>>np.uint64(30)))*np.uint64(MELANGE_64[1])
+            x=(x^(x>>np.uint64(27)))*np.uint64(MELANGE_64[2])
+            x=x^(x>>np.uint64(31))
+    return (x>>np.uint64(11)).astype(np.float64)*(1./(1<<53))
+
+
+def concatene_reseaux(reseaux,liens=()):
+    '''
+    Fonction qui réunit plusieurs réseaux en un seul graphe : les entités du réseau k reçoivent les numéros globaux 
+    decalages[k] à decalages[k]+nb_entites-1, et les liens entre réseaux s'ajoutent aux connexions de chaque réseau.
+    
+    Arguments : 
+        - reseaux : (list de reseau).
+        - liens : facultatif, aucun par défaut. Connexions entre réseaux, une par ligne (k_a, entite_a, k_b, entite_b) : 
+        l'entité entite_a du réseau reseaux[k_a] est connectée à l'entité entite_b du réseau reseaux[k_b].
+        
+    --> (dict), 'indptr', 'indices' (connexions globales au format CSR), 'p_connexion', 'p_consultation', 'p_appreciation', 
+    'reseau_entite' (position dans reseaux du réseau de chaque entité), 'decalages'.
+    '''
+    decalages=np.concatenate(([0],np.cumsum([r.nb_entites for r in reseaux]))).astype(np.int64)
+    n=int(decalages[-1])
+    cles=[]
+    for k,r in enumerate(reseaux):
+        origines=np.repeat(np.arange(r.nb_entites,dtype=np.int64),np.diff(r.indptr))
+        cles+=[(origines+decalages[k])*n+np.asarray(r.indices,dtype=np.int64)+decalages[k]]
+    liens=np.asarray(liens,dtype=np.int64).reshape(-1,4)
+    cles+=[(decalages[liens[:,0]]+liens[:,1])*n+decalages[liens[:,2]]+liens[:,3]]
+    cles=np.sort(np.concatenate(cles))
+    cles=cles[np.concatenate(([True],cles[1:]!=cles[:-1]))] if len(cles)>0 else cles
+    indptr,indices=csr_depuis_cles(n,cles)
+    probabilites=[r.vecteurs_probabilites() for r in reseaux]
+    return {'indptr':indptr,'indices':indices,
+            'p_connexion':np.concatenate([p[0] for p in probabilites]),'p_consultation':np.concatenate([p[1] for p in probabilites]),
+            'p_appreciation':np.concatenate([p[2] for p in probabilites]),
+            'reseau_entite':np.repeat(np.arange(len(reseaux),dtype=np.int32),np.diff(decalages)),'decalages':decalages}
+
+
+class partition_simulation(object):
+    """
+    Classe définissant une partition d'une simulation_partitionnee : elle possède une partie des entités 
+    et les lignes des informations reçues par ces entités. À chaque pas de temps, propage traite ses lignes 'consultable' 
+    et renvoie les propositions de propagation destinées à chaque partition, puis applique reçoit les propositions destinées 
+    à ses entités et ajoute les nouvelles lignes.
+    
+    Méthodes : 
+        - propage : première moitié d'un pas de temps.
+        - applique : seconde moitié d'un pas de temps.
+        - totaux : totaux par information et par entité de la partition.
+    """
+    
+    def __init__(self,id_partition,entites,indptr,indices,p_connexion,p_consultation,p_appreciation,frontiere,proprietaires_frontiere,
+                 nb_entites,nb_partitions,temps_consultation,graine):
+        """
+        Constructeur qui initialise:
+            - id_partition : (int), numéro de la partition.
+            - entites : (numpy.ndarray), numéros globaux (triés) des entités de la partition.
+            - indptr, indices : (numpy.ndarray), connexions sortantes des entités de la partition (lignes locales, cibles globales).
+            - p_connexion, p_consultation, p_appreciation : (numpy.ndarray), probabilités des entités de la partition.
+            - frontiere, proprietaires_frontiere : (numpy.ndarray), numéros globaux (triés) des entités des autres partitions 
+            vers lesquelles partent des connexions de la partition, et leur partition.
+            - ids_connus, proprietaires_connus : (numpy.ndarray), entités de la partition et de sa frontière (triées) et leur partition.
+            - nb_entites, nb_partitions : (int), nombres d'entités et de partitions de la simulation.
+            - temps_consultation, graine : paramètres de la simulation.
+            - infos : (dict), informations dont la partition possède des lignes, par identifiant. Leurs lignes et leur index 
+            destinataires portent les numéros locaux des entités (rang dans entites, retrouvé par recherche dichotomique) : 
+            la mémoire d'une partition ne dépend que de ses propres entités et de ses connexions, pas de la taille de la simulation.
+            - actives : (list), identifiants des informations actives.
+            - nb_bien, nb_mauvais : (int), nombre d'appréciations 'bien' / 'mauvais' des lignes de la partition.
+        """
+        self.id_partition=id_partition
+        self.entites=np.asarray(entites,dtype=np.int64)
+        self.indptr=indptr
+        self.indices=indices
+        self.p_connexion=p_connexion
+        self.p_consultation=p_consultation
+        self.p_appreciation=p_appreciation
+        self.nb_partitions=nb_partitions
+        self.temps_consultation=temps_consultation
+        self.graine=graine
+        self.nb_entites=nb_entites
+        ids_connus=np.concatenate([self.entites,np.asarray(frontiere,dtype=np.int64)])
+        ordre=np.argsort(ids_connus,kind='stable')
+        self.ids_connus=ids_connus[ordre]
+        self.proprietaires_connus=np.concatenate([np.full(len(self.entites),id_partition,dtype=np.int32),np.asarray(proprietaires_frontiere,dtype=np.int32)])[ordre]
+        self.infos={}
+        self.actives=[]
+        self.nb_bien=0
+        self.nb_mauvais=0
+        
+    def _information(self,id_information):
+        if id_information not in self.infos:
+            self.infos[id_information]=information(id_information,len(self.entites))
+            self.actives+=[id_information]
+        return self.infos[id_information]
+        
+    def propage(self,temps,id_creation,retirees):
+        '''
+        Méthode qui réalise la première moitié du pas de temps temps : création de l'information temps si son entité de départ 
+        est dans la partition, puis appréciation, consultation, expiration et tirage de la propagation pour chaque ligne 'consultable'. 
+        
+        Arguments : 
+            - temps : (int), pas de temps (identifiant de l'information créée).
+            - id_creation : (int), entité qui reçoit l'information créée.
+            - retirees : (list), informations devenues inactives au pas précédent.
+            
+        --> (list), pour chaque partition, propositions de propagation : (identifiants des informations, entités cibles).
+        '''
+        for id_information in retirees:
+            if id_information in self.infos:
+                self.infos[id_information].statut_global='inactive'
+        retirees=set(retirees)
+        self.actives=[id_information for id_information in self.actives if id_information not in retirees]
+        locale=np.searchsorted(self.entites,id_creation)
+        if locale<len(self.entites) and self.entites[locale]==id_creation:
+            self._information(temps).ajoute_lignes([locale])
+            
+        infos=[self.infos[id_information] for id_information in self.actives if len(self.infos[id_information].frontiere)>0]
+        messages=[(np.zeros(0,dtype=np.int64),np.zeros(0,dtype=np.int64)) for _ in range(self.nb_partitions)]
+        if len(infos)==0:
+            return messages
+        lignes=[info.frontiere for info in infos]
+        nb_lignes=np.array([len(l) for l in lignes],dtype=np.int64)
+        ids_infos=np.repeat(np.array([info.id_information for info in infos],dtype=np.int64),nb_lignes)
+        locales=np.concatenate([info.ids_entites[l] for info,l in zip(infos,lignes)]).astype(np.int64)
+        sources=self.entites[locales]
+        
+        #appréciation et consultation
+        appreciations=np.where(alea_compteur(self.graine,temps,ids_infos,sources,-1,1)<self.p_appreciation[locales],BIEN,MAUVAIS).astype(np.uint8)
+        consultees=alea_compteur(self.graine,temps,ids_infos,sources,-1,2)<self.p_consultation[locales]
+        
+        #propagation : une proposition par connexion tirée ; la partition de la cible écarte les entités qui ont déjà l'information
+        origines,cibles=voisins_csr(self.indptr,self.indices,locales)
+        tirees=alea_compteur(self.graine,temps,ids_infos[origines],sources[origines],cibles,3)<self.p_connexion[locales[origines]]
+        infos_proposees,cibles=ids_infos[origines][tirees],cibles[tirees]
+        destination=self.proprietaires_connus[np.searchsorted(self.ids_connus,cibles)]
+        ordre=np.argsort(destination,kind='stable')
+        coupures=np.searchsorted(destination[ordre],np.arange(self.nb_partitions+1))
+        messages=[(infos_proposees[ordre[coupures[k]:coupures[k+1]]],cibles[ordre[coupures[k]:coupures[k+1]]]) for k in range(self.nb_partitions)]
+        
+        #mise à jour des lignes
+        fin=np.cumsum(nb_lignes)
+        for k,info in enumerate(infos):
+            l=lignes[k]
+            morceau=slice(fin[k]-nb_lignes[k],fin[k])
+            info.temps_dans_reseau+=1
+            info.tps_consultabilite[l]+=1
+            self.nb_bien+=int(np.count_nonzero(appreciations[morceau]==BIEN))-int(np.count_nonzero(info.appreciations[l]==BIEN))
+            self.nb_mauvais+=int(np.count_nonzero(appreciations[morceau]==MAUVAIS))-int(np.count_nonzero(info.appreciations[l]==MAUVAIS))
+            info.appreciations[l]=appreciations[morceau]
+            consultee=consultees[morceau]
+            info.statuts[l[consultee]]=CONSULTEE
+            info.nb_entites+=int(consultee.sum())
+            info.statuts[l[~consultee & (info.tps_consultabilite[l]>=self.temps_consultation)]]=NON_CONSULTABLE
+            info.frontiere=l[info.statuts[l]==CONSULTABLE]
+            info.nb_consultables=len(info.frontiere)
+        return messages
+    
+    def applique(self,messages):
+        '''
+        Méthode qui réalise la seconde moitié du pas de temps : les propositions reçues de toutes les partitions (les siennes comprises) 
+        sont dédoublonnées, celles dont l'entité a déjà reçu l'information sont écartées et les autres deviennent de nouvelles lignes, 
+        par information et par entité croissantes.
+        
+        Argument : 
+            - messages : (list), propositions (identifiants des informations, entités cibles) envoyées par chaque partition.
+            
+        --> (tuple : (ids, nb_consultables, nb_bien, nb_mauvais)), nombre de lignes 'consultable' de chaque information active de la partition 
+        et nombres d'appréciations de la partition.
+        '''
+        cles=np.concatenate([ids_infos*self.nb_entites+cibles for ids_infos,cibles in messages]) if len(messages)>0 else np.zeros(0,dtype=np.int64)
+        cles=np.sort(cles)
+        cles=cles[np.concatenate(([True],cles[1:]!=cles[:-1]))] if len(cles)>0 else cles
+        ids_infos,cibles=cles//self.nb_entites,cles%self.nb_entites
+        coupures=np.flatnonzero(np.concatenate(([True],ids_infos[1:]!=ids_infos[:-1],[True]))) if len(cles)>0 else np.zeros(1,dtype=np.int64)
+        for debut,fin in zip(coupures[:-1],coupures[1:]):
+            info=self._information(int(ids_infos[debut]))
+            nouvelles=np.searchsorted(self.entites,cibles[debut:fin])
+            info.ajoute_lignes(nouvelles[np.frombuffer(info.destinataires,dtype=np.uint8)[nouvelles]==0])
+        ids=np.array(self.actives,dtype=np.int64)
+        return ids,np.array([self.infos[id_information].nb_consultables for id_information in self.actives],dtype=np.int64),self.nb_bien,self.nb_mauvais
+    
+    def totaux(self):
+        '''
+        Méthode qui renvoie les totaux de la partition.
+        
+        --> (dict), 'ids_infos', 'portee', 'consultations', 'bien', 'mauvais' par information ; 
+        'entites', 'recues', 'consultees', 'bien_entites', 'mauvais_entites' par entité de la partition.
+        '''
+        ids=sorted(self.infos)
+        m=len(self.entites)
+        totaux={'ids_infos':np.array(ids,dtype=np.int64),'entites':self.entites}
+        for nom in ('portee','consultations','bien','mauvais'):
+            totaux[nom]=np.zeros(len(ids),dtype=np.int64)
+        for nom in ('recues','consultees','bien_entites','mauvais_entites'):
+            totaux[nom]=np.zeros(m,dtype=np.int64)
+        for k,id_information in enumerate(ids):
+            info=self.infos[id_information]
+            locales=info.ids_entites
+            totaux['portee'][k]=info.nb_lignes
+            totaux['consultations'][k]=info.nb_entites
+            totaux['bien'][k]=np.count_nonzero(info.appreciations==BIEN)
+            totaux['mauvais'][k]=np.count_nonzero(info.appreciations==MAUVAIS)
+            totaux['recues'][locales]+=1
+            totaux['consultees'][locales[info.statuts==CONSULTEE]]+=1
+            totaux['bien_entites'][locales[info.appreciations==BIEN]]+=1
+            totaux['mauvais_entites'][locales[info.appreciations==MAUVAIS]]+=1
+        return totaux
+
+
+def boucle_partition(connexion,parametres):
+    '''
+    Fonction exécutée par un processus de simulation_partitionnee : elle construit ses partitions (une par élément de parametres) 
+    puis exécute les commandes reçues (nom de méthode et arguments de chaque partition) jusqu'à la commande 'fin'.
+    '''
+    partitions=[partition_simulation(**parametres_partition) for parametres_partition in parametres]
+    while True:
+        commande,arguments=connexion.recv()
+        if commande=='fin':
+            break
+        connexion.send([getattr(partition,commande)(*arguments_partition) for partition,arguments_partition in zip(partitions,arguments)])
+    connexion.close()
+
+
+class simulation_partitionnee(object):
+    """
+    Classe définissant une simulation sur un ou plusieurs réseaux reliés entre eux, dont les entités sont réparties en partitions 
+    qui avancent chacune dans leur processus. À chaque pas de temps, chaque partition traite ses lignes 'consultable' et envoie 
+    ses propositions de propagation aux partitions des entités cibles, par lots, puis chaque partition ajoute les lignes reçues. 
+    
+    Les règles sont celles de simulation (une nouvelle information par pas de temps, reçue par une entité au hasard, 
+    appréciation, propagation, consultation, expiration) mais les nombres aléatoires sont calculés par alea_compteur à partir 
+    de leurs coordonnées : pour une même graine, les résultats ne dépendent ni du découpage en partitions ni du nombre de processus, 
+    et sont ceux d'une simulation en une seule partition.
+    
+    Méthodes : 
+        - avance : avance la simulation d'un pas de temps.
+        - simul_temps_max : avance tant qu'il y a des informations actives, au plus temps_max pas.
+        - resultats : totaux par information et par entité, et séries temporelles.
+        - ferme : arrête les processus des partitions.
+        
+    Utilisée dans un bloc with, la simulation arrête ses processus à la sortie du bloc, même en cas d'erreur.
+    """
+    
+    def __init__(self,id_simulation,reseaux,liens=(),temps_consultation=3,graine=0,partitions=None,nb_processus=None):
+        """
+        Constructeur qui initialise:
+            - id_simulation : (int), numéro d'identification de la simulation.
+            - temps : (int), temps (en nombre de pas) de la simulation.
+            - reseaux : (list de reseau), réseaux de la simulation.
+            - graphe : (dict), réseaux réunis (voir concatene_reseaux).
+            - proprietaire : (numpy.ndarray), partition de chaque entité.
+            - infos_actives : (list), identifiants des informations actives.
+            - series : (dict de list), 'temps', 'actives', 'inactives', 'bien', 'mauvais' après chaque pas de temps.
             
+        Arguments : 
+            - id_simulation : obligatoire. 
+            - reseaux : obligatoire, un reseau ou une liste de réseaux.
+            - liens : facultatif, connexions entre réseaux (voir concatene_reseaux).
+            - temps_consultation : facultatif, 3 par défaut.
+            - graine : facultatif, 0 par défaut.
+            - partitions : facultatif, None par défaut (une partition par réseau). 
+            Un entier k découpe les entités (numéros globaux) en k blocs contigus ; un tableau donne la partition de chaque entité.
+            - nb_processus : facultatif, None par défaut (un processus par partition). 0 : toutes les partitions dans le processus courant. 
+            Un entier k>0 répartit les partitions sur min(k, nombre de partitions) processus (blocs de partitions consécutives).
+        """
+        self.id_simulation=id_simulation
+        self.temps=0
+        self.temps_consultation=temps_consultation
+        self.graine=graine
+        self.reseaux=[reseaux] if isinstance(reseaux,reseau) else list(reseaux)
+        self.graphe=concatene_reseaux(self.reseaux,liens)
+        n=int(self.graphe['decalages'][-1])
+        if partitions is None:
+            proprietaire=self.graphe['reseau_entite']
+        elif np.ndim(partitions)==0:
+            proprietaire=np.repeat(np.arange(partitions,dtype=np.int32),[len(bloc) for bloc in np.array_split(np.arange(n),partitions)])
+        else:
+            proprietaire=np.asarray(partitions,dtype=np.int32)
+            if len(proprietaire)!=n:
+                raise ValueError("partitions doit donner la partition de chacune des "+str(n)+" entités")
+        self.proprietaire=np.asarray(proprietaire,dtype=np.int32)
+        nb_partitions=int(self.proprietaire.max())+1 if n>0 else 1
+        self.infos_actives=[]
+        self._creation={}
+        self._duree={}
+        self._retirees=[]
+        self.series={'temps':[],'actives':[],'inactives':[],'bien':[],'mauvais':[]}
+        
+        #construction des partitions : chacune ne reçoit que les connexions sortantes de ses entités
+        indptr,indices=self.graphe['indptr'],self.graphe['indices']
+        parametres=[]
+        for k in range(nb_partitions):
+            entites=np.flatnonzero(self.proprietaire==k)
+            cibles=voisins_csr(indptr,indices,entites)[1]
+            indptr_local=np.zeros(len(entites)+1,dtype=np.int64)
+            np.cumsum(indptr[entites+1]-indptr[entites],out=indptr_local[1:])
+            #frontière : entités des autres partitions visées par les connexions de la partition (triées, sans doublon)
+            frontiere=np.sort(cibles[self.proprietaire[cibles]!=k])
+            frontiere=frontiere[np.concatenate(([True],frontiere[1:]!=frontiere[:-1]))] if len(frontiere)>0 else frontiere
+            parametres+=[{'id_partition':k,'entites':entites,'indptr':indptr_local,'indices':cibles,
+                          'p_connexion':self.graphe['p_connexion'][entites],'p_consultation':self.graphe['p_consultation'][entites],
+                          'p_appreciation':self.graphe['p_appreciation'][entites],'frontiere':frontiere,
+                          'proprietaires_frontiere':self.proprietaire[frontiere],'nb_entites':n,'nb_partitions':nb_partitions,
+                          'temps_consultation':temps_consultation,'graine':graine}]
+        self.nb_partitions=nb_partitions
+        self._processus=[]
+        self._connexions=[]
+        self._groupes=[] # partitions de chaque processus
+        self._partitions=[]
+        if nb_processus is not None and (int(nb_processus)!=nb_processus or nb_processus<0):
+            raise ValueError("nb_processus doit être None ou un entier positif ou nul : "+str(nb_processus))
+        if nb_processus==0:
+            self._partitions=[partition_simulation(**parametres_partition) for parametres_partition in parametres]
+        else:
+            nb_workers=nb_partitions if nb_processus is None else min(int(nb_processus),nb_partitions)
+            self._groupes=[bloc.tolist() for bloc in np.array_split(np.arange(nb_partitions),nb_workers)]
+            contexte=multiprocessing.get_context()
+            for groupe in self._groupes:
+                connexion,connexion_processus=contexte.Pipe()
+                processus=contexte.Process(target=boucle_partition,args=(connexion_processus,[parametres[k] for k in groupe]),daemon=True)
+                processus.start()
+                self._processus+=[processus]
+                self._connexions+=[connexion]
+                
+    def __enter__(self):
+        return self
+    
+    def __exit__(self,type_erreur,erreur,trace):
+        self.ferme()
+        return False
+                
+    def _appel(self,commande,arguments):
+        '''
+        Méthode qui exécute une méthode de chaque partition (arguments[k] pour la partition k), en parallèle, et renvoie leurs résultats.
+        '''
+        if len(self._partitions)>0:
+            return [getattr(partition,commande)(*arguments_partition) for partition,arguments_partition in zip(self._partitions,arguments)]
+        if len(self._connexions)==0:
+            raise ValueError("les processus de la simulation ont été arrêtés (voir ferme)")
+        for connexion,groupe in zip(self._connexions,self._groupes):
+            connexion.send((commande,[arguments[k] for k in groupe]))
+        resultats=[None]*self.nb_partitions
+        for connexion,groupe in zip(self._connexions,self._groupes):
+            for k,resultat in zip(groupe,connexion.recv()):
+                resultats[k]=resultat
+        return resultats
+    
+    def avance(self):
+        ''' 
+        Méthode qui fait avancer la simulation d'un pas de temps : création d'une information, traitement des lignes de chaque partition, 
+        échange des propositions de propagation entre partitions, puis retrait des informations qui ne sont plus consultables.
+        '''
+        n=len(self.proprietaire)
+        id_information=self.temps
+        id_creation=min(int(alea_compteur(self.graine,self.temps,-1,-1,-1,0)[()]*n),n-1)
+        self._creation[id_information]=self.temps
+        self.infos_actives+=[id_information]
+        self.temps+=1
+        nb_partitions=self.nb_partitions
+        
+        messages=self._appel('propage',[(id_information,id_creation,self._retirees)]*nb_partitions)
+        #messages[k][j] : propositions de la partition k pour la partition j
+        bilans=self._appel('applique',[([messages[k][j] for k in range(nb_partitions)],) for j in range(nb_partitions)])
+        
+        #une information est inactive quand elle n'a plus de ligne 'consultable' dans aucune partition
+        consultables=collections.Counter()
+        for ids,nb_consultables,_,_ in bilans:
+            consultables.update(dict(zip(ids.tolist(),nb_consultables.tolist())))
+        self._retirees=[id_info for id_info in self.infos_actives if consultables[id_info]==0]
+        for id_info in self._retirees:
+            self._duree[id_info]=self.temps-self._creation[id_info]
+        self.infos_actives=[id_info for id_info in self.infos_actives if consultables[id_info]>0]
+        
+        self.series['temps']+=[self.temps]
+        self.series['actives']+=[len(self.infos_actives)]
+        self.series['inactives']+=[len(self._creation)-len(self.infos_actives)]
+        self.series['bien']+=[sum(bilan[2] for bilan in bilans)]
+        self.series['mauvais']+=[sum(bilan[3] for bilan in bilans)]
+        
+    def simul_temps_max(self,temps_max=20,affichage=True):
+        '''
+        Méthode qui avance la simulation tant qu'il y a des informations actives, au plus temps_max pas de temps.
+        '''
+        cpt_pas=0
+        while cpt_pas<temps_max:
             cpt_pas+=1
+            self.avance()
+            if len(self.infos_actives)==0:
+                if affichage:
+                    print('La simulation s est arrete apres', cpt_pas, ' pas')
+                break
             
-            #visualisation de la simulation dans le temps
-            #calculs pour les graphes 1 et 2
-            if visualisation==True:
-                y_infos_actives_tps=y_infos_actives_tps+[0]
-                y_infos_inactives_tps=y_infos_inactives_tps+[0]
-                y_infos_bien_tps=y_infos_bien_tps+[0]
-                y_infos_mauvais_tps=y_infos_mauvais_tps+[0]
-                for info in self.liste_info:
-                    if info.statut_global=='active':
-                        y_infos_actives_tps[-1]=y_infos_actives_tps[-1]+1
-                    else:
-                        y_infos_inactives_tps[-1]=y_infos_inactives_tps[-1]+1
-                    for i in range(0,len(info.liste_entites)):
-                        if info.liste_entites[i][-1]=='bien':
-                            y_infos_bien_tps[-1]=y_infos_bien_tps[-1]+1
-                        elif info.liste_entites[i][-1]=='mauvais':
-                            y_infos_mauvais_tps[-1]=y_infos_mauvais_tps[-1]+1
-                        
+    def resultats(self):
+        '''
+        Méthode qui rassemble les totaux de toutes les partitions.
+        
+        --> (dict) : 
+            - 'informations' : tableaux indexés par l'identifiant des informations : 'portee', 'consultations', 'bien', 'mauvais', 
+            'duree' (pas de temps passés dans le réseau, jusqu'à maintenant pour les informations actives), 'active'.
+            - 'entites' : tableaux indexés par le numéro global des entités : 'recues', 'consultees', 'bien', 'mauvais', 'id_reseau'.
+            - 'series' : séries temporelles (voir series).
+        '''
+        totaux=self._appel('totaux',[()]*self.nb_partitions)
+        nb_infos=self.temps
+        n=len(self.proprietaire)
+        informations={nom:np.zeros(nb_infos,dtype=np.int64) for nom in ('portee','consultations','bien','mauvais')}
+        entites={nom:np.zeros(n,dtype=np.int64) for nom in ('recues','consultees','bien','mauvais')}
+        for total in totaux:
+            for nom in informations:
+                np.add.at(informations[nom],total['ids_infos'],total[nom])
+            entites['recues'][total['entites']]=total['recues']
+            entites['consultees'][total['entites']]=total['consultees']
+            entites['bien'][total['entites']]=total['bien_entites']
+            entites['mauvais'][total['entites']]=total['mauvais_entites']
+        informations['active']=np.zeros(nb_infos,dtype=bool)
+        informations['active'][self.infos_actives]=True
+        informations['duree']=np.array([self._duree.get(id_info,self.temps-id_info) for id_info in range(nb_infos)],dtype=np.int64)
+        entites['id_reseau']=np.array([r.id for r in self.reseaux])[self.graphe['reseau_entite']] if n>0 else np.zeros(0,dtype=np.int64)
+        return {'informations':informations,'entites':entites,'series':{nom:np.array(valeurs) for nom,valeurs in self.series.items()}}
+    
+    def ferme(self):
+        '''
+        Méthode qui arrête les processus des partitions (sans effet si elles sont déjà arrêtées). 
+        Un processus qui ne s'arrête pas de lui-même est terminé.
+        '''
+        for connexion in self._connexions:
+            try:
+                connexion.send(('fin',()))
+            except (BrokenPipeError,EOFError,OSError):
+                pass
+            connexion.close()
+        for processus in self._processus:
+            processus.join(timeout=5)
+            if processus.is_alive():
+                processus.terminate()
+                processus.join()
+        self._connexions=[]
+        self._processus=[]
+        
+
+# paramètres d'une grille de lance_monte_carlo transmis au réseau, à la simulation et à simul_temps_max
+PARAMETRES_RESEAU=('nb_entites','espace','generateur','portee','noyau')
+PARAMETRES_SIMULATION=('temps_consultation','moteur')
+PARAMETRES_SIMUL_TEMPS_MAX=('temps_max',)
+
+def execute_replica(tache):
+    '''
+    Fonction qui construit un réseau et une simulation, lance simul_temps_max sans visualisation et renvoie le résumé du run. 
+    Exécutée dans les processus de lance_monte_carlo.
+    
+    Argument : 
+        - tache : (tuple : (parametres, graine_reseau, graine_simulation)), parametres est un dictionnaire 
+        dont les clés sont dans PARAMETRES_RESEAU, PARAMETRES_SIMULATION ou PARAMETRES_SIMUL_TEMPS_MAX.
+    
+    --> (dict), résumé du run : 
+        - temps_arret : temps de la simulation à l'arrêt.
+        - portee_moyenne : nombre moyen d'entités atteintes par information.
+        - consultations_moyennes : nombre moyen d'entités ayant consulté chaque information.
+        - ratio_bien : part des appréciations 'bien' parmi les appréciations 'bien' et 'mauvais' en fin de simulation.
+    '''
+    parametres,graine_reseau,graine_simulation=tache
+    r=reseau(0,graine=graine_reseau,**{cle:valeur for cle,valeur in parametres.items() if cle in PARAMETRES_RESEAU})
+    args_simulation={cle:valeur for cle,valeur in parametres.items() if cle in PARAMETRES_SIMULATION}
+    simu=simulation(0,r,graine=graine_simulation,collecteur=collecteur_metriques(r.nb_entites),**args_simulation)
+    simu.simul_temps_max(parametres.get('temps_max',20),affichage=False)
+    
+    collecteur=simu.collecteur
+    nb_appreciations=collecteur.nb_bien+collecteur.nb_mauvais
+    return {'temps_arret':simu.temps,
+            'portee_moyenne':collecteur.recues.sum()/max(len(simu.liste_info),1),
+            'consultations_moyennes':collecteur.nb_consultations/max(len(simu.liste_info),1),
+            'ratio_bien':collecteur.nb_bien/nb_appreciations if nb_appreciations>0 else float('nan')}
+    
+
+def lance_monte_carlo(grille,nb_replicas=10,graine=0,nb_processus=None,niveau=0.95):
+    '''
+    Fonction qui lance nb_replicas simulations pour chaque combinaison de paramètres de la grille, réparties sur un ensemble de processus, 
+    et renvoie pour chaque combinaison la moyenne, l'écart-type et l'intervalle de confiance de chaque grandeur du résumé (voir execute_replica).
+    
+    Chaque run reçoit ses propres graines (réseau et simulation), tirées de flux indépendants issus de numpy.random.SeedSequence(graine) : 
+    les résultats sont reproductibles et ne dépendent pas du nombre de processus.
+    
+    Arguments : 
+        - grille : (dict), valeurs à parcourir pour chaque paramètre, par exemple {'temps_consultation':[3,10],'nb_entites':[50,100]}. 
+        Paramètres possibles : PARAMETRES_RESEAU, PARAMETRES_SIMULATION et PARAMETRES_SIMUL_TEMPS_MAX.
+        - nb_replicas : facultatif, 10 par défaut, nombre de runs par combinaison.
+        - graine : facultatif, 0 par défaut, graine de l'ensemble du lot.
+        - nb_processus : facultatif, None par défaut (autant que de coeurs), nombre de processus.
+        - niveau : facultatif, 0.95 par défaut, niveau des intervalles de confiance (approximation normale).
+        
+    --> (list), un dictionnaire par combinaison : {'parametres':{...},'nb_replicas':int,'statistiques':{grandeur:{'moyenne','ecart_type','ic':[borne_inf,borne_sup]}}}.
+    '''
+    for cle in grille:
+        if cle not in PARAMETRES_RESEAU+PARAMETRES_SIMULATION+PARAMETRES_SIMUL_TEMPS_MAX:
+            raise ValueError("paramètre inconnu dans la grille : "+str(cle))
+    cles=list(grille)
+    combinaisons=[dict(zip(cles,valeurs)) for valeurs in itertools.product(*[grille[cle] for cle in cles])]
+    
+    #une graine indépendante par run, dans l'ordre (combinaison, replica)
+    graines=np.random.SeedSequence(graine).spawn(len(combinaisons)*nb_replicas)
+    taches=[]
+    for k,parametres in enumerate(combinaisons):
+        for i in range(nb_replicas):
+            graine_reseau,graine_simulation=graines[k*nb_replicas+i].generate_state(2)
+            taches+=[(parametres,int(graine_reseau),int(graine_simulation))]
+            
+    if nb_processus==1:
+        resumes=[execute_replica(tache) for tache in taches]
+    else:
+        nb_workers=nb_processus or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=nb_workers) as executeur:
+            resumes=list(executeur.map(execute_replica,taches,chunksize=max(1,len(taches)//(4*nb_workers))))
+            
+    #agrégation par combinaison
+    z=statistics.NormalDist().inv_cdf(0.5+niveau/2)
+    resultats=[]
+    for k,parametres in enumerate(combinaisons):
+        runs=resumes[k*nb_replicas:(k+1)*nb_replicas]
+        statistiques={}
+        for grandeur in runs[0]:
+            valeurs=np.array([run[grandeur] for run in runs],dtype=np.float64)
+            valeurs=valeurs[~np.isnan(valeurs)]
+            moyenne=float(valeurs.mean()) if len(valeurs)>0 else float('nan')
+            ecart_type=float(valeurs.std(ddof=1)) if len(valeurs)>1 else 0.0
+            demi_largeur=z*ecart_type/math.sqrt(max(len(valeurs),1))
+            statistiques[grandeur]={'moyenne':moyenne,'ecart_type':ecart_type,'ic':[moyenne-demi_largeur,moyenne+demi_largeur]}
+        resultats+=[{'parametres':parametres,'nb_replicas':nb_replicas,'statistiques':statistiques}]
+    return resultats
+
+
+PARAMETRES_BALAYAGE=('temps_consultation','p_connexion','p_consultation','p_appreciation')
+GRANDEURS_BALAYAGE=('portee_moyenne','consultations_moyennes','ratio_bien','duree_moyenne')
+
+def loi_probabilites(quantiles,moyenne):
+    '''
+    Fonction qui renvoie les probabilités d'entités tirées selon la loi uniforme de moyenne moyenne la plus large dans [0,1] : 
+    uniforme sur [0,2*moyenne] si moyenne<=0.5, sur [2*moyenne-1,1] sinon. Pour moyenne=0.5, c'est la loi uniforme sur [0,1] 
+    de entite.__init__. Chaque entité garde son quantile (sa probabilité sous la loi uniforme sur [0,1]) : d'une moyenne à l'autre, 
+    sa probabilité varie continûment et dans le même sens.
+    
+    Arguments : 
+        - quantiles : (numpy.ndarray), quantiles des entités dans [0,1].
+        - moyenne : (float), moyenne de la loi, dans [0,1].
+        
+    --> (numpy.ndarray)
+    '''
+    if not 0<=moyenne<=1:
+        raise ValueError("la moyenne d'une loi de probabilités doit être dans [0,1] : "+str(moyenne))
+    quantiles=np.asarray(quantiles,dtype=np.float64)
+    if moyenne<=0.5:
+        return 2*moyenne*quantiles
+    return 1-2*(1-moyenne)*(1-quantiles)
+
+
+class simulation_balayage(object):
+    """
+    Classe définissant un balayage d'un paramètre à nombres aléatoires communs : la simulation est menée, sur le même réseau, 
+    pour chaque valeur du paramètre et chaque replica (copies), et toutes les copies avancent ensemble, leurs lignes 'consultable' 
+    étant traitées dans les mêmes tableaux. 
+    
+    Les règles et les nombres aléatoires sont ceux de simulation_partitionnee : chaque tirage est calculé par alea_compteur 
+    à partir de ses coordonnées (graine du replica, pas de temps, information, entité, cible), ce qui donne à chaque information 
+    et à chaque entité son propre flux, commun à toutes les valeurs du paramètre. D'une valeur à l'autre, les copies d'un replica 
+    ne diffèrent que par l'effet du paramètre : leurs écarts sont bien moins bruités que ceux de simulations indépendantes. 
+    
+    Méthodes : 
+        - avance : avance toutes les copies d'un pas de temps.
+        - simul_temps_max : avance toutes les copies de temps_max pas de temps.
+        - resultats : grandeurs résumées et séries temporelles de chaque copie.
+    """
+    
+    def __init__(self,id_simulation,reseau,parametre,valeurs,nb_replicas=1,temps_consultation=3,graine=0):
+        """
+        Constructeur qui initialise:
+            - id_simulation : (int), numéro d'identification de la simulation.
+            - temps : (int), temps (en nombre de pas) de la simulation.
+            - parametre, valeurs : paramètre balayé et ses valeurs. 
+            - graines : (numpy.ndarray), graine de chaque replica (voir alea_compteur), la copie c est le replica c//len(valeurs) 
+            pour la valeur c%len(valeurs).
+            - p_connexion, p_consultation, p_appreciation : (numpy.ndarray, taille (len(valeurs), nb_entites)), probabilités des entités pour chaque valeur.
+            - temps_consultation : (numpy.ndarray, taille len(valeurs)), temps de consultation pour chaque valeur.
+            - series : (dict de list), 'temps', puis 'actives', 'inactives', 'bien', 'mauvais' de chaque copie après chaque pas de temps.
             
+        Arguments : 
+            - id_simulation : obligatoire. 
+            - reseau : obligatoire.
+            - parametre : obligatoire, dans PARAMETRES_BALAYAGE. Pour les probabilités, les valeurs sont des moyennes (voir loi_probabilites) : 
+            les probabilités des entités du réseau servent de quantiles, et la valeur 0.5 redonne le réseau tel quel.
+            - valeurs : obligatoire, valeurs du paramètre.
+            - nb_replicas : facultatif, 1 par défaut.
+            - temps_consultation : facultatif, 3 par défaut (quand le paramètre balayé est une probabilité).
+            - graine : facultatif, 0 par défaut.
+        """
+        if parametre=='p_transfert':
+            raise ValueError("p_transfert n'intervient dans aucun moteur de simulation : son balayage ne changerait rien")
+        if parametre not in PARAMETRES_BALAYAGE:
+            raise ValueError("paramètre inconnu : "+str(parametre)+" (valeurs possibles : "+', '.join(PARAMETRES_BALAYAGE)+")")
+        self.id_simulation=id_simulation
+        self.temps=0
+        self.reseau=reseau
+        self.parametre=parametre
+        self.valeurs=list(valeurs)
+        self.nb_replicas=nb_replicas
+        self.nb_entites=reseau.nb_entites
+        self.indptr,self.indices=reseau.adjacence()
+        
+        nb_valeurs=len(self.valeurs)
+        probabilites=dict(zip(('p_connexion','p_consultation','p_appreciation'),reseau.vecteurs_probabilites()))
+        for nom,p in probabilites.items():
+            if nom==parametre:
+                p=np.array([loi_probabilites(p,valeur) for valeur in self.valeurs])
+            else:
+                p=np.tile(p,(nb_valeurs,1))
+            setattr(self,nom,p)
+        self.temps_consultation=np.array(self.valeurs if parametre=='temps_consultation' else [temps_consultation]*nb_valeurs,dtype=np.int64)
+        
+        #une graine par replica, tirée du flux de la graine du balayage
+        self.graines=(alea_compteur(graine,-1,np.arange(nb_replicas),-1,-1,4)*(1<<53)).astype(np.int64)
+        nb_copies=nb_replicas*nb_valeurs
+        self._graine_copie=np.repeat(self.graines,nb_valeurs)
+        self._valeur_copie=np.tile(np.arange(nb_valeurs),nb_replicas)
+        
+        #lignes 'consultable' de toutes les copies (une colonne par attribut)
+        self._slot=np.zeros(0,dtype=np.int64)
+        self._entite=np.zeros(0,dtype=np.int64)
+        self._tps=np.zeros(0,dtype=np.int64)
+        self._appreciation=np.zeros(0,dtype=np.uint8)
+        #informations actives de chaque copie, une case (slot) chacune : copie, identifiant, index des destinataires
+        self._copie_slot=np.zeros(0,dtype=np.int64)
+        self._info_slot=np.zeros(0,dtype=np.int64)
+        self._slot_actif=np.zeros(0,dtype=bool)
+        self._recu=np.zeros((0,self.nb_entites),dtype=np.uint8)
+        
+        #compteurs par copie
+        for nom in ('nb_actives','nb_inactives','nb_bien','nb_mauvais','recues','consultations','duree_inactives'):
+            setattr(self,nom,np.zeros(nb_copies,dtype=np.int64))
+        self.series={'temps':[],'actives':[],'inactives':[],'bien':[],'mauvais':[]}
+        
+    def _alloue(self,nb):
+        ''' 
+        Méthode qui réserve nb cases d'informations actives (les cases libérées sont réutilisées, le tableau est agrandi par doublement).
+        
+        --> (numpy.ndarray), cases réservées.
+        '''
+        libres=np.flatnonzero(~self._slot_actif)
+        if len(libres)<nb:
+            capacite=len(self._slot_actif)
+            nvlle_capacite=max(2*capacite,capacite+nb-len(libres))
+            for nom in ('_copie_slot','_info_slot','_slot_actif'):
+                ancien=getattr(self,nom)
+                nouveau=np.zeros(nvlle_capacite,dtype=ancien.dtype)
+                nouveau[:capacite]=ancien
+                setattr(self,nom,nouveau)
+            recu=np.zeros((nvlle_capacite,self.nb_entites),dtype=np.uint8)
+            recu[:capacite]=self._recu
+            self._recu=recu
+            libres=np.flatnonzero(~self._slot_actif)
+        slots=libres[:nb]
+        self._slot_actif[slots]=True
+        self._recu[slots]=0
+        return slots
+    
+    def _ajoute_lignes(self,slots,entites):
+        self._slot=np.concatenate([self._slot,slots])
+        self._entite=np.concatenate([self._entite,entites])
+        self._tps=np.concatenate([self._tps,np.zeros(len(slots),dtype=np.int64)])
+        self._appreciation=np.concatenate([self._appreciation,np.full(len(slots),A_APPRECIER,dtype=np.uint8)])
+        self._recu[slots,entites]=1
+        self.recues+=np.bincount(self._copie_slot[slots],minlength=len(self.recues))
+        
+    def avance(self):
+        ''' 
+        Méthode qui fait avancer toutes les copies d'un pas de temps : création d'une information par copie, 
+        appréciation, consultation, expiration et propagation de toutes les lignes 'consultable', puis retrait des informations inactives.
+        '''
+        n=self.nb_entites
+        temps=self.temps
+        nb_copies=len(self._graine_copie)
+        
+        #creation d'une information par copie, reçue par une entité tirée comme dans simulation_partitionnee
+        creations=np.minimum((alea_compteur(self._graine_copie,temps,-1,-1,-1,0)*n).astype(np.int64),n-1)
+        slots=self._alloue(nb_copies)
+        self._copie_slot[slots]=np.arange(nb_copies)
+        self._info_slot[slots]=temps
+        self._ajoute_lignes(slots,creations)
+        self.nb_actives+=1
+        
+        #appréciation et consultation de chaque ligne, avec les probabilités de la valeur du paramètre de sa copie
+        slot,entite=self._slot,self._entite
+        copie=self._copie_slot[slot]
+        valeur=self._valeur_copie[copie]
+        info=self._info_slot[slot]
+        graines=self._graine_copie[copie]
+        appreciations=np.where(alea_compteur(graines,temps,info,entite,-1,1)<self.p_appreciation[valeur,entite],BIEN,MAUVAIS).astype(np.uint8)
+        consultees=alea_compteur(graines,temps,info,entite,-1,2)<self.p_consultation[valeur,entite]
+        
+        #propagation aux voisins qui n'ont pas encore reçu l'information (une entité ne la reçoit qu'une fois)
+        origines,cibles=voisins_csr(self.indptr,self.indices,entite)
+        candidates=self._recu[slot[origines],cibles]==0
+        origines,cibles=origines[candidates],cibles[candidates]
+        tirees=alea_compteur(graines[origines],temps,info[origines],entite[origines],cibles,3)<self.p_connexion[valeur[origines],entite[origines]]
+        cles=np.sort(slot[origines][tirees]*n+cibles[tirees])
+        if len(cles)>0:
+            cles=cles[np.concatenate(([True],cles[1:]!=cles[:-1]))]
+        
+        #mise à jour des lignes et des compteurs de chaque copie
+        self.nb_bien+=np.bincount(copie,weights=(appreciations==BIEN).astype(np.int64)-(self._appreciation==BIEN),minlength=nb_copies).astype(np.int64)
+        self.nb_mauvais+=np.bincount(copie,weights=(appreciations==MAUVAIS).astype(np.int64)-(self._appreciation==MAUVAIS),minlength=nb_copies).astype(np.int64)
+        self.consultations+=np.bincount(copie[consultees],minlength=nb_copies)
+        tps=self._tps+1
+        restent=~consultees & (tps<self.temps_consultation[valeur])
+        self._slot,self._entite,self._tps,self._appreciation=slot[restent],entite[restent],tps[restent],appreciations[restent]
+        self._ajoute_lignes(cles//n,cles%n)
+        self.temps+=1
+        
+        #les informations qui n'ont plus de ligne 'consultable' deviennent inactives
+        consultables=np.bincount(self._slot,minlength=len(self._slot_actif))
+        inactives=np.flatnonzero(self._slot_actif & (consultables==0))
+        copies_inactives=self._copie_slot[inactives]
+        self.nb_actives-=np.bincount(copies_inactives,minlength=nb_copies)
+        self.nb_inactives+=np.bincount(copies_inactives,minlength=nb_copies)
+        self.duree_inactives+=np.bincount(copies_inactives,weights=self.temps-self._info_slot[inactives],minlength=nb_copies).astype(np.int64)
+        self._slot_actif[inactives]=False
+        
+        self.series['temps']+=[self.temps]
+        for nom,compteur in (('actives',self.nb_actives),('inactives',self.nb_inactives),('bien',self.nb_bien),('mauvais',self.nb_mauvais)):
+            self.series[nom]+=[compteur.copy()]
+            
+    def simul_temps_max(self,temps_max=20):
+        '''
+        Méthode qui avance toutes les copies de temps_max pas de temps (sans s'arrêter quand une copie n'a plus d'information active, 
+        pour que toutes les copies soient comparées sur la même durée).
+        '''
+        for _ in range(temps_max):
             self.avance()
-            cpt_infos_inactives=0
-            for info_test in self.liste_info:
-                if info_test.statut_global=='inactive':
-                    cpt_infos_inactives+=1
-            if cpt_infos_inactives==len(self.liste_info):
-                statut_infos='inactives'
-                print('La simulation s est arrete apres', cpt_pas, ' pas')
+            
+    def resultats(self):
+        '''
+        Méthode qui renvoie les grandeurs résumées et les séries de chaque copie, rangées par replica et par valeur du paramètre.
         
-        if visualisation==True:
+        --> (dict) : 
+            - 'grandeurs' : (numpy.ndarray, taille (nb_replicas, len(valeurs))) pour chaque grandeur de GRANDEURS_BALAYAGE : 
+            'portee_moyenne' et 'consultations_moyennes' (entités atteintes et ayant consulté, par information), 
+            'ratio_bien' (part des appréciations 'bien' en cours), 'duree_moyenne' (pas de temps passés dans le réseau par information, 
+            jusqu'à maintenant pour les informations actives).
+            - 'series' : (numpy.ndarray, taille (nb_replicas, len(valeurs), nombre de pas)) : 'actives', 'inactives', 'bien', 'mauvais' ; 
+            et 'temps'.
+        '''
+        forme=(self.nb_replicas,len(self.valeurs))
+        nb_infos=max(self.temps,1)
+        actives=np.flatnonzero(self._slot_actif)
+        duree=self.duree_inactives+np.bincount(self._copie_slot[actives],weights=self.temps-self._info_slot[actives],minlength=len(self.recues))
+        nb_appreciations=self.nb_bien+self.nb_mauvais
+        with np.errstate(invalid='ignore',divide='ignore'):
+            grandeurs={'portee_moyenne':self.recues/nb_infos,'consultations_moyennes':self.consultations/nb_infos,
+                       'ratio_bien':np.where(nb_appreciations>0,self.nb_bien/nb_appreciations,np.nan),'duree_moyenne':duree/nb_infos}
+        series={'temps':np.array(self.series['temps'],dtype=np.int64)}
+        for nom in ('actives','inactives','bien','mauvais'):
+            valeurs=np.array(self.series[nom],dtype=np.int64).reshape(-1,*forme) if len(self.series[nom])>0 else np.zeros((0,)+forme,dtype=np.int64)
+            series[nom]=np.moveaxis(valeurs,0,-1)
+        return {'grandeurs':{nom:np.asarray(valeur,dtype=np.float64).reshape(forme) for nom,valeur in grandeurs.items()},'series':series}
+    
+
+def lance_balayage(reseau,parametre,valeurs,nb_replicas=16,temps_max=50,temps_consultation=3,graine=0,niveau=0.95):
+    '''
+    Fonction qui balaie les valeurs d'un paramètre à nombres aléatoires communs (voir simulation_balayage) et renvoie, 
+    pour chaque grandeur de GRANDEURS_BALAYAGE et chaque valeur, la moyenne sur les replicas, la pente de la grandeur par rapport 
+    au paramètre et son élasticité. Les pentes sont calculées replica par replica (différences finies, centrées à l'intérieur 
+    de la grille, voir numpy.gradient) : elles profitent de ce que les copies d'un replica partagent leurs nombres aléatoires. 
+    
+    Arguments : 
+        - reseau : obligatoire, réseau commun à toutes les copies.
+        - parametre, valeurs : obligatoires, paramètre balayé (dans PARAMETRES_BALAYAGE) et ses valeurs, croissantes.
+        - nb_replicas : facultatif, 16 par défaut.
+        - temps_max : facultatif, 50 par défaut, nombre de pas de temps de chaque copie.
+        - temps_consultation : facultatif, 3 par défaut (quand le paramètre balayé est une probabilité).
+        - graine : facultatif, 0 par défaut.
+        - niveau : facultatif, 0.95 par défaut, niveau des intervalles de confiance (approximation normale).
+        
+    --> (dict) : {'parametre','valeurs','nb_replicas','statistiques':{grandeur:{...}}}, chaque grandeur ayant, valeur par valeur : 
+        - 'moyenne', 'ecart_type', 'ic' : comme lance_monte_carlo.
+        - 'pente', 'ic_pente' : dérivée de la grandeur par rapport au paramètre et son intervalle de confiance (si au moins deux valeurs).
+        - 'elasticite' : pente*valeur/moyenne, variation relative de la grandeur pour une variation relative du paramètre.
+        - 'gain_variance' : entre deux valeurs consécutives, variance de l'écart estimé avec des simulations indépendantes 
+        divisée par celle obtenue avec les nombres aléatoires communs (nombre de fois plus de replicas qu'il faudrait sans eux).
+    '''
+    valeurs=list(valeurs)
+    if any(b<=a for a,b in zip(valeurs,valeurs[1:])):
+        raise ValueError("les valeurs du paramètre doivent être croissantes : "+str(valeurs))
+    balayage=simulation_balayage(0,reseau,parametre,valeurs,nb_replicas=nb_replicas,temps_consultation=temps_consultation,graine=graine)
+    balayage.simul_temps_max(temps_max)
+    grandeurs=balayage.resultats()['grandeurs']
+    
+    z=statistics.NormalDist().inv_cdf(0.5+niveau/2)
+    racine=math.sqrt(nb_replicas)
+    ddof=1 if nb_replicas>1 else 0
+    statistiques={}
+    for grandeur,tableau in grandeurs.items():
+        moyenne=np.nanmean(tableau,axis=0) if nb_replicas>0 else np.full(len(valeurs),np.nan)
+        ecart_type=np.nanstd(tableau,axis=0,ddof=ddof)
+        resultat={'moyenne':moyenne.tolist(),'ecart_type':ecart_type.tolist(),
+                  'ic':[[m-z*e/racine,m+z*e/racine] for m,e in zip(moyenne.tolist(),ecart_type.tolist())]}
+        if len(valeurs)>1:
+            pentes=np.gradient(tableau,np.asarray(valeurs,dtype=np.float64),axis=1)
+            pente=np.nanmean(pentes,axis=0)
+            demi_largeur=z*np.nanstd(pentes,axis=0,ddof=ddof)/racine
+            ecarts=np.diff(tableau,axis=1)
+            with np.errstate(invalid='ignore',divide='ignore'):
+                elasticite=pente*np.asarray(valeurs,dtype=np.float64)/moyenne
+                gain=(np.nanvar(tableau[:,:-1],axis=0,ddof=ddof)+np.nanvar(tableau[:,1:],axis=0,ddof=ddof))/np.nanvar(ecarts,axis=0,ddof=ddof)
+            resultat.update({'pente':pente.tolist(),'ic_pente':[[p-d,p+d] for p,d in zip(pente.tolist(),demi_largeur.tolist())],
+                             'elasticite':elasticite.tolist(),'gain_variance':gain.tolist()})
+        statistiques[grandeur]=resultat
+    return {'parametre':parametre,'valeurs':valeurs,'nb_replicas':nb_replicas,'statistiques':statistiques}
+
+
+def estime_portees(tache):
+    '''
+    Fonction qui simule nb_replicas diffusions d'une information reçue au départ par l'entité id_entite, 
+    avec les règles de propagation de la simulation (appréciation, propagation aux voisins, consultation, expiration après temps_consultation pas), 
+    jusqu'à ce que l'information devienne inactive. Les informations d'une simulation ne s'influencent pas : 
+    la portée d'une information ne dépend que de son entité de départ. Les replicas sont simulés ensemble, par opérations sur les tableaux, 
+    avec un générateur propre à (graine, id_entite, temps_consultation), de sorte que le résultat ne dépend pas du découpage en lots. 
+    Exécutée dans les processus de cache_portees.precalcule.
+    
+    Argument : 
+        - tache : (tuple : (indptr, indices, p_connexion, p_consultation, p_appreciation, id_entite, temps_consultation, nb_replicas, graine)).
+        
+    --> (dict), tableaux de taille nb_replicas : 'portee' (nombre d'entités atteintes), 'consultations', 'bien' et 'mauvais' 
+    (appréciations finales), 'duree' (pas de temps passés dans le réseau).
+    '''
+    indptr,indices,p_connexion,p_consultation,p_appreciation,id_entite,temps_consultation,nb_replicas,graine=tache
+    n=len(indptr)-1
+    rng=np.random.default_rng([graine,id_entite,temps_consultation])
+    recue=np.zeros(nb_replicas*n,dtype=bool) # la clé r*n+k indique que l'entité k a reçu l'information dans le replica r
+    resultats={nom:np.zeros(nb_replicas,dtype=np.int64) for nom in ('portee','consultations','bien','mauvais','duree')}
+    
+    #lignes 'consultable' de tous les replicas
+    replicas=np.arange(nb_replicas,dtype=np.int64)
+    entites=np.full(nb_replicas,id_entite,dtype=np.int64)
+    tps=np.zeros(nb_replicas,dtype=np.int64)
+    recue[replicas*n+id_entite]=True
+    resultats['portee']+=1
+    pas=0
+    while len(replicas)>0:
+        pas+=1
+        resultats['duree'][replicas]=pas
+        tps+=1
+        bien=rng.random(len(entites))<p_appreciation[entites]
+        consultees=rng.random(len(entites))<p_consultation[entites]
+        
+        #propagation aux voisins qui n'ont pas encore reçu l'information ; une entité ne la reçoit qu'une fois. 
+        #les lignes sont traitées par tranches d'au plus 2**22 connexions, pour borner la mémoire ; 
+        #les lignes d'un replica où toutes les entités ont déjà reçu l'information ne sont plus parcourues
+        fin_aretes=np.cumsum(indptr[entites+1]-indptr[entites])
+        coupures=np.searchsorted(fin_aretes,np.arange(1<<22,int(fin_aretes[-1]),1<<22),side='right')
+        nouvelles=[]
+        for tranche in np.split(np.arange(len(entites)),coupures):
+            tranche=tranche[resultats['portee'][replicas[tranche]]<n]
+            origines,cibles=voisins_csr(indptr,indices,entites[tranche])
+            cles=replicas[tranche][origines]*n+cibles
+            candidates=~recue[cles]
+            cles,origines=cles[candidates],origines[candidates]
+            cles=np.sort(cles[rng.random(len(cles))<p_connexion[entites[tranche][origines]]])
+            cles=cles[np.concatenate(([True],cles[1:]!=cles[:-1]))] if len(cles)>0 else cles
+            recue[cles]=True
+            resultats['portee']+=np.bincount(cles//n,minlength=nb_replicas)
+            nouvelles+=[cles]
+        cles=np.concatenate(nouvelles)
+        
+        #lignes qui quittent la frontière : consultées, ou expirées faute de consultation
+        quittent=consultees|(tps>=temps_consultation)
+        resultats['consultations']+=np.bincount(replicas[consultees],minlength=nb_replicas)
+        resultats['bien']+=np.bincount(replicas[quittent & bien],minlength=nb_replicas)
+        resultats['mauvais']+=np.bincount(replicas[quittent & ~bien],minlength=nb_replicas)
+        nouveaux_replicas=cles//n
+        
+        restent=~quittent
+        replicas=np.concatenate((replicas[restent],nouveaux_replicas))
+        entites=np.concatenate((entites[restent],cles%n))
+        tps=np.concatenate((tps[restent],np.zeros(len(cles),dtype=np.int64)))
+    return resultats
+
+
+def estime_portees_lot(taches):
+    '''
+    Fonction qui exécute estime_portees pour une liste de tâches (un lot par processus de cache_portees.precalcule).
+    '''
+    return [estime_portees(tache) for tache in taches]
+
+
+class cache_portees(object):
+    """
+    Classe définissant un cache des estimations de portée par entité de départ (voir estime_portees). 
+    Une estimation est identifiée par l'empreinte du réseau, temps_consultation, l'entité de départ, le nombre de replicas et la graine. 
+    Les estimations sont gardées en mémoire (au plus capacite, les moins récemment utilisées étant retirées) 
+    et, si un dossier est donné, écrites sur disque (un fichier .npz par estimation) pour être relues par un autre processus ou plus tard.
+    
+    Méthodes : 
+        - portees : estimation de la portée d'une information partant d'une entité (calculée si elle n'est ni en mémoire ni sur disque).
+        - resume : moyenne, écart-type et quantiles de l'estimation.
+        - precalcule : calcule les estimations manquantes pour un ensemble d'entités, éventuellement sur plusieurs processus.
+    """
+    
+    def __init__(self,dossier=None,capacite=4096):
+        """
+        Constructeur qui initialise:
+            - dossier : (string ou None), dossier des estimations écrites sur disque.
+            - capacite : (int), nombre maximal d'estimations gardées en mémoire.
+            - nb_succes, nb_echecs : (int), nombre de demandes trouvées en mémoire ou sur disque / calculées.
             
-            #calculs pour les graphes 3 et 4
-                
-            n=self.reseau.nb_entites
-            y_entite_infos_recu=[0]*n
-            y_entite_infos_consultees=[0]*n
-            y_entite_infos_bien=[0]*n
-            y_entite_infos_mauvais=[0]*n
-
-            y_info_bien=[0]*self.temps
-            y_info_mauvais=[0]*self.temps
-            
-            for k in range(0,len(self.liste_info)):
-                for i in range(0,len(self.liste_info[k].liste_entites)):
-                    identifiant=self.liste_info[k].liste_entites[i][1]
-                    y_entite_infos_recu[identifiant]+=1
-                    if self.liste_info[k].liste_entites[i][-1]=='bien':
-                        y_entite_infos_bien[identifiant]+=1
-                        y_info_bien[k]+=1
-                    elif self.liste_info[k].liste_entites[i][-1]=='mauvais':
-                        y_entite_infos_mauvais[identifiant]+=1
-                        y_info_mauvais[k]+=1
-                    if self.liste_info[k].liste_entites[i][2]=='consultee':
-                        y_entite_infos_consultees[identifiant]+=1
-            
-            info_max=[]
-            info_min=[]
-            score_info_max=0
-            score_info_min=0
-            
-            for k in range(0,len(self.liste_info)):
-                if y_info_bien[k]>score_info_max:
-                    score_info_max=y_info_bien[k]
-                    info_max=[k]
-                elif y_info_bien[k]==score_info_max:
-                    score_info_max=y_info_bien[k]
-                    info_max=info_max+[k]
-                if y_info_mauvais[k]>score_info_min:
-                    score_info_min=y_info_mauvais[k]
-                    info_min=[k]
-                elif y_info_mauvais[k]==score_info_min:
-                    score_info_min=y_info_mauvais[k]
-                    info_min=info_min+[k]
-            
-            #création de la figure
-            
-            fig, [ax1, ax2, ax3, ax4] = plt.subplots(4, 1, figsize=(10,30))
-            fig.suptitle('Visualisation de la simulation '+str(self.id_simulation), fontsize=16)
-            plt.figtext(0.1, 0.9, "Arret de la simulation au temps: "+str(self.temps)+"\nTemps maximal de la simulation: "+str(temps_max)+"\nIdentifiant du réseau hôte : "+str(self.reseau.id)+"\nInformation(s) ayant obtenu le plus de mentions 'bien': "+str(info_max)+" (score: "+str(score_info_max)+")\nInformation(s) ayant obtenu le plus de mentions 'mauvais': "+str(info_min)+" (score: "+str(score_info_min)+")", fontweight = 'bold')
-            
-            #graphe 1 : nombre d'informations actives/inactives en fonction du temps
-            barWidth1=0.4
-            x_tps=range(0,self.temps+1)
-            x_tps_2 = [x + barWidth1 for x in x_tps]
-            ax1.bar(x_tps, y_infos_actives_tps, width = barWidth1, color = ['blue' for i in y_infos_actives_tps], label='Informations actives')
-            ax1.bar(x_tps_2, y_infos_inactives_tps, width = barWidth1, color = ['orange' for i in y_infos_inactives_tps], label='Informations inactives')
-            ax1.legend()
-            ax1.set_xlabel('Temps')
-            ax1.set_ylabel("Nombre d'informations")
-            ax1.set_title("Nombre d'informations actives/inactives au cours du temps")
-            
-            #graphe 2 : nombre d'appréciations 'bien' et 'mauvais' en fonction du temps
-            barWidth2=0.4
-            ax2.bar(x_tps, y_infos_bien_tps, width = barWidth2, color = ['green' for i in y_infos_bien_tps], label='Bien')
-            ax2.bar(x_tps_2, y_infos_mauvais_tps, width = barWidth2, color = ['red' for i in y_infos_mauvais_tps], label='Mauvais')
-            ax2.legend()
-            ax2.set_xlabel('Temps')
-            ax2.set_ylabel("Nombre d'appréciations")
-            ax2.set_title("Nombre d'appréciation 'bien' et 'mauvais' au cours du temps")
-            
-            #graphe 3 : pour chaque entité : nb info passées, nb infos consultées, nb infos appréciées (bien ou mauvaises)
-            
-            barWidth3=0.2
-            x1=range(0,n)
-            x2 = [x + barWidth3 for x in x1]
-            x3 = [x + barWidth3 for x in x2]
-            x4 = [x + barWidth3 for x in x3]
-            
-            ax3.bar(x1, y_entite_infos_recu, width = barWidth3, color = ['blue' for i in y_entite_infos_recu], label='Informations reçues')
-            ax3.bar(x2, y_entite_infos_consultees, width = barWidth3, color = ['orange' for i in y_entite_infos_consultees], label='Informations consultées')
-            ax3.bar(x3, y_entite_infos_bien, width = barWidth3, color = ['green' for i in y_entite_infos_bien], label='Informations appréciées (bien)')
-            ax3.bar(x4, y_entite_infos_mauvais, width = barWidth3, color = ['red' for i in y_entite_infos_mauvais], label='Informations appréciées (mauvais)')
-            ax3.legend()
-            ax3.set_xlabel('Entités (id)')
-            ax3.set_ylabel("Nombre d'informations")
-            ax3.set_title("Traitement des informations par les entités")
-            
-            #graphe 4 : nombre d'appréciations (bien ou mauvaises) pour chaque information à la fin de la simulation 
-            
-            barWidth4=0.4
-            x_1=range(0,self.temps)
-            x_2=[x + barWidth4 for x in x_1]
-            
-            ax4.bar(x_1, y_info_bien, width = barWidth4, color = ['green' for i in y_info_bien], label='Bien')
-            ax4.bar(x_2, y_info_mauvais, width = barWidth4, color = ['red' for i in y_info_mauvais], label='Mauvais')
-            ax4.legend()
-            ax4.set_xlabel("Informations")
-            ax4.set_ylabel("Nombre d'appréciations")
-            ax4.set_title("Bilan des appréciations par information")
-            
-            plt.show()
+        Arguments : 
+            - dossier : facultatif, None par défaut (estimations gardées en mémoire seulement).
+            - capacite : facultatif, 4096 par défaut.
+        """
+        self.dossier=dossier
+        if dossier is not None:
+            os.makedirs(dossier,exist_ok=True)
+        self.capacite=capacite
+        self.nb_succes=0
+        self.nb_echecs=0
+        self._memoire=collections.OrderedDict()
+        self._empreintes=weakref.WeakKeyDictionary() # empreinte de chaque réseau, calculée une seule fois
+        
+    def _empreinte(self,r):
+        if r not in self._empreintes:
+            self._empreintes[r]=r.empreinte()
+        return self._empreintes[r]
+    
+    def _chemin(self,cle):
+        empreinte,temps_consultation,id_entite,nb_replicas,graine=cle
+        return os.path.join(self.dossier,empreinte,'%d_%d_%d_%d.npz'%(temps_consultation,id_entite,nb_replicas,graine))
+        
+    def _garde(self,cle,estimation):
+        self._memoire[cle]=estimation
+        self._memoire.move_to_end(cle)
+        while len(self._memoire)>self.capacite:
+            self._memoire.popitem(last=False)
+            
+    def _cherche(self,cle):
+        if cle in self._memoire:
+            self._memoire.move_to_end(cle)
+            return self._memoire[cle]
+        if self.dossier is not None and os.path.exists(self._chemin(cle)):
+            with np.load(self._chemin(cle)) as fichier:
+                estimation={nom:fichier[nom] for nom in fichier.files}
+            self._garde(cle,estimation)
+            return estimation
+        return None
+    
+    def _enregistre(self,cle,estimation):
+        self._garde(cle,estimation)
+        if self.dossier is not None:
+            chemin=self._chemin(cle)
+            os.makedirs(os.path.dirname(chemin),exist_ok=True)
+            with open(chemin+'.tmp','wb') as fichier:
+                np.savez(fichier,**estimation)
+            os.replace(chemin+'.tmp',chemin)
+            
+    def portees(self,r,id_entite,temps_consultation=3,nb_replicas=256,graine=0):
+        '''
+        Méthode qui renvoie l'estimation de la portée d'une information reçue au départ par l'entité id_entite du réseau r.
+        
+        Arguments : 
+            - r : (reseau), réseau.
+            - id_entite : (int), entité de départ.
+            - temps_consultation : facultatif, 3 par défaut.
+            - nb_replicas : facultatif, 256 par défaut, nombre de diffusions simulées.
+            - graine : facultatif, 0 par défaut.
+            
+        --> (dict), tableaux de taille nb_replicas (voir estime_portees).
+        '''
+        cle=(self._empreinte(r),temps_consultation,id_entite,nb_replicas,graine)
+        estimation=self._cherche(cle)
+        if estimation is not None:
+            self.nb_succes+=1
+            return estimation
+        self.nb_echecs+=1
+        p_connexion,p_consultation,p_appreciation=r.vecteurs_probabilites()
+        estimation=estime_portees((r.indptr,r.indices,p_connexion,p_consultation,p_appreciation,id_entite,temps_consultation,nb_replicas,graine))
+        self._enregistre(cle,estimation)
+        return estimation
+    
+    def resume(self,r,id_entite,temps_consultation=3,nb_replicas=256,graine=0,quantiles=(0.05,0.5,0.95)):
+        '''
+        Méthode qui résume l'estimation de la portée d'une information reçue au départ par l'entité id_entite (voir portees).
+        
+        --> (dict), pour chaque grandeur de estime_portees : {'moyenne','ecart_type','quantiles':[...]}.
+        '''
+        estimation=self.portees(r,id_entite,temps_consultation,nb_replicas,graine)
+        return {nom:{'moyenne':float(valeurs.mean()),'ecart_type':float(valeurs.std(ddof=1)) if len(valeurs)>1 else 0.,
+                     'quantiles':np.quantile(valeurs,quantiles).tolist()} for nom,valeurs in estimation.items()}
+    
+    def precalcule(self,r,temps_consultation=3,ids=None,nb_replicas=256,graine=0,nb_processus=1):
+        '''
+        Méthode qui calcule et enregistre les estimations manquantes pour les entités de départ ids (toutes les entités par défaut).
+        
+        Arguments : 
+            - r, temps_consultation, nb_replicas, graine : voir portees.
+            - ids : facultatif, None par défaut (toutes les entités).
+            - nb_processus : facultatif, 1 par défaut, nombre de processus (None : autant que de coeurs).
+            
+        --> (int), nombre d'estimations calculées.
+        '''
+        empreinte=self._empreinte(r)
+        ids=range(r.nb_entites) if ids is None else ids
+        manquantes=[id_entite for id_entite in ids if self._cherche((empreinte,temps_consultation,id_entite,nb_replicas,graine)) is None]
+        p_connexion,p_consultation,p_appreciation=r.vecteurs_probabilites()
+        taches=[(r.indptr,r.indices,p_connexion,p_consultation,p_appreciation,id_entite,temps_consultation,nb_replicas,graine) for id_entite in manquantes]
+        if nb_processus==1 or len(taches)<=1:
+            estimations=[estime_portees(tache) for tache in taches]
+        else:
+            nb_workers=nb_processus or os.cpu_count() or 1
+            taille_lot=-(-len(taches)//nb_workers)
+            with ProcessPoolExecutor(max_workers=nb_workers) as executeur:
+                lots=executeur.map(estime_portees_lot,[taches[debut:debut+taille_lot] for debut in range(0,len(taches),taille_lot)])
+                estimations=[estimation for lot in lots for estimation in lot]
+        for id_entite,estimation in zip(manquantes,estimations):
+            self._enregistre((empreinte,temps_consultation,id_entite,nb_replicas,graine),estimation)
+        return len(manquantes)
+
+
+def benchmark_destinataires(nb_entites=1000,part_destinataires=0.8,graine=0):
+    '''
+    Fonction qui mesure le coût d'un pas de propagation pour une information très diffusée, 
+    avant (liste des entités reconstruite puis parcourue à chaque test d'appartenance) 
+    et après (index destinataires de l'information, test en temps constant).
+    
+    Arguments : 
+        - nb_entites : facultatif, 1000 par défaut, nombre d'entités du réseau. 
+        - part_destinataires : facultatif, 0.8 par défaut, part des entités du réseau qui ont déjà reçu l'information.
+        - graine : facultatif, 0 par défaut, graine du réseau et de l'information.
+        
+    --> (dict), temps (en secondes) du pas avec chaque méthode et nombre de tests d'appartenance réalisés.
+    '''
+    r=reseau(1,nb_entites,espace=[nb_entites,nb_entites],generateur='degres',graine=graine)
+    alea=rd.Random(graine)
+    info=information(0,nb_entites,id_reseau=r.id)
+    info.ajoute_lignes(alea.sample(range(nb_entites),int(part_destinataires*nb_entites)))
+    
+    #avant : liste des entités reconstruite puis test d'appartenance par parcours de la liste
+    debut=time.perf_counter()
+    nb_tests=0
+    liste_entite_dans_information=[info_entite[1] for info_entite in info.liste_entites]
+    for info_entite in info.liste_entites:
+        id_entite=info_entite[1]
+        for id_connecte in r.indices[r.indptr[id_entite]:r.indptr[id_entite+1]].tolist():
+            nb_tests+=1
+            id_connecte in liste_entite_dans_information
+    temps_avant=time.perf_counter()-debut
+    
+    #après : index destinataires de l'information
+    debut=time.perf_counter()
+    for info_entite in info.liste_entites:
+        id_entite=info_entite[1]
+        for id_connecte in r.indices[r.indptr[id_entite]:r.indptr[id_entite+1]].tolist():
+            info.a_recu(id_connecte)
+    temps_apres=time.perf_counter()-debut
+    
+    return {'nb_tests':nb_tests,'temps_avant':temps_avant,'temps_apres':temps_apres}
+    
+
+def mesure(fonction,repetitions=3):
+    '''
+    Fonction qui mesure le temps d'exécution et le pic de mémoire d'une fonction sans argument. 
+    Le temps est mesuré sur repetitions appels, la mémoire lors d'un appel supplémentaire suivi par tracemalloc 
+    (qui ralentit l'exécution et fausserait les temps).
+    
+    Arguments : 
+        - fonction : (fonction), fonction à mesurer. Elle est appelée repetitions+1 fois.
+        - repetitions : facultatif, 3 par défaut, nombre d'appels chronométrés.
+        
+    --> (tuple : (mesures, resultat)), mesures est un dictionnaire : 'temps_min', 'temps_median' (en secondes), 
+    'pic_memoire' (en octets, mémoire allouée par Python et numpy) ; resultat est la valeur renvoyée par le dernier appel chronométré.
+    '''
+    temps=[]
+    for _ in range(repetitions):
+        debut=time.perf_counter()
+        resultat=fonction()
+        temps+=[time.perf_counter()-debut]
+    tracemalloc.start()
+    try:
+        fonction()
+        pic_memoire=tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'temps_min':min(temps),'temps_median':statistics.median(temps),'pic_memoire':pic_memoire},resultat
+
+
+CAS_BENCHMARK_RESEAU=[{'generateur':'degres'},{'generateur':'geometrique'},{'generateur':'spatial','portee':5},{'generateur':'spatial','portee':15}]
+
+def lance_benchmarks(chemin=None,tailles=(100,500,2000),cas_reseau=None,nb_pas=200,taille_fenetre=50,temps_max=150,
+                     moteurs=('python','numpy'),repetitions=3,graine=0):
+    '''
+    Fonction qui lance la suite de benchmarks, avec des graines fixées pour que deux lancements mesurent exactement le même travail : 
+        - 'reseau' : construction de reseau pour chaque taille et chaque cas de cas_reseau (générateur et densité des connexions).
+        - 'diametre' : calcul du diamètre pour chaque taille.
+        - 'avance' : coût d'un pas d'avance à mesure que liste_info grandit, par fenêtres de taille_fenetre pas, pour chaque moteur.
+        - 'simul_temps_max' : simulation complète sans visualisation, pour chaque taille et chaque moteur.
+    Les réseaux des mesures 'diametre', 'avance' et 'simul_temps_max' sont générés par le mode 'degres'.
+    
+    Arguments : 
+        - chemin : facultatif, None par défaut, fichier JSON où écrire les résultats.
+        - tailles : facultatif, (100,500,2000) par défaut, nombres d'entités des réseaux.
+        - cas_reseau : facultatif, CAS_BENCHMARK_RESEAU par défaut, liste de paramètres de reseau (generateur, portee, noyau).
+        - nb_pas : facultatif, 200 par défaut, nombre de pas de la mesure 'avance'.
+        - taille_fenetre : facultatif, 50 par défaut, nombre de pas par fenêtre de la mesure 'avance'.
+        - temps_max : facultatif, 150 par défaut, temps maximum des simulations 'simul_temps_max'.
+        - moteurs : facultatif, ('python','numpy') par défaut.
+        - repetitions : facultatif, 3 par défaut, nombre d'appels chronométrés par mesure (voir mesure).
+        - graine : facultatif, 0 par défaut, graine des réseaux et des simulations.
+        
+    --> (dict), {'contexte':{...},'resultats':{nom:mesures}}. Chaque nom identifie une mesure (par exemple 'simul_temps_max/numpy/n=500') 
+    et ses mesures contiennent au moins 'temps_min', 'temps_median' et 'pic_memoire'.
+    '''
+    if cas_reseau is None:
+        cas_reseau=CAS_BENCHMARK_RESEAU
+    resultats={}
+    
+    #construction des réseaux
+    for nb_entites in tailles:
+        for cas in cas_reseau:
+            nom='reseau/'+'/'.join(str(cle)+'='+str(valeur) for cle,valeur in sorted(cas.items()))+'/n='+str(nb_entites)
+            mesures,r=mesure(lambda:reseau(0,nb_entites,espace=[nb_entites,nb_entites],graine=graine,**cas),repetitions)
+            mesures['nb_connexions']=int(len(r.indices))
+            resultats[nom]=mesures
+            
+    #diamètre
+    for nb_entites in tailles:
+        r=reseau(0,nb_entites,espace=[nb_entites,nb_entites],generateur='degres',graine=graine)
+        mesures,_=mesure(lambda:r.diametre(),repetitions)
+        resultats['diametre/n='+str(nb_entites)]=mesures
+        
+    #coût d'un pas d'avance à mesure que liste_info grandit
+    nb_entites=tailles[0]
+    r=reseau(0,nb_entites,espace=[nb_entites,nb_entites],generateur='degres',graine=graine)
+    for moteur in moteurs:
+        def pas_successifs():
+            rd.seed(graine)
+            simu=simulation(0,r,temps_consultation=10,moteur=moteur,graine=graine)
+            fenetres=[]
+            for debut_fenetre in range(0,nb_pas,taille_fenetre):
+                debut=time.perf_counter()
+                for _ in range(min(taille_fenetre,nb_pas-debut_fenetre)):
+                    simu.avance()
+                fenetres+=[{'nb_infos':len(simu.liste_info),'temps_par_pas':(time.perf_counter()-debut)/min(taille_fenetre,nb_pas-debut_fenetre)}]
+            return fenetres
+        mesures,fenetres=mesure(pas_successifs,repetitions)
+        mesures['pas_par_seconde']=nb_pas/mesures['temps_min']
+        mesures['fenetres']=fenetres
+        resultats['avance/'+moteur+'/n='+str(nb_entites)]=mesures
+        
+    #simulations complètes sans visualisation
+    for nb_entites in tailles:
+        r=reseau(0,nb_entites,espace=[nb_entites,nb_entites],generateur='degres',graine=graine)
+        for moteur in moteurs:
+            def simulation_complete():
+                rd.seed(graine)
+                simu=simulation(0,r,temps_consultation=10,moteur=moteur,graine=graine)
+                simu.simul_temps_max(temps_max,affichage=False)
+                return simu.temps
+            mesures,nb_pas_simules=mesure(simulation_complete,repetitions)
+            mesures['nb_pas']=nb_pas_simules
+            mesures['pas_par_seconde']=nb_pas_simules/mesures['temps_min']
+            resultats['simul_temps_max/'+moteur+'/n='+str(nb_entites)]=mesures
+            
+    contexte={'date':time.strftime('%Y-%m-%dT%H:%M:%S'),'python':platform.python_version(),'numpy':np.__version__,
+              'machine':platform.machine(),'processeur':platform.processor(),'nb_coeurs':os.cpu_count(),'graine':graine,'repetitions':repetitions}
+    sortie={'contexte':contexte,'resultats':resultats}
+    if chemin is not None:
+        with open(chemin,'w') as fichier:
+            json.dump(sortie,fichier,indent=1)
+    return sortie
+
+
+def compare_benchmarks(chemin_reference,chemin_nouveau,seuil=0.1,affichage=True):
+    '''
+    Fonction qui compare deux fichiers de résultats écrits par lance_benchmarks, mesure par mesure. 
+    
+    Arguments : 
+        - chemin_reference : (string), résultats de référence.
+        - chemin_nouveau : (string), résultats à comparer.
+        - seuil : facultatif, 0.1 par défaut, variation relative au-delà de laquelle une mesure est signalée 
+        ('regression' si elle augmente, 'amelioration' si elle diminue). Une mesure nulle dans l'un des fichiers 
+        (par exemple un pic mémoire sous la résolution de tracemalloc) est 'non_comparable' (rapport None).
+        - affichage : facultatif, True par défaut, affichage ou non d'un tableau de la comparaison.
+        
+    --> (list), un dictionnaire par mesure présente dans les deux fichiers : 
+    {'nom','grandeur','reference','nouveau','rapport','verdict'}, pour les grandeurs 'temps_min' et 'pic_memoire'.
+    '''
+    with open(chemin_reference) as fichier:
+        reference=json.load(fichier)['resultats']
+    with open(chemin_nouveau) as fichier:
+        nouveau=json.load(fichier)['resultats']
+    comparaison=[]
+    for nom in reference:
+        if nom not in nouveau:
+            continue
+        for grandeur in ('temps_min','pic_memoire'):
+            valeur_reference,valeur_nouvelle=reference[nom][grandeur],nouveau[nom][grandeur]
+            rapport=valeur_nouvelle/valeur_reference if valeur_reference>0 and valeur_nouvelle>0 else None
+            if rapport is None:
+                verdict='non_comparable'
+            elif rapport>1+seuil:
+                verdict='regression'
+            elif rapport<1-seuil:
+                verdict='amelioration'
+            else:
+                verdict='stable'
+            comparaison+=[{'nom':nom,'grandeur':grandeur,'reference':valeur_reference,'nouveau':valeur_nouvelle,'rapport':rapport,'verdict':verdict}]
+    if affichage:
+        for ligne in comparaison:
+            rapport='%8.2fx'%ligne['rapport'] if ligne['rapport'] is not None else '%9s'%'-'
+            print('%-55s %-12s %12.4g %12.4g %s  %s'%(ligne['nom'],ligne['grandeur'],ligne['reference'],ligne['nouveau'],rapport,ligne['verdict']))
+    return comparaison
+    
 
 ''' 
 Tests manuels des fonctions 
 '''
 
-r=reseau(1)
-print('le reseau est :', r.entites)
-print('la distance entre les entites 4 et 6 du reseau est :', r.distance(4,6))
-print('le diametre du reseau est :', r.diametre())
-r.graphique()
-
-simu=simulation(1,r,temps_consultation=10)
-simu.simul_temps_max(150, visualisation=True)
-
-#Montre les caractéristiques de toutes les informations
-#for info_test in simu.liste_info:
-#    print('L info est la numéro: ',info_test.id_information)
-#    print('elle a passé ', info_test.temps_dans_reseau,' pas de temps dans le réseau')
-#    print('elle est ', info_test.statut_global)
-#    print('Elle s est propagée à ', len(info_test.liste_entites), 'entités')
-#    print('Elle a été consultée par :', info_test.nb_entites, 'entités')
-#    print('la liste des entités ou l info s est propagee est la suivante:' )
-#    for entity in info_test.liste_entites:
-#        print(entity)
-
-#Montre les caractéristiques des informations inactives
-#for info_test in simu.liste_info:
-#    if info_test.statut_global=='inactive':
-#        print('L info est la numéro: ',info_test.id_information)
-#        print('elle a passé ', info_test.temps_dans_reseau,' pas de temps dans le réseau')
-#        print('elle est ', info_test.statut_global)
-#        print('Elle s est propagée à ', len(info_test.liste_entites), 'entités')
-#        print('Elle a été consultée par :', info_test.nb_entites, 'entités')
-#        print('la liste des entités ou l info s est propagee est la suivante:' )
-#        for entity in info_test.liste_entites:
-#            print(entity)
-
-#test pour verifier le critere d'arret de simul_temps_max
-cpt_info,cpt_info_inactive=0,0
-for info_test in simu.liste_info:
-    cpt_info+=1
-    if info_test.statut_global=='inactive':
-        cpt_info_inactive+=1
-print('Il y a ', cpt_info, ' informations dans la simulation')
-print('Il y a ', cpt_info_inactive, ' informations inactives dans la simulation')
+def demo(nb_entites=10,temps_consultation=10,temps_max=150,moteur='python',graine=None,dossier_figures=None,graphiques=True):
+    '''
+    Fonction qui lance les tests manuels des fonctions : construction et représentation d'un réseau, puis simulation avec visualisation.
+    
+    Arguments : 
+        - nb_entites : facultatif, 10 par défaut, nombre d'entités du réseau.
+        - temps_consultation : facultatif, 10 par défaut.
+        - temps_max : facultatif, 150 par défaut, temps maximum de la simulation.
+        - moteur : facultatif, 'python' par défaut.
+        - graine : facultatif, None par défaut, graine du réseau et de la simulation.
+        - dossier_figures : facultatif, None par défaut (figures affichées dans des fenêtres). 
+        Dossier où enregistrer les figures (reseau.png et simulation.png), sans fenêtre.
+        - graphiques : facultatif, True par défaut. Si False, aucune figure n'est tracée (matplotlib n'est pas chargé).
+        
+    --> (simulation), simulation réalisée.
+    '''
+    fichier_reseau,fichier_simulation=None,None
+    if dossier_figures is not None:
+        os.makedirs(dossier_figures,exist_ok=True)
+        fichier_reseau=os.path.join(dossier_figures,'reseau.png')
+        fichier_simulation=os.path.join(dossier_figures,'simulation.png')
+    if graine is not None:
+        rd.seed(graine)
+        
+    r=reseau(1,nb_entites,graine=graine)
+    print('le reseau est :', r.entites)
+    print('la distance entre les entites 4 et 6 du reseau est :', r.distance(4,6))
+    print('le diametre du reseau est :', r.diametre())
+    if graphiques:
+        r.graphique(fichier_reseau)
+    
+    simu=simulation(1,r,temps_consultation=temps_consultation,moteur=moteur,graine=graine)
+    simu.simul_temps_max(temps_max, visualisation=graphiques, fichier_figure=fichier_simulation)
+    
+    #Montre les caractéristiques de toutes les informations
+    #for info_test in simu.liste_info:
+    #    print('L info est la numéro: ',info_test.id_information)
+    #    print('elle a passé ', info_test.temps_dans_reseau,' pas de temps dans le réseau')
+    #    print('elle est ', info_test.statut_global)
+    #    print('Elle s est propagée à ', len(info_test.liste_entites), 'entités')
+    #    print('Elle a été consultée par :', info_test.nb_entites, 'entités')
+    #    print('la liste des entités ou l info s est propagee est la suivante:' )
+    #    for entity in info_test.liste_entites:
+    #        print(entity)
+
+    #Montre les caractéristiques des informations inactives
+    #for info_test in simu.liste_info:
+    #    if info_test.statut_global=='inactive':
+    #        print('L info est la numéro: ',info_test.id_information)
+    #        print('elle a passé ', info_test.temps_dans_reseau,' pas de temps dans le réseau')
+    #        print('elle est ', info_test.statut_global)
+    #        print('Elle s est propagée à ', len(info_test.liste_entites), 'entités')
+    #        print('Elle a été consultée par :', info_test.nb_entites, 'entités')
+    #        print('la liste des entités ou l info s est propagee est la suivante:' )
+    #        for entity in info_test.liste_entites:
+    #            print(entity)
+
+    #Coût d'un pas de propagation pour une information très diffusée, avant et après l'index des destinataires
+    #print(benchmark_destinataires())
+    #lance_benchmarks('benchmarks.json')
+    #p=profileur(); simulation(2,r,temps_consultation=10,profileur=p).simul_temps_max(150,affichage=False); p.affiche_resume(); p.exporte_chrome('profil.json')
+    #compare_benchmarks('benchmarks_reference.json','benchmarks.json')
+    
+    #Portée attendue d'une information partant de l'entité 0 (estimation mise en cache)
+    #print(cache_portees('cache_portees').resume(r,0,temps_consultation=temps_consultation))
+    
+    #Effet du temps de consultation sur la portée des informations, à nombres aléatoires communs
+    #print(lance_balayage(r,'temps_consultation',[2,5,10,20],nb_replicas=16)['statistiques']['portee_moyenne'])
+    
+    #Simulation pilotée en direct : informations soumises à l'entité 0 tous les 5 pas, métriques suivies à chaque pas
+    #flux=flux_simulation(simulation(3,r,temps_consultation=temps_consultation,creation_aleatoire=False))
+    #async def suivi():
+    #    async for delta in flux.abonne(politique='ecrase'):
+    #        print(delta['temps'],delta['metriques'])
+    #async def pilotage():
+    #    for t in range(0,50,5):
+    #        await flux.soumet(0,t)
+    #    flux.ferme_soumissions()
+    #    await asyncio.gather(flux.execute(),suivi())
+    #asyncio.run(pilotage())
+
+    #test pour verifier le critere d'arret de simul_temps_max
+    cpt_info,cpt_info_inactive=0,0
+    for info_test in simu.liste_info:
+        cpt_info+=1
+        if info_test.statut_global=='inactive':
+            cpt_info_inactive+=1
+    print('Il y a ', cpt_info, ' informations dans la simulation')
+    print('Il y a ', cpt_info_inactive, ' informations inactives dans la simulation')
+    return simu
+
+
+def main(arguments=None):
+    '''
+    Point d'entrée en ligne de commande. Sans sous-commande, l'aide est affichée (code de retour 2). Sous-commandes : 
+        - demo : tests manuels (voir demo). Options --sans-graphique et --dossier-figures pour un lancement sans fenêtre.
+        - benchmark : suite de benchmarks (voir lance_benchmarks), résultats écrits dans un fichier JSON.
+        - compare : comparaison de deux fichiers de benchmarks (voir compare_benchmarks).
         
+    Argument : 
+        - arguments : facultatif, None par défaut (arguments de la ligne de commande, sys.argv[1:]).
+    '''
+    analyseur=argparse.ArgumentParser(description='Simulation de dynamiques de réseaux')
+    sous_commandes=analyseur.add_subparsers(dest='commande')
+    
+    analyseur_demo=sous_commandes.add_parser('demo',help='tests manuels : réseau et simulation avec visualisation')
+    analyseur_demo.add_argument('--nb-entites',type=int,default=10)
+    analyseur_demo.add_argument('--temps-consultation',type=int,default=10)
+    analyseur_demo.add_argument('--temps-max',type=int,default=150)
+    analyseur_demo.add_argument('--moteur',choices=('python','numpy','evenements'),default='python')
+    analyseur_demo.add_argument('--graine',type=int,default=None)
+    analyseur_demo.add_argument('--dossier-figures',default=None,help='enregistre les figures dans ce dossier, sans fenêtre')
+    analyseur_demo.add_argument('--sans-graphique',action='store_true',help='aucune figure')
+    
+    analyseur_benchmark=sous_commandes.add_parser('benchmark',help='suite de benchmarks')
+    analyseur_benchmark.add_argument('sortie',help='fichier JSON des résultats')
+    analyseur_benchmark.add_argument('--tailles',type=int,nargs='+',default=[100,500,2000])
+    analyseur_benchmark.add_argument('--repetitions',type=int,default=3)
+    analyseur_benchmark.add_argument('--graine',type=int,default=0)
+    
+    analyseur_compare=sous_commandes.add_parser('compare',help='comparaison de deux fichiers de benchmarks')
+    analyseur_compare.add_argument('reference')
+    analyseur_compare.add_argument('nouveau')
+    analyseur_compare.add_argument('--seuil',type=float,default=0.1)
+    
+    options=analyseur.parse_args(arguments)
+    if options.commande=='benchmark':
+        lance_benchmarks(options.sortie,tailles=tuple(options.tailles),repetitions=options.repetitions,graine=options.graine)
+    elif options.commande=='compare':
+        comparaison=compare_benchmarks(options.reference,options.nouveau,seuil=options.seuil)
+        return 1 if any(ligne['verdict']=='regression' for ligne in comparaison) else 0
+    elif options.commande=='demo':
+        demo(options.nb_entites,options.temps_consultation,options.temps_max,options.moteur,options.graine,
+             options.dossier_figures,not options.sans_graphique)
+    else:
+        analyseur.print_help()
+        return 2
+    return 0
+
+
+if __name__=='__main__':
+    sys.exit(main())
@@ -0,0 +1,576 @@
+'''
+Tests automatiques de DM2_Elsa_Kevin_Pauline_v9, à lancer depuis la racine du dépôt : python -m pytest -q tests
+
+Petits réseaux et graines fixées. Les garanties exactes annoncées par le module (reprise, partitions, traces...)
+sont vérifiées à l'identique ; les moteurs qui ne tirent pas les mêmes nombres aléatoires sont comparés
+en moyenne sur plusieurs runs (écart réduit borné).
+'''
+import os
+import subprocess
+import sys
+import random as rd
+
+import numpy as np
+import pytest
+
+os.environ.setdefault('MPLBACKEND','Agg')
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import DM2_Elsa_Kevin_Pauline_v9 as dm2
+
+
+def bilan_runs(r,moteur,nb_runs,temps_max=30,temps_consultation=4):
+    '''
+    Fonction qui lance nb_runs simulations de graines 0..nb_runs-1 et renvoie, pour chacune, les totaux du collecteur
+    (entités atteintes, consultations, expirations, appréciations 'bien', informations inactives).
+    '''
+    bilans=[]
+    for graine in range(nb_runs):
+        simu=dm2.simulation(0,r,temps_consultation=temps_consultation,moteur=moteur,graine=graine,collecteur=dm2.collecteur_metriques(r.nb_entites))
+        for _ in range(temps_max):
+            simu.avance()
+        c=simu.collecteur
+        bilans+=[[c.recues.sum(),c.nb_consultations,c.nb_expirations,c.nb_bien,c.nb_inactives]]
+    return np.array(bilans,dtype=float)
+
+
+def ecart_reduit(a,b):
+    '''
+    Fonction qui renvoie, pour chaque colonne, l'écart entre les moyennes de a et b rapporté à son écart-type.
+    '''
+    return np.abs(a.mean(0)-b.mean(0))/np.sqrt(a.var(0)/len(a)+b.var(0)/len(b))
+
+
+def test_moteurs_python_numpy_meme_loi():
+    r=dm2.reseau(0,nb_entites=80,graine=3)
+    assert ecart_reduit(bilan_runs(r,'python',60),bilan_runs(r,'numpy',60)).max()<4
+    
+    
+@pytest.mark.parametrize('temps_consultation',[1,4])
+def test_moteurs_numpy_evenements_meme_loi(temps_consultation):
+    r=dm2.reseau(0,nb_entites=80,graine=3)
+    bilans=[bilan_runs(r,moteur,60,temps_consultation=temps_consultation) for moteur in ('numpy','evenements')]
+    assert ecart_reduit(*bilans).max()<4
+
+
+def degres_reseaux(generateur,nb_reseaux=20,nb_entites=60):
+    '''
+    Fonction qui construit nb_reseaux réseaux de graines 0..nb_reseaux-1 et renvoie les degrés sortants et entrants de toutes leurs entités.
+    '''
+    sortants,entrants=[],[]
+    for graine in range(nb_reseaux):
+        r=dm2.reseau(0,nb_entites=nb_entites,espace=[nb_entites,nb_entites],generateur=generateur,graine=graine)
+        lignes=np.repeat(np.arange(nb_entites),np.diff(r.indptr))
+        assert not np.any(r.indices==lignes) # pas de connexion d'une entité à elle-même
+        assert np.all((np.diff(r.indices)>0)|(np.diff(lignes)>0)) # connexions triées et sans doublon dans chaque ligne
+        sortants+=[np.diff(r.indptr)]
+        entrants+=[np.bincount(r.indices,minlength=nb_entites)]
+    return np.concatenate(sortants),np.concatenate(entrants)
+
+
+def khi2_histogrammes(a,b,bornes):
+    '''
+    Fonction qui renvoie la statistique du khi² d'homogénéité de deux échantillons de même taille, regroupés selon bornes.
+    '''
+    ha,hb=np.histogram(a,bornes)[0],np.histogram(b,bornes)[0]
+    return (((ha-hb)**2)/np.maximum(ha+hb,1)).sum()
+
+
+@pytest.mark.parametrize('generateur',['degres','geometrique'])
+def test_generateurs_meme_loi_que_paires(generateur):
+    #à graine égale les entités (donc p_connexion) sont les mêmes : seul le tirage des connexions diffère
+    sortants_paires,entrants_paires=degres_reseaux('paires')
+    sortants,entrants=degres_reseaux(generateur)
+    ecart=abs(sortants.mean()-sortants_paires.mean())/np.sqrt((sortants.var()+sortants_paires.var())/len(sortants))
+    assert ecart<4
+    bornes=[0,10,20,30,40,50,60]
+    assert khi2_histogrammes(sortants,sortants_paires,bornes)<20.5 # quantile 0.999 du khi² à 5 degrés de liberté
+    assert khi2_histogrammes(entrants,entrants_paires,bornes)<20.5
+
+
+@pytest.mark.parametrize('generateur',['paires','degres','geometrique'])
+def test_generateurs_denses_bornes(generateur):
+    with pytest.raises(ValueError):
+        dm2.reseau(0,nb_entites=20000,espace=[200,200],generateur=generateur,graine=1)
+
+
+def test_connexions_entite_du_reseau_non_reaffectables():
+    isolee=dm2.entite(0,alea=rd.Random(0))
+    isolee.connexions=[1,2]
+    assert isolee.connexions==[1,2]
+    r=dm2.reseau(0,nb_entites=8,graine=1)
+    voisins=[voisin.id_entite for voisin in r.entites[0].connexions]
+    assert voisins==r.indices[r.indptr[0]:r.indptr[1]].tolist()
+    with pytest.raises(ValueError):
+        r.entites[0].connexions=[]
+        
+
+def totaux_recalcules(simu):
+    '''
+    Fonction qui recalcule, en parcourant toutes les lignes de toutes les informations, les totaux tenus par collecteur_metriques.
+    '''
+    n=simu.reseau.nb_entites
+    totaux={nom:np.zeros(n,dtype=np.int64) for nom in ('recues','consultees','bien','mauvais')}
+    for info in simu.liste_info:
+        np.add.at(totaux['recues'],info.ids_entites,1)
+        np.add.at(totaux['consultees'],info.ids_entites,info.statuts==dm2.CONSULTEE)
+        np.add.at(totaux['bien'],info.ids_entites,info.appreciations==dm2.BIEN)
+        np.add.at(totaux['mauvais'],info.ids_entites,info.appreciations==dm2.MAUVAIS)
+    return totaux
+
+
+def statistiques_lot(resultats):
+    '''
+    Fonction qui met bout à bout les paramètres et les statistiques d'un lot de lance_monte_carlo.
+    '''
+    parametres=[resultat['parametres'] for resultat in resultats]
+    valeurs=[[stats['moyenne'],stats['ecart_type']]+stats['ic'] for resultat in resultats for stats in resultat['statistiques'].values()]
+    return parametres,np.array(valeurs)
+
+
+def test_monte_carlo_reproductible_quel_que_soit_nb_processus():
+    grille={'moteur':['python','numpy'],'nb_entites':[40],'temps_consultation':[2,5],'temps_max':[15]}
+    etat_random=rd.getstate()
+    lots=[statistiques_lot(dm2.lance_monte_carlo(grille,nb_replicas=3,graine=8,nb_processus=nb_processus)) for nb_processus in (1,2,1)]
+    assert rd.getstate()==etat_random
+    for parametres,valeurs in lots[1:]:
+        assert parametres==lots[0][0]
+        assert np.array_equal(valeurs,lots[0][1],equal_nan=True)
+    #une autre graine donne un autre lot
+    _,autres=statistiques_lot(dm2.lance_monte_carlo(grille,nb_replicas=3,graine=9,nb_processus=1))
+    assert not np.array_equal(autres,lots[0][1],equal_nan=True)
+
+
+@pytest.mark.parametrize('moteur',['python','numpy','evenements'])
+def test_collecteur_egal_au_recalcul(moteur):
+    r=dm2.reseau(1,nb_entites=50,graine=2)
+    simu=dm2.simulation(1,r,temps_consultation=4,moteur=moteur,graine=1,creation_aleatoire=False)
+    for temps in range(0,20,2):
+        simu.injecte((7*temps)%50,temps)
+    for _ in range(5):
+        simu.avance()
+    simu.attache_collecteur(dm2.collecteur_metriques(50,capacite=2)) # en cours de simulation
+    simu.simul_temps_max(200,affichage=False)
+    #toutes les informations sont inactives : les colonnes de chaque moteur sont définitives
+    assert len(simu.infos_actives)==0
+    totaux=simu.collecteur.totaux_entites()
+    for nom,valeurs in totaux_recalcules(simu).items():
+        assert np.array_equal(totaux[nom],valeurs)
+    series=simu.collecteur.series()
+    assert series['temps'][-1]==simu.temps and len(series['temps'])==simu.temps-5+1
+    assert series['inactives'][-1]==len(simu.liste_info)==10
+    assert series['bien'][-1]==totaux['bien'].sum()
+
+
+@pytest.mark.parametrize('format',['npy','parquet'])
+@pytest.mark.parametrize('moteur',['python','numpy','evenements'])
+def test_trace_rejouee_egale_au_collecteur(tmp_path,moteur,format):
+    if format=='parquet':
+        pytest.importorskip('pyarrow')
+    r=dm2.reseau(1,nb_entites=60,graine=2)
+    ecrivain=dm2.ecrivain_trace(str(tmp_path/'trace'),60,intervalle=7,taille_tampon=500,format=format)
+    simu=dm2.simulation(4,r,temps_consultation=4,moteur=moteur,graine=1,collecteur=ecrivain,garde_inactives=False)
+    simu.simul_temps_max(40,affichage=False)
+    ecrivain.ferme()
+    rejoue=dm2.lecteur_trace(str(tmp_path/'trace')).rejoue()
+    for lecture in ('series','totaux_entites','totaux_informations'):
+        attendu,obtenu=getattr(ecrivain,lecture)(),getattr(rejoue,lecture)()
+        assert attendu.keys()==obtenu.keys()
+        for nom in attendu:
+            assert np.array_equal(attendu[nom],obtenu[nom])
+
+
+def etat_simulation(simu):
+    '''
+    Fonction qui renvoie l'état observable d'une simulation : colonnes de chaque information, files, séries et totaux du collecteur.
+    '''
+    etat=[simu.temps,[info.id_information for info in simu.infos_actives],[info.id_information for info in simu.archive]]
+    for info in simu.liste_info:
+        etat+=[(info.id_information,info.statut_global,info.nb_entites,info.temps_dans_reseau,info.frontiere.tolist(),
+                info.ids_entites.tolist(),info.statuts.tolist(),info.tps_consultabilite.tolist(),info.appreciations.tolist())]
+    collecteur=simu.collecteur
+    for lecture in (collecteur.series(),collecteur.totaux_entites(),collecteur.totaux_informations()):
+        etat+=[{nom:valeurs.tolist() for nom,valeurs in lecture.items()}]
+    return etat
+
+
+@pytest.mark.parametrize('garde_inactives',[True,False])
+@pytest.mark.parametrize('moteur',['python','numpy','evenements'])
+def test_reprise_identique(tmp_path,moteur,garde_inactives):
+    chemin=str(tmp_path/'simulation.ckpt')
+    simus=[]
+    for reprise in (False,True):
+        r=dm2.reseau(1,nb_entites=70,graine=4)
+        simu=dm2.simulation(1,r,temps_consultation=6,moteur=moteur,graine=2,collecteur=dm2.collecteur_metriques(70),garde_inactives=garde_inactives)
+        if reprise:
+            simu.simul_temps_max(15,affichage=False,chemin_checkpoint=chemin,intervalle_checkpoint=5)
+            rd.seed(123)
+            etat_random=rd.getstate()
+            simu=dm2.simulation.resume(chemin)
+            assert simu.temps==15
+            #la reprise restaure le générateur de la simulation sans toucher au module random
+            assert rd.getstate()==etat_random
+            rd.random()
+        while simu.temps<40:
+            simu.avance()
+        simus+=[simu]
+    assert etat_simulation(simus[0])==etat_simulation(simus[1])
+
+
+def test_liste_entites_aller_retour():
+    simus=[]
+    for reaffecte in (False,True):
+        r=dm2.reseau(1,nb_entites=60,graine=3)
+        simu=dm2.simulation(1,r,temps_consultation=4,moteur='python',graine=5,collecteur=dm2.collecteur_metriques(60))
+        for _ in range(10):
+            simu.avance()
+        if reaffecte:
+            for info in simu.liste_info:
+                colonnes=[info.ids_entites.copy(),info.statuts.copy(),info.tps_consultabilite.copy(),info.appreciations.copy()]
+                destinataires=None if info.destinataires is None else bytes(info.destinataires)
+                liste=info.liste_entites
+                info.liste_entites=liste
+                assert info.liste_entites==liste
+                for avant,apres in zip(colonnes,(info.ids_entites,info.statuts,info.tps_consultabilite,info.appreciations)):
+                    assert np.array_equal(avant,apres)
+                if destinataires is not None:
+                    assert bytes(info.destinataires)==destinataires
+                    assert all(info.a_recu(id_entite) for id_entite in info.ids_entites.tolist())
+        #la suite de la simulation ne voit pas la réaffectation
+        for _ in range(15):
+            simu.avance()
+        simus+=[simu]
+    assert etat_simulation(simus[0])==etat_simulation(simus[1])
+
+
+PHASES_MOTEURS={'python':['creation','voisins','appartenance','tirages','ecriture','inactivation','collecteur'],
+                'numpy':['creation','tirages','voisins','appartenance','propagation','mise_a_jour','inactivation','collecteur'],
+                'evenements':['creation','fins','appreciations','receptions','inactivation','collecteur']}
+
+
+@pytest.mark.parametrize('moteur',['python','numpy','evenements'])
+def test_profileur_phases_et_trace_chrome(tmp_path,moteur):
+    r=dm2.reseau(0,nb_entites=80,graine=3)
+    profil=dm2.profileur()
+    simu=dm2.simulation(0,r,temps_consultation=4,moteur=moteur,graine=1,collecteur=dm2.collecteur_metriques(80),profileur=profil)
+    for _ in range(8):
+        simu.avance()
+    #sans aucune ligne à traiter, les phases de fin de pas sont toujours mesurées
+    vide=dm2.profileur()
+    simu_vide=dm2.simulation(0,r,moteur=moteur,graine=1,collecteur=dm2.collecteur_metriques(80),profileur=vide,creation_aleatoire=False)
+    simu_vide.avance()
+    
+    assert [releve['temps'] for releve in profil.releves]==list(range(1,9))
+    for releve in profil.releves:
+        assert list(releve['phases'])==PHASES_MOTEURS[moteur]
+        assert all(duree>=0 for duree in releve['phases'].values())
+        assert 0<=sum(releve['phases'].values())<=releve['duree']
+    assert {'inactivation','collecteur'}<=set(vide.releves[0]['phases'])
+    resume=profil.resume()
+    assert resume['nb_pas']==8 and list(resume['phases'])==PHASES_MOTEURS[moteur]
+    assert resume['compteurs']['infos']>0
+    
+    chemin=str(tmp_path/'trace.json')
+    profil.exporte_chrome(chemin)
+    with open(chemin) as fichier:
+        trace=dm2.json.load(fichier)
+    evenements=trace['traceEvents']
+    assert sum(evenement['name']=='pas' for evenement in evenements)==8
+    assert sum(evenement['ph']=='C' for evenement in evenements)==8
+    for evenement in evenements:
+        assert evenement['ts']>=0 and evenement.get('dur',0)>=0 and evenement['ph'] in ('X','C')
+
+
+def distances_naives(r):
+    '''
+    Fonction qui calcule la matrice des distances en sauts (-1 si inatteignable) par un parcours en largeur depuis chaque entité, 
+    avec les connexions lues une à une.
+    '''
+    distances=np.full((r.nb_entites,r.nb_entites),-1,dtype=np.int64)
+    for source in range(r.nb_entites):
+        distances[source,source]=0
+        file=[source]
+        for entite in file:
+            for voisin in r.indices[r.indptr[entite]:r.indptr[entite+1]].tolist():
+                if distances[source,voisin]<0:
+                    distances[source,voisin]=distances[source,entite]+1
+                    file+=[voisin]
+    return distances
+
+
+@pytest.mark.parametrize('nb_entites,generateur,espace',[(60,'spatial',[40,40]),(150,'degres',[150,150]),(120,'geometrique',[120,120]),(7,'degres',[5,5])])
+def test_metriques_graphe_egales_au_calcul_naif(nb_entites,generateur,espace):
+    r=dm2.reseau(1,nb_entites=nb_entites,espace=espace,generateur=generateur,graine=3,portee=4)
+    distances=distances_naives(r)
+    for source in range(nb_entites):
+        assert np.array_equal(r.distances_sauts(source),distances[source])
+    excentricites=r.excentricites()
+    assert np.array_equal(excentricites['excentricite'],distances.max(1))
+    assert np.array_equal(excentricites['nb_atteintes'],(distances>=0).sum(1))
+    assert np.array_equal(excentricites['somme_distances'],np.where(distances>0,distances,0).sum(1))
+    assert np.array_equal(r.excentricites(inverse=True)['excentricite'],distances.max(0))
+    assert r.diametre()==distances.max()
+    assert r.diametre(strict=True)==(float('inf') if (distances<0).any() else distances.max())
+    atteignables=distances>=0
+    composantes=r.composantes_fortement_connexes()
+    assert np.array_equal(composantes[:,None]==composantes[None,:],atteignables&atteignables.T)
+    
+    
+def test_excentricites_chaine():
+    #réseau en anneau orienté : un parcours par niveau, n-1 niveaux
+    n=3000
+    indptr=np.arange(n+1,dtype=np.int64)
+    indices=((np.arange(n)+1)%n).astype(np.int32)
+    excentricites=dm2.excentricites_lot((indptr,indices,np.arange(100)))
+    assert np.all(excentricites['excentricite']==n-1)
+    assert np.all(excentricites['nb_atteintes']==n)
+    assert np.all(excentricites['somme_distances']==n*(n-1)//2)
+    
+    
+def test_index_spatial_egal_au_calcul_naif():
+    r=dm2.reseau(1,nb_entites=200,espace=[60,60],generateur='spatial',graine=3)
+    index=r.index_spatial()
+    positions=r.positions()
+    rng=np.random.default_rng(0)
+    for _ in range(50):
+        point=rng.uniform(-5,65,2)
+        rayon=rng.uniform(0,20)
+        distances=np.sqrt(((positions-point)**2).sum(1))
+        assert set(index.dans_rayon(point,rayon).tolist())==set(np.flatnonzero(distances<=rayon).tolist())
+        k=int(rng.integers(1,10))
+        assert np.allclose(np.sort(distances[index.plus_proches(point,k)]),np.sort(distances)[:k])
+
+
+def test_cache_portees_egal_au_calcul_direct(tmp_path):
+    r=dm2.reseau(1,nb_entites=60,espace=[30,30],generateur='spatial',portee=6,graine=5)
+    taches=[(r.indptr,r.indices,*r.vecteurs_probabilites(),id_entite,4,64,0) for id_entite in range(6)]
+    directes=[dm2.estime_portees(tache) for tache in taches]
+    cache=dm2.cache_portees(str(tmp_path/'cache'),capacite=2)
+    assert cache.precalcule(r,4,ids=range(6),nb_replicas=64,nb_processus=2)==6
+    relu=dm2.cache_portees(str(tmp_path/'cache'))
+    for id_entite,directe in enumerate(directes):
+        for estimation in (cache.portees(r,id_entite,4,64),relu.portees(r,id_entite,4,64)):
+            assert estimation.keys()==directe.keys()
+            assert all(np.array_equal(estimation[nom],directe[nom]) for nom in directe)
+    assert relu.nb_succes==6 and relu.nb_echecs==0
+
+
+def resultats_partitionnes(partitions,nb_processus):
+    '''
+    Fonction qui simule deux réseaux reliés, découpés selon partitions, et renvoie les résultats de simulation_partitionnee.
+    '''
+    r1=dm2.reseau(1,nb_entites=80,espace=[40,40],generateur='spatial',portee=6,graine=1)
+    r2=dm2.reseau(2,nb_entites=50,espace=[30,30],generateur='degres',graine=2)
+    liens=[(0,3,1,4),(1,7,0,10),(0,20,1,0),(1,1,0,1)]
+    with dm2.simulation_partitionnee(1,[r1,r2],liens,temps_consultation=5,graine=7,partitions=partitions,nb_processus=nb_processus) as simu:
+        simu.simul_temps_max(60,affichage=False)
+        return simu.resultats()
+
+
+def test_partitions_sans_effet_sur_les_resultats():
+    reference=resultats_partitionnes(1,0)
+    assert reference['entites']['recues'][80:].sum()>0 # les informations passent d'un réseau à l'autre
+    for partitions,nb_processus in ((None,0),(4,0),(np.random.default_rng(0).integers(0,3,130),0),(4,2)):
+        resultats=resultats_partitionnes(partitions,nb_processus)
+        for groupe in reference:
+            for nom in reference[groupe]:
+                assert np.array_equal(reference[groupe][nom],resultats[groupe][nom])
+
+
+def test_partitions_memoire_locale():
+    r=dm2.reseau(1,nb_entites=400,espace=[100,100],generateur='spatial',portee=4,graine=1)
+    with dm2.simulation_partitionnee(1,r,graine=1,partitions=8,nb_processus=0) as simu:
+        simu.simul_temps_max(20,affichage=False)
+        for partition in simu._partitions:
+            taille_locale=len(partition.entites)+len(partition.indices)
+            for valeur in vars(partition).values():
+                if isinstance(valeur,np.ndarray):
+                    assert len(valeur)<=taille_locale+1
+            for info in partition.infos.values():
+                assert info.destinataires is None or len(info.destinataires)<=len(partition.entites)
+
+
+def test_partitions_nb_processus():
+    r=dm2.reseau(1,nb_entites=40,graine=1)
+    with dm2.simulation_partitionnee(1,r,graine=1,partitions=4,nb_processus=2) as simu:
+        assert len(simu._processus)==2
+        processus=simu._processus
+    assert not any(p.is_alive() for p in processus)
+    with pytest.raises(ValueError):
+        dm2.simulation_partitionnee(1,r,partitions=2,nb_processus=-1)
+
+
+@pytest.mark.parametrize('rendu,max_aretes',[('aretes',100000),('auto',100000),('echantillon',50)])
+def test_graphique_reseau_segments(tmp_path,rendu,max_aretes):
+    pytest.importorskip('matplotlib')
+    from matplotlib.collections import LineCollection
+    r=dm2.reseau(0,nb_entites=40,graine=6)
+    r.graphique(fichier=str(tmp_path/'reseau.png'),rendu=rendu,max_aretes=max_aretes)
+    assert os.path.getsize(str(tmp_path/'reseau.png'))>0
+    collections=[collection for collection in r.figure.axes[0].collections if isinstance(collection,LineCollection)]
+    assert len(collections)==1
+    segments=collections[0].get_segments()
+    assert len(segments)==min(len(r.indices),max_aretes)
+    if rendu!='echantillon':
+        #segment k : de l'entité origine de la connexion k vers l'entité indices[k]
+        positions=np.array([entite.position for entite in r.entites],dtype=np.float64)
+        origines=np.repeat(np.arange(r.nb_entites),np.diff(r.indptr))
+        assert np.array_equal(np.array(segments),np.stack((positions[origines],positions[r.indices]),axis=1))
+
+
+def test_graphique_reseau_densite(tmp_path):
+    pytest.importorskip('matplotlib')
+    from matplotlib.collections import LineCollection
+    r=dm2.reseau(0,nb_entites=40,graine=6)
+    r.graphique(fichier=str(tmp_path/'reseau.png'),max_aretes=10)
+    axes=r.figure.axes[0]
+    assert len(axes.images)==1
+    assert not any(isinstance(collection,LineCollection) for collection in axes.collections)
+
+
+def test_figure_simulation_artistes(tmp_path,monkeypatch):
+    pytest.importorskip('matplotlib')
+    figures=[]
+    montre_figure=dm2.montre_figure
+    def garde_figure(plt,figure,fichier=None):
+        figures.append(figure)
+        montre_figure(plt,figure,fichier)
+    monkeypatch.setattr(dm2,'montre_figure',garde_figure)
+    nb_entites=dm2.SEUIL_BARRES+10
+    r=dm2.reseau(0,nb_entites=nb_entites,generateur='degres',graine=6)
+    simu=dm2.simulation(0,r,temps_consultation=3,moteur='numpy',graine=1,collecteur=dm2.collecteur_metriques(nb_entites))
+    simu.simul_temps_max(10,affichage=False)
+    dm2.figure_simulation(simu.collecteur,0,simu.temps,10,r.id,fichier=str(tmp_path/'simulation.png'))
+    assert os.path.getsize(str(tmp_path/'simulation.png'))>0
+    ax1,ax2,ax3,ax4=figures[0].axes
+    #moins de SEUIL_BARRES valeurs : une barre par valeur ; au-delà, une courbe en escalier par série
+    assert len(ax1.patches)==2*len(simu.collecteur.series()['temps'])
+    assert len(ax3.patches)==4 and all(type(patch).__name__=='StepPatch' for patch in ax3.patches)
+
+
+def ecrit_benchmarks(chemin,resultats):
+    '''
+    Fonction qui écrit un fichier de résultats au format de lance_benchmarks : {nom:(temps_min,pic_memoire)}.
+    '''
+    with open(chemin,'w') as fichier:
+        dm2.json.dump({'contexte':{},'resultats':{nom:{'temps_min':temps,'pic_memoire':memoire} for nom,(temps,memoire) in resultats.items()}},fichier)
+    return chemin
+
+
+def test_compare_benchmarks_verdicts(tmp_path,capsys):
+    reference=ecrit_benchmarks(str(tmp_path/'reference.json'),{'lente':(1.0,1000),'rapide':(2.0,1000),'stable':(1.0,1000),
+                                                               'memoire_nulle':(1.0,0),'temps_nul':(0.0,500),'retiree':(1.0,1000)})
+    nouveau=ecrit_benchmarks(str(tmp_path/'nouveau.json'),{'lente':(1.5,1000),'rapide':(1.0,1050),'stable':(1.05,950),
+                                                           'memoire_nulle':(1.0,800),'temps_nul':(0.3,0),'ajoutee':(1.0,1000)})
+    comparaison=dm2.compare_benchmarks(reference,nouveau,seuil=0.1,affichage=True)
+    verdicts={(ligne['nom'],ligne['grandeur']):(ligne['rapport'],ligne['verdict']) for ligne in comparaison}
+    #seules les mesures présentes dans les deux fichiers sont comparées
+    assert {nom for nom,_ in verdicts}=={'lente','rapide','stable','memoire_nulle','temps_nul'}
+    assert verdicts['lente','temps_min']==(1.5,'regression')
+    assert verdicts['rapide','temps_min']==(0.5,'amelioration')
+    assert verdicts['rapide','pic_memoire'][1]=='stable'
+    assert verdicts['stable','temps_min'][1]=='stable' and verdicts['stable','pic_memoire'][1]=='stable'
+    #une mesure nulle d'un côté ou de l'autre n'est ni une régression ni une amélioration
+    for cle in (('memoire_nulle','pic_memoire'),('temps_nul','temps_min'),('temps_nul','pic_memoire')):
+        assert verdicts[cle]==(None,'non_comparable')
+    assert 'non_comparable' in capsys.readouterr().out
+    #le seuil décide du verdict
+    verdicts_larges={(ligne['nom'],ligne['grandeur']):ligne['verdict'] for ligne in dm2.compare_benchmarks(reference,nouveau,seuil=0.6,affichage=False)}
+    assert verdicts_larges['lente','temps_min']=='stable' and verdicts_larges['rapide','temps_min']=='stable'
+    #code de retour de la ligne de commande : 1 si une régression
+    assert dm2.main(['compare',reference,nouveau])==1
+    assert dm2.main(['compare',reference,reference])==0
+
+
+def test_import_sans_effet_de_bord():
+    code="import sys; import DM2_Elsa_Kevin_Pauline_v9; print('matplotlib.pyplot' in sys.modules)"
+    sortie=subprocess.run([sys.executable,'-c',code],cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                          capture_output=True,text=True,check=True)
+    assert sortie.stdout=='False\n' and sortie.stderr==''
+
+
+def test_main_sans_sous_commande_affiche_l_aide(capsys,monkeypatch):
+    def demo(*arguments):
+        raise AssertionError('demo lancée sans sous-commande')
+    monkeypatch.setattr(dm2,'demo',demo)
+    assert dm2.main([])==2
+    assert 'usage' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('moteur',['python','numpy','evenements'])
+def test_flux_deltas_egaux_au_collecteur(moteur):
+    r=dm2.reseau(0,nb_entites=200,graine=4)
+    simu=dm2.simulation(0,r,temps_consultation=5,moteur=moteur,graine=1,creation_aleatoire=False)
+    flux=dm2.flux_simulation(simu,taille_file=4)
+    soumissions=[(id_entite,temps) for temps in range(0,40,3) for id_entite in (temps%200,(7*temps)%200)]
+    deltas=[]
+    
+    async def producteur():
+        for id_entite,temps in soumissions:
+            await flux.soumet(id_entite,temps)
+        flux.ferme_soumissions()
+        
+    async def lecteur(abonnement):
+        async for delta in abonnement:
+            deltas.append(delta)
+            
+    async def principal():
+        abonnement=flux.abonne(taille=2)
+        return (await dm2.asyncio.gather(flux.execute(),producteur(),lecteur(abonnement)))[0]
+    
+    nb_pas=dm2.asyncio.run(principal())
+    collecteur=simu.collecteur
+    assert len(deltas)==nb_pas
+    destinataires=np.concatenate([delta['destinataires'] for delta in deltas])
+    assert len(destinataires)==collecteur.recues.sum()
+    assert len(np.concatenate([delta['inactivations'] for delta in deltas]))==collecteur.nb_inactives
+    #une information soumise pour le temps t est créée au pas t+1
+    temps_creation=sorted(delta['temps'] for delta in deltas for _ in delta['informations'])
+    assert temps_creation==sorted(temps+1 for _,temps in soumissions)
+    appreciations=np.concatenate([delta['appreciations'] for delta in deltas])
+    assert (appreciations[:,3]==dm2.BIEN).sum()-(appreciations[:,2]==dm2.BIEN).sum()==collecteur.nb_bien==deltas[-1]['metriques']['bien']
+
+
+
+def test_flux_arret_avant_execute():
+    r=dm2.reseau(0,nb_entites=100,graine=4)
+    simu=dm2.simulation(0,r,temps_consultation=5,moteur='numpy',graine=1)
+    flux=dm2.flux_simulation(simu)
+    flux.arrete()
+    assert dm2.asyncio.run(flux.execute(temps_max=10))==0
+    assert simu.temps==0
+
+
+@pytest.mark.parametrize('parametre,valeurs,j',[('temps_consultation',[2,4,6],1),('p_consultation',[0.3,0.5,0.7],1)])
+def test_balayage_copies_egales_aux_simulations(parametre,valeurs,j):
+    r=dm2.reseau(0,nb_entites=120,graine=7)
+    balayage=dm2.simulation_balayage(0,r,parametre,valeurs,nb_replicas=2,temps_consultation=4,graine=3)
+    balayage.simul_temps_max(25)
+    resultats=balayage.resultats()
+    #la valeur d'indice j est celle d'une simulation_partitionnee ordinaire (temps_consultation=4, p_consultation de la loi du réseau)
+    for k in range(2):
+        simu=dm2.simulation_partitionnee(0,r,temps_consultation=4,graine=int(balayage.graines[k]),nb_processus=0)
+        for _ in range(25):
+            simu.avance()
+        attendus=simu.resultats()
+        for nom in ('actives','inactives','bien','mauvais'):
+            assert np.array_equal(attendus['series'][nom],resultats['series'][nom][k,j])
+        assert np.isclose(attendus['informations']['portee'].mean(),resultats['grandeurs']['portee_moyenne'][k,j])
+        assert np.isclose(attendus['informations']['duree'].mean(),resultats['grandeurs']['duree_moyenne'][k,j])
+        
+
+def test_balayage_nombres_aleatoires_communs():
+    r=dm2.reseau(0,nb_entites=120,graine=7)
+    resultats=[]
+    for valeurs in ([0.2,0.5,0.8],[0.5]):
+        balayage=dm2.simulation_balayage(0,r,'p_connexion',valeurs,nb_replicas=3,graine=1)
+        balayage.simul_temps_max(20)
+        resultats+=[balayage.resultats()]
+    #une copie ne dépend que de sa valeur et de son replica, pas des autres valeurs balayées
+    for nom in ('actives','inactives','bien','mauvais'):
+        assert np.array_equal(resultats[0]['series'][nom][:,1],resultats[1]['series'][nom][:,0])
+    for nom,valeurs in resultats[1]['grandeurs'].items():
+        assert np.array_equal(resultats[0]['grandeurs'][nom][:,1],valeurs[:,0],equal_nan=True)
+    sorties=[dm2.json.dumps(dm2.lance_balayage(r,'p_connexion',[0.3,0.5,0.7],nb_replicas=6,temps_max=20,graine=1)) for _ in range(2)]
+    assert sorties[0]==sorties[1]
+    with pytest.raises(ValueError):
+        dm2.simulation_balayage(0,r,'p_transfert',[0.5])